@@ -1,19 +1,117 @@
 import os
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.utils.metrics import register_query_listeners
+from app.utils.pool_metrics import (
+    PoolStats,
+    instrumented_pool_class,
+    register_pool_listeners,
+)
+from app.utils.sql_profiling import SQL_PROFILING, register_slow_query_listeners
 
 DEV_DATABASE_URL = os.getenv("DEV_DATABASE_URL")
+# the async engine talks to the same database through asyncpg
+DEV_ASYNC_DATABASE_URL = os.getenv("DEV_ASYNC_DATABASE_URL") or make_url(
+    DEV_DATABASE_URL
+).set(drivername="postgresql+asyncpg")
+
+# Pool settings, tunable per deployment through environment variables
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true")
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+pool_stats = PoolStats()
+async_pool_stats = PoolStats()
+
+
+def pool_options(pool_class, stats):
+    return {
+        "poolclass": instrumented_pool_class(pool_class, stats),
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def sync_connect_args():
+    if DB_STATEMENT_TIMEOUT_MS:
+        return {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    return {}
+
 
+def async_connect_args():
+    if DB_STATEMENT_TIMEOUT_MS:
+        return {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+    return {}
 
-engine = create_engine(DEV_DATABASE_URL)
+
+engine = create_engine(
+    DEV_DATABASE_URL,
+    connect_args=sync_connect_args(),
+    **pool_options(QueuePool, pool_stats),
+)
+register_pool_listeners(engine, pool_stats)
+register_query_listeners(engine)
+if SQL_PROFILING:
+    register_slow_query_listeners(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=True, bind=engine)
 Base = declarative_base()
 
+async_engine = create_async_engine(
+    DEV_ASYNC_DATABASE_URL,
+    connect_args=async_connect_args(),
+    **pool_options(AsyncAdaptedQueuePool, async_pool_stats),
+)
+register_pool_listeners(async_engine.sync_engine, async_pool_stats)
+register_query_listeners(async_engine.sync_engine)
+if SQL_PROFILING:
+    register_slow_query_listeners(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=True, expire_on_commit=False
+)
+
 
+# One session per request: commit when the route succeeds, roll back if it
+# raises, and always hand the connection back to the pool.
 def get_db_session():
     db = SessionLocal()
     try:
-        return db
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
+
+
+# One connection for a route that streams its body from a server-side cursor.
+# FastAPI runs the code after the yield before a StreamingResponse body is
+# sent, so the connection is only closed here when the route fails: otherwise
+# the route hands it to the body, which closes it (see stream_rows).
+def get_db_connection():
+    connection = engine.connect()
+    try:
+        yield connection
+    except Exception:
+        connection.close()
+        raise
+
+
+async def get_async_db_session():
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
@@ -1,13 +1,62 @@
-import logging
-import logging.config
+import os
 
 from fastapi import FastAPI
 
-from app.routers import category_routes
+from app.routers import (
+    async_category_routes,
+    category_routes,
+    inventory_routes,
+    metrics_routes,
+    product_routes,
+    search_routes,
+    seasonal_event_routes,
+)
+from app.utils.compression import CompressionMiddleware
+from app.utils.logging_setup import RequestLoggingMiddleware, setup_logging
+from app.utils.metrics import MetricsMiddleware
+from app.utils.responses import default_response_class
+from app.utils.sql_profiling import DEBUG, DBTimingHeadersMiddleware
 
-# logging.config.fileConfig("logging.conf", disable_existing_loggers=False)
-# logger = logging.getLogger(__name__)
-app = FastAPI()
+setup_logging()
+app = FastAPI(default_response_class=default_response_class())
+
+# Response compression, tunable per deployment through environment variables
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1000"))
+COMPRESSION_ENCODINGS = os.getenv("COMPRESSION_ENCODINGS", "br,gzip")
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+if COMPRESSION_ENCODINGS:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=COMPRESSION_MINIMUM_SIZE,
+        encodings=[e.strip() for e in COMPRESSION_ENCODINGS.split(",") if e.strip()],
+        gzip_level=COMPRESSION_GZIP_LEVEL,
+        brotli_quality=COMPRESSION_BROTLI_QUALITY,
+    )
 
 
 app.include_router(category_routes.router, prefix="/api/category", tags=["Category"])
+app.include_router(
+    async_category_routes.router,
+    prefix="/api/async/category",
+    tags=["Category (async)"],
+)
+app.include_router(product_routes.router, prefix="/api/product", tags=["Product"])
+app.include_router(search_routes.router, prefix="/api/search", tags=["Search"])
+app.include_router(
+    inventory_routes.router, prefix="/api/inventory", tags=["Inventory"]
+)
+app.include_router(
+    seasonal_event_routes.router,
+    prefix="/api/seasonal-event",
+    tags=["Seasonal event"],
+)
+app.include_router(metrics_routes.router, prefix="/metrics", tags=["Metrics"])
+
+if DEBUG:
+    app.add_middleware(DBTimingHeadersMiddleware)
+# measures the whole request and the bytes actually sent
+app.add_middleware(MetricsMiddleware, router=app.router)
+# outermost: the request id is set for everything logged downstream
+app.add_middleware(RequestLoggingMiddleware)
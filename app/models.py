@@ -1,20 +1,25 @@
 import sqlalchemy
 from sqlalchemy import (
     DECIMAL,
+    BigInteger,
     Boolean,
     CheckConstraint,
     Column,
+    Computed,
     DateTime,
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
+    SmallInteger,
     String,
     Text,
     UniqueConstraint,
     text,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 
 from .db_connection import Base
 
@@ -39,7 +44,60 @@ class Category(Base):
         CheckConstraint("LENGTH(slug) > 0", name="category_slug_length_check"),
         UniqueConstraint("name", "level", name="uq_category_name_level"),
         UniqueConstraint("slug", name="uq_category_slug"),
+        Index("ix_category_parent_id", "parent_id"),
+        Index("ix_category_active_id", "id", postgresql_where=text("is_active = true")),
+        # full-text and typo-tolerant name search, see app/utils/search_utils.py
+        Index(
+            "ix_category_name_search",
+            text("to_tsvector('english', name)"),
+            postgresql_using="gin",
+        ),
+        Index(
+            "ix_category_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
+
+
+class CategoryClosure(Base):
+    """
+    Every (ancestor, descendant) pair of the category tree, including each
+    category paired with itself at depth 0. Maintained by database triggers
+    on category insert and re-parent (see migration 3f9c2d1a7b64); rows go
+    away with the category through ON DELETE CASCADE.
+    """
+
+    __tablename__ = "category_closure"
+
+    ancestor_id = Column(
+        Integer, ForeignKey("category.id", ondelete="CASCADE"), primary_key=True
     )
+    descendant_id = Column(
+        Integer, ForeignKey("category.id", ondelete="CASCADE"), primary_key=True
+    )
+    depth = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        CheckConstraint("depth >= 0", name="category_closure_depth_check"),
+        Index("ix_category_closure_descendant_id_depth", "descendant_id", "depth"),
+    )
+
+
+class TableVersion(Base):
+    """
+    A version per table, bumped by a statement-level trigger on every write
+    (see migrations 2d7e5b8c1f30 and 6b1d4f8a2c95). Each backend bumps its own
+    slot, the version of a table is the sum of its slots. Conditional GETs
+    compare it against the ETag of the client without loading any row.
+    """
+
+    __tablename__ = "table_version"
+
+    table_name = Column(String(63), primary_key=True)
+    slot = Column(SmallInteger, primary_key=True, default=0, server_default="0")
+    version = Column(BigInteger, nullable=False)
 
 
 class Product(Base):
@@ -72,6 +130,28 @@ class Product(Base):
     )
     category_id = Column(Integer, ForeignKey("category.id"), nullable=False)
     seasonal_event_id = Column(Integer, ForeignKey("seasonal_event.id"), nullable=True)
+    # maintained by Postgres, name ranks above description; deferred so that
+    # product reads do not carry it
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('english', name), 'A') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+        )
+    )
+
+    # the product aggregate; see app/utils/product_utils.py for how it is loaded
+    category = relationship("Category")
+    seasonal_event = relationship("SeasonalEvent")
+    lines = relationship(
+        "ProductLine", back_populates="product", order_by="ProductLine.order_num"
+    )
+    product_types = relationship(
+        "ProductType", secondary="product_product_type", order_by="ProductType.id"
+    )
 
     __table_args__ = (
         CheckConstraint("LENGTH(name) > 0", name="product_name_length_check"),
@@ -79,6 +159,20 @@ class Product(Base):
         UniqueConstraint("pid", name="uq_product_pid"),
         UniqueConstraint("name", name="uq_product_name"),
         UniqueConstraint("slug", name="uq_product_slug"),
+        Index("ix_product_category_id", "category_id"),
+        Index("ix_product_seasonal_event_id", "seasonal_event_id"),
+        Index(
+            "ix_product_active_category_id",
+            "category_id",
+            postgresql_where=text("is_active = true"),
+        ),
+        Index("ix_product_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_product_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
     )
 
 
@@ -98,6 +192,14 @@ class ProductLine(Base):
     weight = Column(Float, nullable=False)
     product_id = Column(Integer, ForeignKey("product.id"), nullable=False)
 
+    product = relationship("Product", back_populates="lines")
+    images = relationship("ProductImage", order_by="ProductImage.order")
+    attribute_values = relationship(
+        "AttributeValue",
+        secondary="product_line_attribute_value",
+        order_by="AttributeValue.id",
+    )
+
     __table_args__ = (
         CheckConstraint(
             "price >= 0 AND price <= 999.99", name="product_line_max_value"
@@ -109,6 +211,12 @@ class ProductLine(Base):
             "order_num", "product_id", name="uq_product_line_order_product_id"
         ),
         UniqueConstraint("sku", name="uq_product_line_sku"),
+        Index("ix_product_line_product_id", "product_id"),
+        Index(
+            "ix_product_line_active_product_id",
+            "product_id",
+            postgresql_where=text("is_active = true"),
+        ),
     )
 
 
@@ -132,6 +240,7 @@ class ProductImage(Base):
         UniqueConstraint(
             "order", "product_line_id", name="uq_product_image_order_product_line_id"
         ),
+        # the unique constraint's index also serves product_line_id joins
         UniqueConstraint("product_line_id", name="uq_product_image_product_line_id"),
     )
 
@@ -174,6 +283,7 @@ class ProductType(Base):
     __table_args__ = (
         CheckConstraint("LENGTH(name) > 0", name="product_type_name_length_check"),
         UniqueConstraint("name", "level", name="uq_product_type_name_level"),
+        Index("ix_product_type_parent", "parent"),
     )
 
 
@@ -182,7 +292,9 @@ class AttributeValue(Base):
 
     id = Column(Integer, primary_key=True, nullable=False)
     attribute_value = Column(String(100), nullable=False)
-    attribute_id = Column(Integer, ForeignKey("attribute_value.id"), nullable=False)
+    attribute_id = Column(Integer, ForeignKey("attribute.id"), nullable=False)
+
+    attribute = relationship("Attribute")
 
     __table_args__ = (
         CheckConstraint(
@@ -193,6 +305,7 @@ class AttributeValue(Base):
             "attribute_id",
             name="uq_attribute_value_attr_value_attr_id",
         ),
+        Index("ix_attribute_value_attribute_id", "attribute_id"),
     )
 
 
@@ -211,6 +324,9 @@ class ProductLineAttributeValue(Base):
             "product_line_id",
             name="uq_attrval_prodline_attribute_value_id_produ_line_id",
         ),
+        Index(
+            "ix_product_line_attribute_value_product_line_id", "product_line_id"
+        ),
     )
 
 
@@ -227,4 +343,5 @@ class ProductProductType(Base):
             "product_type_id",
             name="uq_prod_prodtype_prod_id_prod_type_id",
         ),
+        Index("ix_product_product_type_product_type_id", "product_type_id"),
     )
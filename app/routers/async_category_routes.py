@@ -0,0 +1,220 @@
+"""
+Same endpoints as category_routes.py, served on the event loop through
+AsyncSession instead of Starlette's threadpool.
+"""
+
+import logging
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db_connection import get_async_db_session
+from app.models import Category
+from app.schemas.category_schema import (
+    CategoryCreate,
+    CategoryDeleteReturn,
+    CategoryFieldsReturn,
+    CategoryReturn,
+    CategoryUpdate,
+    dump_category_list,
+)
+from app.utils.category_cache import (
+    category_id_key,
+    category_slug_key,
+    get_cached_category_async,
+    invalidate_category,
+)
+from app.utils.category_tree import invalidate_category_trees
+from app.utils.category_utils import (
+    category_columns,
+    category_list_criteria,
+    page_size,
+    paginate,
+    raise_for_integrity_error,
+)
+from app.utils.http_cache import read_table_version_async
+from app.utils.responses import json_bytes_response
+
+router = APIRouter()
+
+logger = logging.getLogger("app")
+
+
+async def get_category_or_none(db: AsyncSession, *criteria):
+    result = await db.execute(select(Category).where(*criteria))
+    return result.scalars().first()
+
+
+def category_version(db: AsyncSession):
+    # cache entries are shared with the sync routes, which send their version
+    # as the ETag: a version-less entry would serve those without one
+    return lambda: read_table_version_async(db, "category")
+
+
+# Delete existing category
+@router.delete("/{category_id}", response_model=CategoryDeleteReturn)
+async def delete_category(
+    category_id: int,
+    db: AsyncSession = Depends(get_async_db_session),
+):
+    try:
+        category = await get_category_or_none(db, Category.id == category_id)
+        if not category:
+            raise HTTPException(status_code=404, detail="Category not found")
+        category_slug = category.slug
+        await db.delete(category)
+        await db.commit()
+        invalidate_category_trees()
+        invalidate_category(category_id, category_slug)
+        return category
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while deleting category: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+# Update existing category
+@router.put("/{category_id}", response_model=CategoryReturn, status_code=201)
+async def update_category(
+    category_id: int,
+    category_data: CategoryUpdate,
+    db: AsyncSession = Depends(get_async_db_session),
+):
+    try:
+        category = await get_category_or_none(db, Category.id == category_id)
+        if not category:
+            raise HTTPException(status_code=404, detail="Category not found")
+        previous_slug = category.slug
+        for key, value in category_data.model_dump().items():
+            setattr(category, key, value)
+        await db.commit()
+        invalidate_category_trees()
+        invalidate_category(category_id, previous_slug, category_data.slug)
+        await db.refresh(category)
+        return category
+    except HTTPException:
+        raise
+    except IntegrityError as e:
+        await db.rollback()
+        raise_for_integrity_error(e)
+        logger.error(f"Integrity error while updating category: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+    except Exception as e:
+        logger.error(f"Unexpected error while updating category: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+# Get a single category by slug, read through the category cache
+@router.get("/slug/{category_slug}", response_model=CategoryReturn)
+async def get_category_by_slug(
+    category_slug: str, db: AsyncSession = Depends(get_async_db_session)
+):
+    try:
+        _, category = await get_cached_category_async(
+            category_slug_key(category_slug),
+            lambda: get_category_or_none(db, Category.slug == category_slug),
+            category_version(db),
+        )
+        if not category:
+            raise HTTPException(status_code=404, detail="Category does not exist")
+        return category
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while retrieving category: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+# Create new category, duplicates are detected by the unique constraints
+@router.post("/", response_model=CategoryReturn, status_code=201)
+async def create_category(
+    category_data: CategoryCreate, db: AsyncSession = Depends(get_async_db_session)
+):
+    try:
+        new_category = Category(**category_data.model_dump())
+        db.add(new_category)
+        await db.commit()
+        invalidate_category_trees()
+        await db.refresh(new_category)  # refresh object state
+        invalidate_category(new_category.id, new_category.slug)
+        return new_category
+
+    except HTTPException:
+        raise
+
+    except IntegrityError as e:
+        await db.rollback()
+        raise_for_integrity_error(e)
+        logger.error(f"Integrity error while creating category: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Unexpected error while creating category: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+# Get categories: all of them, or one keyset page at a time when limit or
+# cursor is given (next page cursor in X-Next-Cursor)
+@router.get(
+    "/",
+    response_model=List[CategoryFieldsReturn],
+    response_model_exclude_unset=True,
+)
+async def get_categories(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    level: Optional[int] = None,
+    parent_id: Optional[int] = None,
+    is_root: Optional[bool] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db_session),
+):
+    try:
+        columns = category_columns(fields)
+        criteria = category_list_criteria(
+            cursor, is_active, level, parent_id, is_root
+        )
+        size = page_size(limit, cursor)
+        result = await db.execute(
+            select(*columns)
+            .where(*criteria)
+            .order_by(Category.id)
+            .limit(None if size is None else size + 1)
+        )
+        categories, next_cursor = paginate(result.all(), size)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return json_bytes_response(dump_category_list(categories), response)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while retrieving categories: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+# Get a single category by id, read through the category cache
+@router.get("/{category_id}", response_model=CategoryReturn)
+async def get_category(
+    category_id: int, db: AsyncSession = Depends(get_async_db_session)
+):
+    try:
+        _, category = await get_cached_category_async(
+            category_id_key(category_id),
+            lambda: get_category_or_none(db, Category.id == category_id),
+            category_version(db),
+        )
+        if not category:
+            raise HTTPException(status_code=404, detail="Category not found")
+        return category
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while retrieving category: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
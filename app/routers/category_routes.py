@@ -1,25 +1,84 @@
 import logging
-from typing import List
+from typing import Annotated, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Boolean, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.db_connection import SessionLocal, get_db_session
+from app.db_connection import get_db_connection, get_db_session
 from app.models import Category
 from app.schemas.category_schema import (
+    CategoryBulkItemReturn,
+    CategoryBulkReturn,
     CategoryCreate,
     CategoryDeleteReturn,
+    CategoryFieldsReturn,
     CategoryReturn,
+    CategoryTreeNode,
+    CategoryTreeReturn,
     CategoryUpdate,
+    dump_category_list,
+)
+from app.utils.category_cache import (
+    category_id_key,
+    category_slug_key,
+    get_cached_category,
+    invalidate_category,
+)
+from app.utils.category_utils import (
+    category_columns,
+    category_list_criteria,
+    find_bulk_conflicts,
+    page_size,
+    paginate,
+    raise_for_integrity_error,
+    stream_categories,
+)
+from app.utils.category_tree import (
+    TREE_DEPTH_LIMIT,
+    get_forest,
+    get_subtree,
+    invalidate_category_trees,
+)
+from app.utils.http_cache import (
+    check_not_modified,
+    conditional_get,
+    on_table_version_change,
+    read_table_version,
+)
+from app.utils.responses import json_bytes_response
+from app.utils.stream_utils import (
+    NDJSON_MEDIA_TYPE,
+    compress_chunks,
+    json_array_chunks,
+    ndjson_chunks,
+    negotiate_encoding,
+    negotiate_media_type,
 )
-from app.utils.category_utils import check_existing_category
 
 router = APIRouter()
-db = SessionLocal()
 
 # logger = logging.getLogger(__name__)  # __name__=app.routers.category_routes
 logger = logging.getLogger("app")
 
+EXPORT_BATCH_SIZE = 1000
+BULK_MAX_ITEMS = 10_000
+BULK_UPSERT_COLUMNS = ("name", "is_active", "level", "parent_id")
+
+# ETag / If-None-Match on the category list: 304 while the table is unchanged.
+# Single categories carry the version their cache entry was loaded at, and the
+# write handlers drop the entries they change (invalidate_category).
+category_list_etag = conditional_get("category", "category_list")
+on_table_version_change("category", invalidate_category_trees)
+
+
+def category_version(db: Session):
+    return lambda: read_table_version(db, "category")
+
 
 # Delete existing category
 @router.delete("/{category_id}", response_model=CategoryDeleteReturn)
@@ -31,8 +90,11 @@ def delete_category(
         category = db.query(Category).filter(Category.id == category_id).first()
         if not category:
             raise HTTPException(status_code=404, detail="Category not found")
+        category_slug = category.slug
         db.delete(category)
         db.commit()
+        invalidate_category_trees()
+        invalidate_category(category_id, category_slug)
         return category
     except HTTPException:
         raise
@@ -52,25 +114,45 @@ def update_category(
         category = db.query(Category).filter(Category.id == category_id).first()
         if not category:
             raise HTTPException(status_code=404, detail="Category not found")
+        previous_slug = category.slug
         for key, value in category_data.model_dump().items():
             setattr(category, key, value)
         db.commit()
+        invalidate_category_trees()
+        invalidate_category(category_id, previous_slug, category_data.slug)
         db.refresh(category)
         return category
     except HTTPException:
         raise
+    except IntegrityError as e:
+        db.rollback()
+        raise_for_integrity_error(e)
+        logger.error(f"Integrity error while updating category: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
     except Exception as e:
         logger.error(f"Unexpected error while updating category: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
-# Get a single category by slug
+# Get a single category by slug, read through the category cache
 @router.get("/slug/{category_slug}", response_model=CategoryReturn)
-def get_category_by_slug(category_slug: str, db: Session = Depends(get_db_session)):
+def get_category_by_slug(
+    category_slug: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db_session),
+):
     try:
-        category = db.query(Category).filter(Category.slug == category_slug).first()
+        version, category = get_cached_category(
+            category_slug_key(category_slug),
+            lambda: db.query(Category).filter(Category.slug == category_slug).first(),
+            category_version(db),
+        )
         if not category:
             raise HTTPException(status_code=404, detail="Category does not exist")
+        check_not_modified(
+            response, if_none_match, "category", version, "category_detail"
+        )
         return category
     except HTTPException:
         raise
@@ -79,33 +161,253 @@ def get_category_by_slug(category_slug: str, db: Session = Depends(get_db_sessio
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
-# Get all categories
+# Create new category, duplicates are detected by the unique constraints
 @router.post("/", response_model=CategoryReturn, status_code=201)
 def create_category(
     category_data: CategoryCreate, db: Session = Depends(get_db_session)
 ):
     try:
-        check_existing_category(db, category_data)
         new_category = Category(**category_data.model_dump())
         db.add(new_category)
         db.commit()
+        invalidate_category_trees()
         db.refresh(new_category)  # refresh object state
+        invalidate_category(new_category.id, new_category.slug)
         return new_category
 
     except HTTPException:
         raise
 
+    except IntegrityError as e:
+        db.rollback()
+        raise_for_integrity_error(e)
+        logger.error(f"Integrity error while creating category: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
     except Exception as e:
         db.rollback()
         logger.error(f"Unexpected error while creating category: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
-@router.get("/", response_model=List[CategoryReturn])
-def get_categories(db: Session = Depends(get_db_session)):
+# Get categories: all of them, or one keyset page at a time when limit or
+# cursor is given (next page cursor in X-Next-Cursor)
+@router.get(
+    "/",
+    response_model=List[CategoryFieldsReturn],
+    response_model_exclude_unset=True,
+    dependencies=[Depends(category_list_etag)],
+)
+def get_categories(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    level: Optional[int] = None,
+    parent_id: Optional[int] = None,
+    is_root: Optional[bool] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db_session),
+):
     try:
-        categories = db.query(Category).all()
-        return categories
+        columns = category_columns(fields)
+        criteria = category_list_criteria(
+            cursor, is_active, level, parent_id, is_root
+        )
+        size = page_size(limit, cursor)
+        categories = (
+            db.query(*columns)
+            .filter(*criteria)
+            .order_by(Category.id)
+            .limit(None if size is None else size + 1)
+            .all()
+        )
+        categories, next_cursor = paginate(categories, size)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return json_bytes_response(dump_category_list(categories), response)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Unexpected error while retrieving categories: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+# Export every category as NDJSON or a chunked JSON array, streamed from a
+# server-side cursor so memory stays flat whatever the table size
+@router.get("/export")
+def export_categories(
+    is_active: Optional[bool] = None,
+    level: Optional[int] = None,
+    parent_id: Optional[int] = None,
+    is_root: Optional[bool] = None,
+    accept: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+    connection: Connection = Depends(get_db_connection),
+):
+    media_type = negotiate_media_type(accept)
+    encoding = negotiate_encoding(accept_encoding)
+    criteria = category_list_criteria(None, is_active, level, parent_id, is_root)
+
+    def content():
+        try:
+            partitions = stream_categories(connection, criteria, EXPORT_BATCH_SIZE)
+            if media_type == NDJSON_MEDIA_TYPE:
+                chunks = ndjson_chunks(partitions)
+            else:
+                chunks = json_array_chunks(partitions)
+            yield from compress_chunks(chunks, encoding)
+        except Exception as e:
+            # headers are already sent, the client sees a truncated body
+            logger.error(f"Unexpected error while exporting categories: {e}")
+            raise
+
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return StreamingResponse(content(), media_type=media_type, headers=headers)
+
+
+# Create (or upsert on slug) many categories: one set-based conflict check,
+# one multi-row INSERT ... RETURNING, one commit
+@router.post("/bulk", response_model=CategoryBulkReturn)
+def bulk_create_categories(
+    categories_data: Annotated[
+        List[CategoryCreate], Body(min_length=1, max_length=BULK_MAX_ITEMS)
+    ],
+    mode: Literal["insert", "upsert"] = "insert",
+    db: Session = Depends(get_db_session),
+):
+    try:
+        upsert = mode == "upsert"
+        conflicts, to_write = find_bulk_conflicts(db, categories_data, upsert)
+
+        written = {}
+        if to_write:
+            statement = pg_insert(Category).values(
+                [item.model_dump() for _, item in to_write]
+            )
+            if upsert:
+                statement = statement.on_conflict_do_update(
+                    constraint="uq_category_slug",
+                    set_={
+                        column: statement.excluded[column]
+                        for column in BULK_UPSERT_COLUMNS
+                    },
+                )
+            else:
+                # rows inserted concurrently since the check are reported, not raised
+                statement = statement.on_conflict_do_nothing()
+            statement = statement.returning(
+                *Category.__table__.columns,
+                # xmax is 0 for a freshly inserted row, set for an updated one
+                literal_column("xmax = 0", Boolean).label("inserted"),
+            )
+            written = {row.slug: row for row in db.execute(statement).all()}
+            db.commit()
+            invalidate_category_trees()
+            for row in written.values():
+                invalidate_category(row.id, row.slug)
+
+        results = []
+        for index, item in enumerate(categories_data):
+            row = written.get(item.slug)
+            if index in conflicts or row is None:
+                detail = conflicts.get(index, "Category already exists")
+                results.append(
+                    CategoryBulkItemReturn(
+                        index=index, status="conflict", detail=detail
+                    )
+                )
+            else:
+                results.append(
+                    CategoryBulkItemReturn(
+                        index=index,
+                        status="created" if row.inserted else "updated",
+                        category=CategoryReturn.model_validate(
+                            row, from_attributes=True
+                        ),
+                    )
+                )
+
+        statuses = [result.status for result in results]
+        return CategoryBulkReturn(
+            created=statuses.count("created"),
+            updated=statuses.count("updated"),
+            conflicts=statuses.count("conflict"),
+            results=results,
+        )
+
+    except HTTPException:
+        raise
+
+    except IntegrityError as e:
+        db.rollback()
+        raise_for_integrity_error(e)
+        logger.error(f"Integrity error while bulk creating categories: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Unexpected error while bulk creating categories: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+# Get the category forest: every root category with its descendants
+@router.get("/tree", response_model=List[CategoryTreeNode])
+def get_category_forest(
+    max_depth: Optional[int] = Query(None, ge=0, le=TREE_DEPTH_LIMIT),
+    db: Session = Depends(get_db_session),
+):
+    try:
+        return get_forest(db, max_depth)
+    except Exception as e:
+        logger.error(f"Unexpected error while retrieving category tree: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+# Get a category with its ancestors (breadcrumb) and its descendants
+@router.get("/{category_id}/tree", response_model=CategoryTreeReturn)
+def get_category_subtree(
+    category_id: int,
+    max_depth: Optional[int] = Query(None, ge=0, le=TREE_DEPTH_LIMIT),
+    db: Session = Depends(get_db_session),
+):
+    try:
+        subtree = get_subtree(db, category_id, max_depth)
+        if subtree is None:
+            raise HTTPException(status_code=404, detail="Category not found")
+        return subtree
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while retrieving category tree: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+# Get a single category by id, read through the category cache. Declared last
+# so that /tree, /export and /slug/... are not captured as an id.
+@router.get("/{category_id}", response_model=CategoryReturn)
+def get_category(
+    category_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db_session),
+):
+    try:
+        version, category = get_cached_category(
+            category_id_key(category_id),
+            lambda: db.query(Category).filter(Category.id == category_id).first(),
+            category_version(db),
+        )
+        if not category:
+            raise HTTPException(status_code=404, detail="Category not found")
+        check_not_modified(
+            response, if_none_match, "category", version, "category_detail"
+        )
+        return category
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while retrieving category: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
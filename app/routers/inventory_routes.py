@@ -0,0 +1,64 @@
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.db_connection import get_db_session
+from app.schemas.inventory_schema import StockChange, StockChangeReturn
+from app.utils.inventory_utils import (
+    change_stock,
+    check_lines,
+    lock_lines,
+    merge_items,
+    sync_stock_status,
+)
+
+router = APIRouter()
+
+logger = logging.getLogger("app")
+
+
+def apply_stock_change(db: Session, stock_change: StockChange, reserve: bool):
+    quantities = merge_items(stock_change.items)
+    check_lines(quantities, lock_lines(db, quantities), reserve)
+    rows = change_stock(db, quantities, reserve)
+    sync_stock_status(db, {row.product_id for row in rows})
+    db.commit()
+    return {
+        "items": [
+            {
+                "product_line_id": row.id,
+                "product_id": row.product_id,
+                "stock_qty": row.stock_qty,
+            }
+            for row in rows
+        ]
+    }
+
+
+# Reserve stock for every line of a checkout, all or nothing
+@router.post("/reserve", response_model=StockChangeReturn)
+def reserve_stock(stock_change: StockChange, db: Session = Depends(get_db_session)):
+    try:
+        return apply_stock_change(db, stock_change, reserve=True)
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Unexpected error while reserving stock: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+# Give reserved stock back (cancelled or expired checkout)
+@router.post("/release", response_model=StockChangeReturn)
+def release_stock(stock_change: StockChange, db: Session = Depends(get_db_session)):
+    try:
+        return apply_stock_change(db, stock_change, reserve=False)
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Unexpected error while releasing stock: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -0,0 +1,57 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.db_connection import async_engine, async_pool_stats, engine, pool_stats
+from app.utils.category_cache import category_cache
+from app.utils.category_tree import subtree_cache
+from app.utils.facet_index import facet_index_cache
+from app.utils.metrics import Gauge, registry
+from app.utils.seasonal_events import seasonal_event_cache
+
+router = APIRouter()
+
+
+# Connection pool counters, for scraping and pool tuning
+@router.get("/pool")
+def get_pool_metrics():
+    return {
+        "sync": pool_stats.snapshot(engine.pool),
+        "async": async_pool_stats.snapshot(async_engine.sync_engine.pool),
+    }
+
+
+# Hit, miss and eviction counters of the in-process caches
+@router.get("/cache")
+def get_cache_metrics():
+    return {
+        "category": category_cache.stats(),
+        "category_tree": subtree_cache.stats(),
+        "product_facets": facet_index_cache.stats(),
+        "seasonal_events": seasonal_event_cache.stats(),
+    }
+
+
+def stats_gauges(prefix, label, snapshots):
+    # {label value: {stat: value}} -> one gauge per stat
+    gauges = {}
+    for label_value, snapshot in snapshots.items():
+        for stat, value in snapshot.items():
+            if stat not in gauges:
+                gauges[stat] = Gauge(
+                    f"{prefix}_{stat}", stat.replace("_", " "), (label,)
+                )
+            gauges[stat].set(value, label_value)
+    return gauges.values()
+
+
+registry.add_collector(lambda: stats_gauges("db_pool", "engine", get_pool_metrics()))
+registry.add_collector(lambda: stats_gauges("cache", "cache", get_cache_metrics()))
+
+
+# Prometheus scrape endpoint: per route request counts, latency, in-flight
+# requests, response sizes and DB work, plus the pool and cache stats above
+@router.get("", response_class=PlainTextResponse)
+def get_metrics():
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4"
+    )
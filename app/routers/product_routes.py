@@ -0,0 +1,126 @@
+import logging
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session
+
+from app.db_connection import get_db_session
+from app.models import Product
+from app.schemas.product_schema import ProductReturn, ProductSearchReturn
+from app.utils.category_utils import decode_cursor, encode_cursor, paginate
+from app.utils.facet_index import search_facets
+from app.utils.product_utils import product_aggregate_options, product_list_criteria
+
+router = APIRouter()
+
+logger = logging.getLogger("app")
+
+
+# Get products with their lines, images, attributes and types, one keyset
+# page at a time (next page cursor in X-Next-Cursor)
+@router.get("/", response_model=List[ProductReturn])
+def get_products(
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    category_id: Optional[int] = None,
+    include_subcategories: bool = False,
+    db: Session = Depends(get_db_session),
+):
+    try:
+        criteria = product_list_criteria(
+            cursor, is_active, category_id, include_subcategories
+        )
+        products = (
+            db.query(Product)
+            .options(*product_aggregate_options())
+            .filter(*criteria)
+            .order_by(Product.id)
+            .limit(limit + 1)
+            .all()
+        )
+        products, next_cursor = paginate(products, limit)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return products
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while retrieving products: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+# Faceted search: products whose lines carry the selected attribute values
+# (OR within an attribute, AND across attributes) and the per-value counts,
+# answered from the in-process facet index
+@router.get("/search", response_model=ProductSearchReturn)
+def search_products(
+    response: Response,
+    attribute_value_id: List[int] = Query([]),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db_session),
+):
+    try:
+        product_ids, facets = search_facets(db, attribute_value_id)
+        after = decode_cursor(cursor) if cursor else None
+        page_ids = [id_ for id_ in product_ids if after is None or id_ > after]
+        if len(page_ids) > limit:
+            page_ids = page_ids[:limit]
+            response.headers["X-Next-Cursor"] = encode_cursor(page_ids[-1])
+        products = []
+        if page_ids:
+            products = (
+                db.query(Product)
+                .options(*product_aggregate_options())
+                .filter(Product.id.in_(page_ids))
+                .order_by(Product.id)
+                .all()
+            )
+        return {"total": len(product_ids), "products": products, "facets": facets}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while searching products: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+# Get a single product by slug with its whole aggregate
+@router.get("/slug/{product_slug}", response_model=ProductReturn)
+def get_product_by_slug(product_slug: str, db: Session = Depends(get_db_session)):
+    try:
+        product = (
+            db.query(Product)
+            .options(*product_aggregate_options())
+            .filter(Product.slug == product_slug)
+            .first()
+        )
+        if not product:
+            raise HTTPException(status_code=404, detail="Product does not exist")
+        return product
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while retrieving product: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+# Get a single product by id with its whole aggregate
+@router.get("/{product_id}", response_model=ProductReturn)
+def get_product(product_id: int, db: Session = Depends(get_db_session)):
+    try:
+        product = (
+            db.query(Product)
+            .options(*product_aggregate_options())
+            .filter(Product.id == product_id)
+            .first()
+        )
+        if not product:
+            raise HTTPException(status_code=404, detail="Product not found")
+        return product
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while retrieving product: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -0,0 +1,76 @@
+import logging
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session
+
+from app.db_connection import get_db_session
+from app.models import Category, Product
+from app.schemas.search_schema import CategorySearchHit, ProductSearchHit
+from app.utils.search_utils import CATEGORY_DOCUMENT, PRODUCT_DOCUMENT, search
+
+router = APIRouter()
+
+logger = logging.getLogger("app")
+
+
+# Search products by name and description, best match first (next page cursor
+# in X-Next-Cursor)
+@router.get("/products", response_model=List[ProductSearchHit])
+def search_products(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db_session),
+):
+    try:
+        hits, next_cursor = search(
+            db,
+            Product.id,
+            [Product.id, Product.name, Product.slug, Product.category_id],
+            PRODUCT_DOCUMENT,
+            Product.name,
+            q,
+            cursor,
+            limit,
+        )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return hits
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while searching products: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+# Search categories by name, best match first (next page cursor in
+# X-Next-Cursor)
+@router.get("/categories", response_model=List[CategorySearchHit])
+def search_categories(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db_session),
+):
+    try:
+        hits, next_cursor = search(
+            db,
+            Category.id,
+            [Category.id, Category.name, Category.slug],
+            CATEGORY_DOCUMENT,
+            Category.name,
+            q,
+            cursor,
+            limit,
+        )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return hits
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while searching categories: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -0,0 +1,35 @@
+import logging
+import math
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session
+
+from app.db_connection import get_db_session
+from app.schemas.seasonal_event_schema import ActiveSeasonalEventReturn
+from app.utils.seasonal_events import SEASONAL_EVENT_TTL, get_active_events, utc_now
+
+router = APIRouter()
+
+logger = logging.getLogger("app")
+
+
+# Get the seasonal events active now with their active products; clients may
+# cache the answer until the next event starts or ends
+@router.get("/active", response_model=List[ActiveSeasonalEventReturn])
+def get_active_seasonal_events(
+    response: Response, db: Session = Depends(get_db_session)
+):
+    try:
+        events, expires_at = get_active_events(db)
+        max_age = SEASONAL_EVENT_TTL
+        if expires_at is not None:
+            remaining = (expires_at - utc_now()).total_seconds()
+            max_age = max(0.0, min(max_age, remaining))
+        response.headers["Cache-Control"] = f"max-age={math.floor(max_age)}"
+        return events
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while retrieving active seasonal events: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -1,6 +1,6 @@
-from typing import Annotated, Optional
+from typing import Annotated, List, Literal, Optional
 
-from pydantic import BaseModel, StringConstraints
+from pydantic import BaseModel, ConfigDict, StringConstraints, TypeAdapter
 
 
 class CategoryBase(BaseModel):
@@ -20,9 +20,64 @@ class CategoryUpdate(CategoryBase):
 
 
 class CategoryDeleteReturn(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: Annotated[str, StringConstraints(min_length=1)]
 
 class CategoryReturn(CategoryBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
 
+
+# Listing item: with a fields= projection only the requested keys are returned
+class CategoryFieldsReturn(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: Optional[str] = None
+    slug: Optional[str] = None
+    is_active: Optional[bool] = None
+    level: Optional[int] = None
+    parent_id: Optional[int] = None
+
+
+class CategoryBulkItemReturn(BaseModel):
+    index: int
+    status: Literal["created", "updated", "conflict"]
+    detail: Optional[str] = None
+    category: Optional[CategoryReturn] = None
+
+
+class CategoryBulkReturn(BaseModel):
+    created: int
+    updated: int
+    conflicts: int
+    results: List[CategoryBulkItemReturn]
+
+
+class CategoryTreeNode(CategoryReturn):
+    children: List["CategoryTreeNode"] = []
+
+
+class CategoryTreeReturn(BaseModel):
+    ancestors: List[CategoryReturn]  # root first, direct parent last
+    tree: CategoryTreeNode
+
+
+# Built once: a TypeAdapter compiles its validator and serializer up front
+category_list_adapter = TypeAdapter(List[CategoryFieldsReturn])
+
+
+def dump_category_list(rows) -> bytes:
+    """
+    Rows (or ORM objects) straight to JSON bytes: one validation reading
+    the attributes, one dump_json in pydantic-core. Keys a fields= projection
+    did not select are left out. Replaces FastAPI's validate, dump to Python
+    objects, then json render of the response model.
+    """
+    return category_list_adapter.dump_json(
+        category_list_adapter.validate_python(rows, from_attributes=True),
+        exclude_unset=True,
+    )
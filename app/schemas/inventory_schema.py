@@ -0,0 +1,22 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class StockChangeItem(BaseModel):
+    product_line_id: int
+    quantity: int = Field(gt=0)
+
+
+class StockChange(BaseModel):
+    items: List[StockChangeItem] = Field(min_length=1, max_length=100)
+
+
+class StockLevelReturn(BaseModel):
+    product_line_id: int
+    product_id: int
+    stock_qty: int
+
+
+class StockChangeReturn(BaseModel):
+    items: List[StockLevelReturn]  # in product_line_id order
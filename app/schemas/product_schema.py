@@ -0,0 +1,88 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Literal, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.schemas.category_schema import CategoryReturn
+
+
+class AttributeReturn(BaseModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+
+
+class AttributeValueReturn(BaseModel):
+    id: int
+    attribute_value: str
+    attribute: AttributeReturn
+
+
+class ProductImageReturn(BaseModel):
+    id: int
+    alternative_text: str
+    url: str
+    order: int
+
+
+class ProductLineReturn(BaseModel):
+    id: int
+    price: Decimal
+    sku: UUID
+    stock_qty: int
+    is_active: bool
+    order_num: int
+    weight: float
+    images: List[ProductImageReturn] = []
+    attribute_values: List[AttributeValueReturn] = []
+
+
+class ProductTypeReturn(BaseModel):
+    id: int
+    name: str
+    level: int
+    parent: Optional[int] = None
+
+
+class SeasonalEventReturn(BaseModel):
+    id: int
+    name: str
+    start_date: datetime
+    end_date: datetime
+
+
+class ProductReturn(BaseModel):
+    id: int
+    pid: UUID
+    name: str
+    slug: str
+    description: Optional[str] = None
+    is_digital: bool
+    is_active: bool
+    stock_status: Literal["oos", "is", "obo"]
+    created_at: datetime
+    updated_at: datetime
+    category: CategoryReturn
+    seasonal_event: Optional[SeasonalEventReturn] = None
+    product_types: List[ProductTypeReturn] = []
+    lines: List[ProductLineReturn] = []
+
+
+class FacetValueReturn(BaseModel):
+    id: int
+    value: str
+    count: int  # matching product lines
+
+
+class FacetReturn(BaseModel):
+    attribute_id: int
+    name: str
+    values: List[FacetValueReturn]
+
+
+class ProductSearchReturn(BaseModel):
+    total: int  # matching products, across all pages
+    products: List[ProductReturn]
+    facets: List[FacetReturn]
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class CategorySearchHit(BaseModel):
+    id: int
+    name: str
+    slug: str
+    rank: float
+
+
+class ProductSearchHit(BaseModel):
+    id: int
+    name: str
+    slug: str
+    category_id: int
+    rank: float
@@ -0,0 +1,17 @@
+from typing import List, Literal
+
+from pydantic import BaseModel
+
+from app.schemas.product_schema import SeasonalEventReturn
+
+
+class SeasonalEventProductReturn(BaseModel):
+    id: int
+    name: str
+    slug: str
+    category_id: int
+    stock_status: Literal["oos", "is", "obo"]
+
+
+class ActiveSeasonalEventReturn(SeasonalEventReturn):
+    products: List[SeasonalEventProductReturn]
@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Protocol
+
+
+class CacheBackend(Protocol):
+    """
+    What the read-through caches need from a store. LRUCache is the
+    in-process default; a Redis-compatible client wrapper (GET / SET EX /
+    DEL / FLUSH on a key prefix) fits the same methods.
+    """
+
+    def get(self, key: Hashable, default: Any = None) -> Any: ...
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None): ...
+
+    def delete(self, *keys: Hashable): ...
+
+    def clear(self): ...
+
+    def stats(self) -> dict: ...
+
+
+class LRUCache:
+    """
+    Bounded in-process cache: least recently used entries are evicted first
+    and every entry expires ttl seconds after it was stored.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class NullCache:
+    """
+    Backend that stores nothing, every lookup is a miss: turns a cache off
+    without touching its callers.
+    """
+
+    def __init__(self):
+        self.misses = 0
+
+    def get(self, key, default=None):
+        self.misses += 1
+        return default
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def delete(self, *keys):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self):
+        return {"size": 0, "max_size": 0, "hits": 0, "misses": self.misses}
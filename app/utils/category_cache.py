@@ -0,0 +1,96 @@
+"""
+Read-through cache for single category lookups by id and by slug.
+Entries are plain dicts (never session-bound ORM objects) so a shared
+backend can serialise them; None is a cached 404. Each entry keeps the
+category table version read before the row was loaded, the ETag of the
+responses served from it.
+"""
+
+import os
+import threading
+
+from app.schemas.category_schema import CategoryReturn
+from app.utils.cache import CacheBackend, LRUCache, NullCache
+
+CATEGORY_CACHE_SIZE = int(os.getenv("CATEGORY_CACHE_SIZE", "10000"))
+CATEGORY_CACHE_TTL = float(os.getenv("CATEGORY_CACHE_TTL", "300"))
+CATEGORY_CACHE_NEGATIVE_TTL = float(os.getenv("CATEGORY_CACHE_NEGATIVE_TTL", "30"))
+
+category_cache: CacheBackend = (
+    LRUCache(max_size=CATEGORY_CACHE_SIZE, ttl=CATEGORY_CACHE_TTL)
+    if CATEGORY_CACHE_SIZE > 0
+    else NullCache()
+)
+
+MISS = object()
+
+# bumped by every invalidation: a miss whose load overlapped a write does not
+# store what it loaded, which can be older than the write
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+def category_id_key(category_id):
+    return ("category", "id", category_id)
+
+
+def category_slug_key(category_slug):
+    return ("category", "slug", category_slug)
+
+
+def store_category(key, category, version=None, generation=None):
+    """
+    The category as a dict, cached unless an invalidation ran after
+    generation (read before the row was loaded) was current.
+    """
+    value = (
+        CategoryReturn.model_validate(category, from_attributes=True).model_dump()
+        if category
+        else None
+    )
+    with _generation_lock:
+        if generation is not None and generation != _generation:
+            return value
+        if value is None:
+            category_cache.set(key, (version, None), ttl=CATEGORY_CACHE_NEGATIVE_TTL)
+        else:
+            # a lookup by slug also warms the id entry and the other way round
+            category_cache.set(category_id_key(value["id"]), (version, value))
+            category_cache.set(category_slug_key(value["slug"]), (version, value))
+    return value
+
+
+def get_cached_category(key, load, get_version=None):
+    """
+    (version, category) for key, category being None for a missing row. On a
+    miss get_version (if given) is called before load, so the version can be
+    older than the row but never newer; a hit touches no database.
+    """
+    cached = category_cache.get(key, MISS)
+    if cached is not MISS:
+        return cached
+    generation = _generation
+    version = get_version() if get_version else None
+    return version, store_category(key, load(), version, generation)
+
+
+async def get_cached_category_async(key, load, get_version=None):
+    # get_cached_category for the async routes: load and get_version are
+    # coroutine functions; the entries are shared with the sync routes
+    cached = category_cache.get(key, MISS)
+    if cached is not MISS:
+        return cached
+    generation = _generation
+    version = await get_version() if get_version else None
+    return version, store_category(key, await load(), version, generation)
+
+
+def invalidate_category(category_id, *slugs):
+    # pass the old and the new slug of a changed row: a rename must drop the
+    # old entry and any cached 404 for the new one
+    global _generation
+    with _generation_lock:
+        _generation += 1
+        category_cache.delete(
+            category_id_key(category_id), *[category_slug_key(slug) for slug in slugs]
+        )
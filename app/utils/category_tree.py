@@ -0,0 +1,106 @@
+from typing import Optional
+
+from sqlalchemy import literal_column, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models import Category, CategoryClosure
+from app.utils.cache import LRUCache
+
+TREE_DEPTH_LIMIT = 100
+
+category_table = Category.__table__
+closure_table = CategoryClosure.__table__
+
+# Subtrees only change through the category write handlers, which clear it
+subtree_cache = LRUCache(max_size=1024, ttl=300)
+
+
+def subtree_statement(category_id: int, max_depth: int):
+    # two indexed closure lookups: ancestors get negative depths, the subtree >= 0
+    descendants = (
+        select(category_table, closure_table.c.depth)
+        .join(closure_table, closure_table.c.descendant_id == category_table.c.id)
+        .where(
+            closure_table.c.ancestor_id == category_id,
+            closure_table.c.depth <= max_depth,
+        )
+    )
+    ancestors = (
+        select(category_table, (-closure_table.c.depth).label("depth"))
+        .join(closure_table, closure_table.c.ancestor_id == category_table.c.id)
+        .where(closure_table.c.descendant_id == category_id, closure_table.c.depth > 0)
+    )
+    return union_all(descendants, ancestors).order_by(
+        literal_column("depth"), literal_column("id")
+    )
+
+
+def forest_statement(max_depth: int):
+    root = category_table.alias("root")
+    return (
+        select(category_table, closure_table.c.depth)
+        .join(closure_table, closure_table.c.descendant_id == category_table.c.id)
+        .join(root, root.c.id == closure_table.c.ancestor_id)
+        .where(root.c.parent_id.is_(None), closure_table.c.depth <= max_depth)
+        .order_by(closure_table.c.depth, category_table.c.id)
+    )
+
+
+def descendant_ids(category_id: int):
+    # "everything under X" (X included), usable as an IN (...) subquery
+    return select(closure_table.c.descendant_id).where(
+        closure_table.c.ancestor_id == category_id
+    )
+
+
+def build_nodes(rows):
+    # rows are ordered by depth, so a parent is always seen before its children
+    nodes = {}
+    roots = []
+    for row in rows:
+        node = {key: value for key, value in row.items() if key != "depth"}
+        node["children"] = []
+        nodes[node["id"]] = node
+        parent = nodes.get(node["parent_id"])
+        if row["depth"] > 0 and parent is not None:
+            parent["children"].append(node)
+        else:
+            roots.append(node)
+    return roots
+
+
+def get_subtree(db: Session, category_id: int, max_depth: Optional[int]):
+    max_depth = TREE_DEPTH_LIMIT if max_depth is None else max_depth
+    key = ("subtree", category_id, max_depth)
+    cached = subtree_cache.get(key)
+    if cached is not None:
+        return cached
+
+    rows = db.execute(subtree_statement(category_id, max_depth)).mappings().all()
+    ancestors = [
+        {key: value for key, value in row.items() if key != "depth"}
+        for row in rows
+        if row["depth"] < 0
+    ]
+    roots = build_nodes([row for row in rows if row["depth"] >= 0])
+    subtree = {"ancestors": ancestors, "tree": roots[0]} if roots else None
+    if subtree is not None:
+        subtree_cache.set(key, subtree)
+    return subtree
+
+
+def get_forest(db: Session, max_depth: Optional[int]):
+    max_depth = TREE_DEPTH_LIMIT if max_depth is None else max_depth
+    key = ("forest", max_depth)
+    cached = subtree_cache.get(key)
+    if cached is not None:
+        return cached
+
+    rows = db.execute(forest_statement(max_depth)).mappings().all()
+    forest = build_nodes(rows)
+    subtree_cache.set(key, forest)
+    return forest
+
+
+def invalidate_category_trees():
+    subtree_cache.clear()
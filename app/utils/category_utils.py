@@ -1,24 +1,166 @@
+import base64
+import binascii
+import json
+from typing import List, Optional
+
 from fastapi import HTTPException
+from sqlalchemy import or_, select, tuple_
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.models import Category
-from app.schemas.category_schema import CategoryCreate
-
-
-def check_existing_category(db: Session, category_data: CategoryCreate):
-    existing_category = (db.query(Category).filter(
-        (Category.slug == category_data.slug)
-        | (Category.name == category_data.name)
-        & (Category.level == category_data.level)
-    ).first())
-
-    if existing_category:
-        if (
-            existing_category.name == category_data.name
-            and existing_category.level == category_data.level
-        ):
-            detail_msg = "Category with this name and level exists"
+from app.schemas.category_schema import CategoryCreate, CategoryReturn
+from app.utils.projection import projected_columns, stream_rows
+
+CATEGORY_FIELDS = tuple(CategoryReturn.model_fields)
+DEFAULT_PAGE_SIZE = 100
+
+
+# constraints from app/models.py and the errors the API reports for them
+CONSTRAINT_DETAILS = {
+    "uq_category_slug": "Category with this slug exists",
+    "uq_category_name_level": "Category with this name and level exists",
+    # foreign key of parent_id
+    "category_parent_id_fkey": "Parent category does not exist",
+    # raised by the category_closure re-parent trigger
+    "category_parent_not_descendant": "Category cannot be moved under its descendant",
+}
+
+
+def violated_constraint(error: IntegrityError) -> Optional[str]:
+    # psycopg2 exposes the constraint name on diag, asyncpg on the chained error
+    for source in (getattr(error.orig, "diag", None), error.orig.__cause__):
+        name = getattr(source, "constraint_name", None)
+        if name:
+            return name
+    message = str(error.orig)
+    return next((name for name in CONSTRAINT_DETAILS if name in message), None)
+
+
+def raise_for_integrity_error(error: IntegrityError):
+    detail = CONSTRAINT_DETAILS.get(violated_constraint(error))
+    if detail:
+        raise HTTPException(status_code=400, detail=detail)
+
+
+def encode_cursor(last_id: int, **keys) -> str:
+    # keys: any other sort key the next page starts after, ex: a search rank
+    token = json.dumps({"id": last_id, **keys}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(token).decode().rstrip("=")
+
+
+def decode_cursor_payload(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(payload, dict) or not isinstance(payload.get("id"), int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return payload
+
+
+def decode_cursor(cursor: str) -> int:
+    return decode_cursor_payload(cursor)["id"]
+
+
+def category_columns(fields: Optional[str]):
+    # id is always selected: the keyset cursor is built from it
+    return projected_columns(Category, fields, allowed=CATEGORY_FIELDS)
+
+
+def category_list_criteria(
+    cursor: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    level: Optional[int] = None,
+    parent_id: Optional[int] = None,
+    is_root: Optional[bool] = None,
+):
+    criteria = []
+    if cursor:
+        criteria.append(Category.id > decode_cursor(cursor))
+    if is_active is not None:
+        criteria.append(Category.is_active == is_active)
+    if level is not None:
+        criteria.append(Category.level == level)
+    if parent_id is not None:
+        criteria.append(Category.parent_id == parent_id)
+    # is_root=true: top level categories only (parent_id IS NULL)
+    if is_root is not None:
+        criteria.append(
+            Category.parent_id.is_(None) if is_root else Category.parent_id.isnot(None)
+        )
+    return criteria
+
+
+def page_size(limit: Optional[int], cursor: Optional[str]) -> Optional[int]:
+    # paging is opt-in: without limit nor cursor the list holds every row, as
+    # it did before keyset pagination; a cursor alone gets the default page
+    if limit is None and not cursor:
+        return None
+    return limit or DEFAULT_PAGE_SIZE
+
+
+def paginate(rows, limit: Optional[int]):
+    # rows were fetched with limit + 1 to know whether a next page exists
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1].id)
+    return rows, None
+
+
+def stream_categories(connection: Connection, criteria, batch_size: int):
+    return stream_rows(
+        connection,
+        select(Category.__table__).where(*criteria).order_by(Category.id),
+        batch_size,
+    )
+
+
+def find_bulk_conflicts(db: Session, items: List[CategoryCreate], upsert: bool):
+    """
+    Check every slug and (name, level) of the batch with a single query.
+    Returns the conflicting items as {index: detail} and the items to write
+    as [(index, item)]. In upsert mode an existing slug is not a conflict:
+    that row gets updated.
+    """
+    slugs = {item.slug for item in items}
+    name_levels = {(item.name, item.level) for item in items}
+    existing = db.execute(
+        select(Category.id, Category.name, Category.slug, Category.level).where(
+            or_(
+                Category.slug.in_(slugs),
+                tuple_(Category.name, Category.level).in_(name_levels),
+            )
+        )
+    ).all()
+    existing_by_slug = {row.slug: row for row in existing}
+    existing_by_name_level = {(row.name, row.level): row for row in existing}
+
+    conflicts = {}
+    to_write = []
+    seen_slugs = set()
+    seen_name_levels = set()
+    for index, item in enumerate(items):
+        name_level = (item.name, item.level)
+        by_slug = existing_by_slug.get(item.slug)
+        by_name_level = existing_by_name_level.get(name_level)
+        # in upsert mode the row matched by slug may keep its own name and level
+        same_row = by_slug and by_name_level and by_slug.id == by_name_level.id
+
+        if item.slug in seen_slugs:
+            conflicts[index] = "Duplicate slug in request"
+        elif name_level in seen_name_levels:
+            conflicts[index] = "Duplicate name and level in request"
+        elif by_name_level and not (upsert and same_row):
+            conflicts[index] = "Category with this name and level exists"
+        elif by_slug and not upsert:
+            conflicts[index] = "Category with this slug exists"
         else:
-            detail_msg = "Category with this slug exists"
+            to_write.append((index, item))
+
+        seen_slugs.add(item.slug)
+        seen_name_levels.add(name_level)
 
-        raise HTTPException(status_code=400, detail=detail_msg)
\ No newline at end of file
+    return conflicts, to_write
@@ -0,0 +1,98 @@
+import gzip
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.stream_utils import negotiate_encoding
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional, gzip is always available
+    brotli = None
+
+SUPPORTED_ENCODINGS = ["br", "gzip"] if brotli else ["gzip"]
+
+
+class CompressionMiddleware:
+    """
+    Compresses response bodies of at least minimum_size bytes with the best
+    of encodings (in order of preference) that the client accepts. Small
+    bodies are cheaper to send as they are; streamed responses and those
+    that already carry a Content-Encoding (the category export compresses
+    itself) pass through untouched.
+
+    A compressed body is another representation of the resource, so its
+    strong ETag becomes weak: If-None-Match still matches it (weak
+    comparison) while a strong validator is never shared by two bodies.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1000,
+        encodings: Optional[List[str]] = None,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = [
+            encoding
+            for encoding in (encodings or SUPPORTED_ENCODINGS)
+            if encoding in SUPPORTED_ENCODINGS
+        ]
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding"), self.encodings
+        )
+        start_message: Optional[Message] = None
+        body_started = False
+
+        async def send_compressed(message: Message):
+            nonlocal start_message, body_started
+            if message["type"] == "http.response.start":
+                # held back until the first body chunk tells the size
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or body_started:
+                await send(message)
+                return
+
+            body_started = True
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start_message["headers"])
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or len(body) < self.minimum_size
+            ):
+                await send(start_message)
+                await send(message)
+                return
+
+            headers.add_vary_header("Accept-Encoding")
+            if encoding:
+                body = self.compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+                message = {**message, "body": body}
+            await send(start_message)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
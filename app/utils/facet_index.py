@@ -0,0 +1,190 @@
+import os
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import (
+    Attribute,
+    AttributeValue,
+    Product,
+    ProductLine,
+    ProductLineAttributeValue,
+)
+from app.utils.cache import LRUCache
+
+FACET_INDEX_TTL = float(os.getenv("FACET_INDEX_TTL", "60"))
+
+# a single entry: the index of the whole catalog, rebuilt once it expires
+facet_index_cache = LRUCache(max_size=1, ttl=FACET_INDEX_TTL)
+_build_lock = threading.Lock()
+
+
+class FacetIndex:
+    """
+    In-process bitmap index over the active product lines of active products.
+    Lines get a position in (product_id, id) order and every attribute value
+    owns a Python int whose bit i is set when line i carries that value, so
+    filtering is a handful of big-int AND / OR and counting is bit_count().
+
+    Values selected within one attribute are OR'ed, attributes are AND'ed;
+    the counts of an attribute ignore its own selection (disjunctive facets)
+    so the storefront can show how many lines each alternative would match.
+    """
+
+    def __init__(self, rows: Iterable):
+        self.line_products = []
+        self.values = {}  # attribute_value_id -> (attribute_id, value)
+        self.attributes = {}  # attribute_id -> name
+        value_positions = defaultdict(list)
+        last_line_id = None
+        for row in rows:
+            if row.line_id != last_line_id:
+                self.line_products.append(row.product_id)
+                last_line_id = row.line_id
+            if row.attribute_value_id is not None:
+                value_positions[row.attribute_value_id].append(
+                    len(self.line_products) - 1
+                )
+                self.values[row.attribute_value_id] = (
+                    row.attribute_id,
+                    row.attribute_value,
+                )
+                self.attributes[row.attribute_id] = row.attribute_name
+
+        size = len(self.line_products)
+        self.all_lines = (1 << size) - 1
+        self.bitmaps = {
+            value_id: bitmap(positions, size)
+            for value_id, positions in value_positions.items()
+        }
+
+    def search(
+        self,
+        attribute_value_ids: Iterable[int],
+        unused_values: Optional[Dict[int, int]] = None,
+    ):
+        """
+        Returns the matching product ids, ascending, and the facets: every
+        attribute with the number of matching lines for each of its values.
+        unused_values maps the attribute values that exist but that no
+        indexed line carries to their attribute: selecting one matches
+        nothing, only values that do not exist at all are an error.
+        """
+        unused_values = unused_values or {}
+        unknown = sorted(
+            set(attribute_value_ids) - set(self.values) - set(unused_values)
+        )
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown attribute values: {', '.join(map(str, unknown))}",
+            )
+
+        selected = defaultdict(int)
+        for value_id in attribute_value_ids:
+            if value_id in self.values:
+                selected[self.values[value_id][0]] |= self.bitmaps[value_id]
+            else:
+                selected[unused_values[value_id]] |= 0
+
+        def matching(excluded_attribute=None):
+            bits = self.all_lines
+            for attribute_id, attribute_bits in selected.items():
+                if attribute_id != excluded_attribute:
+                    bits &= attribute_bits
+            return bits
+
+        matched = matching()
+        bases = {attribute_id: matching(attribute_id) for attribute_id in selected}
+        facets = {
+            attribute_id: {"attribute_id": attribute_id, "name": name, "values": []}
+            for attribute_id, name in sorted(self.attributes.items())
+        }
+        for value_id, (attribute_id, value) in sorted(self.values.items()):
+            base = bases.get(attribute_id, matched)
+            facets[attribute_id]["values"].append(
+                {
+                    "id": value_id,
+                    "value": value,
+                    "count": (base & self.bitmaps[value_id]).bit_count(),
+                }
+            )
+        return self.product_ids(matched), list(facets.values())
+
+    def product_ids(self, bits: int):
+        # lines are in product order, so distinct ids come out sorted
+        positions = (m.start() for m in re.finditer("1", format(bits, "b")[::-1]))
+        return list(dict.fromkeys(self.line_products[i] for i in positions))
+
+
+def bitmap(positions, size):
+    bits = bytearray((size + 7) // 8)
+    for position in positions:
+        bits[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bits, "little")
+
+
+def facet_rows_statement():
+    return (
+        select(
+            ProductLine.id.label("line_id"),
+            ProductLine.product_id,
+            ProductLineAttributeValue.attribute_value_id,
+            AttributeValue.attribute_id,
+            AttributeValue.attribute_value,
+            Attribute.name.label("attribute_name"),
+        )
+        .join(Product, Product.id == ProductLine.product_id)
+        .outerjoin(
+            ProductLineAttributeValue,
+            ProductLineAttributeValue.product_line_id == ProductLine.id,
+        )
+        .outerjoin(
+            AttributeValue,
+            AttributeValue.id == ProductLineAttributeValue.attribute_value_id,
+        )
+        .outerjoin(Attribute, Attribute.id == AttributeValue.attribute_id)
+        .where(Product.is_active.is_(True), ProductLine.is_active.is_(True))
+        .order_by(ProductLine.product_id, ProductLine.id)
+    )
+
+
+def get_facet_index(db: Session) -> FacetIndex:
+    index = facet_index_cache.get("catalog")
+    if index is not None:
+        return index
+    # one request rebuilds, the others wait for it instead of piling up
+    with _build_lock:
+        index = facet_index_cache.get("catalog")
+        if index is None:
+            index = FacetIndex(db.execute(facet_rows_statement()))
+            facet_index_cache.set("catalog", index)
+    return index
+
+
+def search_facets(db: Session, attribute_value_ids: Iterable[int]):
+    # ids missing from the index are looked up: an attribute value that exists
+    # without an active line carrying it is a valid, empty, selection
+    index = get_facet_index(db)
+    unindexed = set(attribute_value_ids) - set(index.values)
+    unused_values = {}
+    if unindexed:
+        unused_values = dict(
+            db.execute(
+                select(AttributeValue.id, AttributeValue.attribute_id).where(
+                    AttributeValue.id.in_(unindexed)
+                )
+            ).all()
+        )
+    return index.search(attribute_value_ids, unused_values)
+
+
+def invalidate_facet_index():
+    # for writes of is_active or of attribute links, the only columns the
+    # index reads; stock changes leave it valid, expiry covers the rest
+    facet_index_cache.clear()
@@ -0,0 +1,144 @@
+import logging
+import os
+import threading
+from collections import defaultdict
+from typing import Callable, Optional
+
+from fastapi import Depends, Header, HTTPException, Response
+from sqlalchemy import BigInteger, cast, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db_connection import get_db_session
+from app.models import TableVersion
+
+logger = logging.getLogger("app")
+
+# Cache-Control per route, each overridable through CACHE_CONTROL_<ROUTE>
+# (ex: CACHE_CONTROL_CATEGORY_LIST="public, max-age=30")
+CACHE_CONTROL_DEFAULTS = {
+    "category_list": "public, no-cache",
+    "category_detail": "public, max-age=60",
+}
+
+# table name -> the last version this process has seen, and the in-process
+# caches to drop when another worker (or this one) moves it
+_seen_versions = {}
+_version_listeners = defaultdict(list)
+_versions_lock = threading.Lock()
+
+
+def cache_control(route: str) -> str:
+    return os.getenv(f"CACHE_CONTROL_{route.upper()}", CACHE_CONTROL_DEFAULTS[route])
+
+
+def table_version_statement(table_name: str):
+    # the sum of the per-backend slots of the table (see migration 6b1d4f8a2c95)
+    return select(cast(func.sum(TableVersion.version), BigInteger)).where(
+        TableVersion.table_name == table_name
+    )
+
+
+def get_table_version(db: Session, table_name: str) -> Optional[int]:
+    return db.execute(table_version_statement(table_name)).scalar()
+
+
+async def get_table_version_async(db: AsyncSession, table_name: str) -> Optional[int]:
+    return (await db.execute(table_version_statement(table_name))).scalar()
+
+
+def read_table_version(db: Session, table_name: str) -> Optional[int]:
+    try:
+        version = get_table_version(db, table_name)
+    except SQLAlchemyError as e:
+        # ETags are an optimisation, the route still answers without one
+        db.rollback()
+        logger.warning(f"Could not read the {table_name} table version: {e}")
+        return None
+    if version is not None:
+        observe_table_version(table_name, version)
+    return version
+
+
+async def read_table_version_async(
+    db: AsyncSession, table_name: str
+) -> Optional[int]:
+    try:
+        version = await get_table_version_async(db, table_name)
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.warning(f"Could not read the {table_name} table version: {e}")
+        return None
+    if version is not None:
+        observe_table_version(table_name, version)
+    return version
+
+
+def on_table_version_change(table_name: str, callback: Callable[[], None]):
+    _version_listeners[table_name].append(callback)
+
+
+def observe_table_version(table_name: str, version: int):
+    # a version moved by a write of any worker clears the local caches, so
+    # they never hand out rows older than the ETag they are sent with
+    with _versions_lock:
+        changed = _seen_versions.get(table_name) != version
+        _seen_versions[table_name] = version
+    if changed:
+        for callback in _version_listeners[table_name]:
+            callback()
+
+
+def table_etag(table_name: str, version: int) -> str:
+    return f'"{table_name}-{version}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison: W/ prefixes are ignored
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+def check_not_modified(
+    response: Response,
+    if_none_match: Optional[str],
+    table_name: str,
+    version: Optional[int],
+    route: str,
+):
+    # raises 304 Not Modified on a matching If-None-Match, or else sets the
+    # ETag and Cache-Control headers of the response; no version, no ETag
+    if version is None:
+        return
+    headers = {
+        "ETag": table_etag(table_name, version),
+        "Cache-Control": cache_control(route),
+    }
+    if if_none_match and etag_matches(if_none_match, headers["ETag"]):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+
+def conditional_get(table_name: str, route: str):
+    """
+    Dependency for GET routes whose response only depends on table_name.
+    The ETag is the version of the table, so a matching If-None-Match is
+    answered 304 Not Modified after a single indexed read of table_version,
+    before the route loads or serialises anything. The version is read before
+    the data: a write in between can only make the ETag older than the body,
+    which the next request corrects.
+    """
+
+    def dependency(
+        response: Response,
+        if_none_match: Optional[str] = Header(None),
+        db: Session = Depends(get_db_session),
+    ):
+        version = read_table_version(db, table_name)
+        check_not_modified(response, if_none_match, table_name, version, route)
+
+    return dependency
@@ -0,0 +1,109 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+from fastapi import HTTPException
+from sqlalchemy import Integer, case, cast, column, exists, select, update, values
+from sqlalchemy.orm import Session
+
+from app.models import Product, ProductLine
+from app.schemas.inventory_schema import StockChangeItem
+
+product_table = Product.__table__
+product_line_table = ProductLine.__table__
+
+
+def merge_items(items: List[StockChangeItem]) -> Dict[int, int]:
+    # one entry per line, in id order: every transaction then locks the rows
+    # it shares with another one in the same order and they cannot deadlock
+    quantities = defaultdict(int)
+    for item in items:
+        quantities[item.product_line_id] += item.quantity
+    return dict(sorted(quantities.items()))
+
+
+def lock_lines(db: Session, quantities: Dict[int, int]):
+    # row locks only, taken in id order (LockRows runs above the sort)
+    return db.execute(
+        select(product_line_table.c.id, product_line_table.c.stock_qty)
+        .where(product_line_table.c.id.in_(quantities))
+        .order_by(product_line_table.c.id)
+        .with_for_update()
+    ).all()
+
+
+def check_lines(quantities: Dict[int, int], lines, reserve: bool):
+    found = {line.id for line in lines}
+    missing = [id_ for id_ in quantities if id_ not in found]
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Product lines not found: {', '.join(map(str, missing))}",
+        )
+    short = [
+        line.id for line in lines if reserve and line.stock_qty < quantities[line.id]
+    ]
+    if short:
+        raise HTTPException(
+            status_code=409,
+            detail="Insufficient stock for product lines: "
+            f"{', '.join(map(str, short))}",
+        )
+
+
+def change_stock(db: Session, quantities: Dict[int, int], reserve: bool):
+    """
+    One UPDATE ... FROM (VALUES ...) for every line of the request. Reserving
+    keeps the stock_qty >= quantity guard, so stock can never go negative
+    even for a caller that skipped lock_lines.
+    """
+    changes = values(
+        column("id", Integer), column("quantity", Integer), name="change"
+    ).data(list(quantities.items()))
+    line = product_line_table
+    statement = update(line).where(line.c.id == changes.c.id)
+    if reserve:
+        statement = statement.where(line.c.stock_qty >= changes.c.quantity).values(
+            stock_qty=line.c.stock_qty - changes.c.quantity
+        )
+    else:
+        statement = statement.values(stock_qty=line.c.stock_qty + changes.c.quantity)
+    rows = db.execute(
+        statement.returning(line.c.id, line.c.product_id, line.c.stock_qty)
+    ).all()
+    if len(rows) != len(quantities):
+        raise HTTPException(status_code=409, detail="Insufficient stock")
+    return sorted(rows, key=lambda row: row.id)
+
+
+def sync_stock_status(db: Session, product_ids: Iterable[int]):
+    """
+    Product.stock_status follows its lines: "is" while any line has stock,
+    "oos" otherwise. "obo" is set by hand and left alone. The product rows
+    are locked (in id order, after the line locks of the caller) before the
+    status is computed: two transactions emptying different lines of one
+    product would otherwise each still see the other line in stock and both
+    leave it "is". Under READ COMMITTED the UPDATE that follows the lock sees
+    every line committed by the transaction that held it.
+    """
+    product_ids = sorted(product_ids)
+    product = product_table
+    db.execute(
+        select(product.c.id)
+        .where(product.c.id.in_(product_ids))
+        .order_by(product.c.id)
+        .with_for_update()
+    ).all()
+    in_stock = exists().where(
+        product_line_table.c.product_id == product.c.id,
+        product_line_table.c.stock_qty > 0,
+    )
+    status = cast(case((in_stock, "is"), else_="oos"), product.c.stock_status.type)
+    db.execute(
+        update(product)
+        .where(
+            product.c.id.in_(product_ids),
+            product.c.stock_status != "obo",
+            product.c.stock_status != status,
+        )
+        .values(stock_status=status)
+    )
@@ -0,0 +1,170 @@
+"""
+Logging for the app, loaded by app/main.py. Loggers only put records on a
+queue; formatting and handler I/O (stdout, LOG_FILE) happen on the thread of
+a QueueListener, so neither the event loop nor the threadpool waits on them.
+Lines are JSON (LOG_FORMAT=json, the default) or plain text, and carry the
+id of the request they were logged in.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_FILE = os.getenv("LOG_FILE")
+# share of the INFO (and DEBUG) records kept, warnings and errors are all kept
+LOG_INFO_SAMPLE_RATE = float(os.getenv("LOG_INFO_SAMPLE_RATE", "1"))
+ACCESS_LOG = os.getenv("ACCESS_LOG", "true").lower() in ("1", "true")
+
+access_logger = logging.getLogger("app.access")
+
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# attributes every LogRecord has, anything else was passed through extra=
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "request_id"}
+
+_listener: Optional[QueueListener] = None
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES:
+                data[key] = value
+        if record.exc_text:
+            data["exception"] = record.exc_text
+        return json.dumps(data, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or self.rate >= 1:
+            return True
+        return random.random() < self.rate
+
+
+class RequestQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves the formatting to the listener: it only renders
+    the message and the traceback, which need the arguments and the
+    exception of the caller, and stamps the record with the request id,
+    which only the caller's context knows.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        record.request_id = request_id.get()
+        return record
+
+
+def setup_logging() -> QueueListener:
+    # idempotent: app.main can be imported more than once (tests, reloads)
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    if LOG_FORMAT == "json":
+        formatter = JSONFormatter()
+    else:
+        formatter = logging.Formatter(
+            "%(asctime)s - %(levelname)s - %(request_id)s - %(message)s"
+        )
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if LOG_FILE:
+        handlers.append(logging.FileHandler(LOG_FILE))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = RequestQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(LOG_INFO_SAMPLE_RATE))
+
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    root.addHandler(queue_handler)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    # flush what is still queued when the process exits
+    atexit.register(_listener.stop)
+    return _listener
+
+
+class RequestLoggingMiddleware:
+    """
+    Gives every HTTP request an id (the X-Request-ID it came with, or a new
+    one), sent back in the X-Request-ID header and attached to every record
+    logged while serving it, and logs one access line with its duration.
+    """
+
+    def __init__(self, app: ASGIApp, access_log: bool = ACCESS_LOG):
+        self.app = app
+        self.access_log = access_log
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope["headers"]).get(b"x-request-id")
+        current_id = incoming.decode("latin-1") if incoming else uuid.uuid4().hex
+        token = request_id.set(current_id)
+        status = 500
+
+        async def send_with_id(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message)["X-Request-ID"] = current_id
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            duration_ms = round((time.perf_counter() - start) * 1000, 3)
+            if self.access_log:
+                access_logger.info(
+                    "%s %s %s %.1fms",
+                    scope["method"],
+                    scope["path"],
+                    status,
+                    duration_ms,
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status,
+                        "duration_ms": duration_ms,
+                    },
+                )
+            request_id.reset(token)
@@ -0,0 +1,290 @@
+"""
+Prometheus text exposition (format 0.0.4) without the client library: the
+few metric types the app needs, a registry rendered by GET /metrics, the
+ASGI middleware that records every request and the engine hooks that
+count the queries and the database time of the request they run in.
+"""
+
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Iterable, List, Optional, Sequence
+
+from sqlalchemy import event
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", r"\\").replace('"', r"\"")
+        value = value.replace("\n", r"\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help_: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = self.header()
+        for label_values, value in values:
+            labels = format_labels(self.labels, label_values)
+            lines.append(f"{self.name}{labels} {format_value(value)}")
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, *label_values, amount: float = 1):
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, value: float, *label_values):
+        with self._lock:
+            self._values[label_values] = value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name, help_, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value: float, *label_values):
+        with self._lock:
+            entry = self._values.get(label_values)
+            if entry is None:
+                # one count per bucket (not cumulative yet), then sum
+                entry = self._values[label_values] = [0] * len(self.buckets) + [0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[index] += 1
+                    break
+            entry[-1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(
+                (label_values, list(entry))
+                for label_values, entry in self._values.items()
+            )
+        lines = self.header()
+        names = self.labels + ("le",)
+        for label_values, entry in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets, entry):
+                cumulative += count
+                labels = format_labels(names, label_values + (format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {format_value(float(entry[-1]))}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """
+    Metrics rendered in registration order. Collectors are callables run at
+    scrape time, for values that live elsewhere (pool and cache stats).
+    """
+
+    def __init__(self):
+        self.metrics: List[Metric] = []
+        self.collectors: List[Callable[[], Iterable[Metric]]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[Metric]]):
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collector in self.collectors:
+            for metric in collector():
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(
+    Counter(
+        "http_requests_total",
+        "HTTP requests by route template and status code.",
+        ("method", "route", "status"),
+    )
+)
+http_request_duration = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Time from the request to the last byte of the response.",
+        ("method", "route"),
+    )
+)
+http_requests_in_flight = registry.register(
+    Gauge(
+        "http_requests_in_flight",
+        "Requests being served right now.",
+        ("method", "route"),
+    )
+)
+http_response_size = registry.register(
+    Histogram(
+        "http_response_size_bytes",
+        "Response body size as sent (after compression).",
+        ("method", "route"),
+        buckets=SIZE_BUCKETS,
+    )
+)
+db_queries_per_request = registry.register(
+    Histogram(
+        "db_queries_per_request",
+        "SQL statements executed while serving one request.",
+        ("method", "route"),
+        buckets=QUERY_COUNT_BUCKETS,
+    )
+)
+db_time_per_request = registry.register(
+    Histogram(
+        "db_time_per_request_seconds",
+        "Time spent in SQL statements while serving one request.",
+        ("method", "route"),
+    )
+)
+
+
+class QueryStats:
+    __slots__ = ("route", "queries", "seconds")
+
+    def __init__(self, route: Optional[str] = None):
+        self.route = route
+        self.queries = 0
+        self.seconds = 0.0
+
+
+# stats of the request being served; sync routes run in the threadpool with
+# a copy of the context, which still points at the same QueryStats
+request_query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "request_query_stats", default=None
+)
+
+
+def register_query_listeners(engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if context is not None:
+            context.query_started_at = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        stats = request_query_stats.get()
+        started_at = getattr(context, "query_started_at", None)
+        if stats is not None and started_at is not None:
+            stats.queries += 1
+            stats.seconds += time.perf_counter() - started_at
+
+
+def route_template(router, scope: Scope) -> str:
+    # the path template (/api/category/{category_id}), never the raw path:
+    # one series per route, whatever ids the clients ask for
+    partial = None
+    for route in router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path
+    return partial or "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Records count, latency, in-flight requests, response size and the
+    database work of every HTTP request, labelled with its route template.
+    Wraps compression, so sizes are the bytes actually sent.
+    """
+
+    def __init__(self, app: ASGIApp, router):
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(self.router, scope)
+        status = 500
+        size = 0
+        stats = QueryStats(route)
+        token = request_query_stats.set(stats)
+
+        async def send_recorded(message: Message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        http_requests_in_flight.inc(method, route)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_recorded)
+        finally:
+            elapsed = time.perf_counter() - start
+            request_query_stats.reset(token)
+            http_requests_in_flight.dec(method, route)
+            http_requests.inc(method, route, str(status))
+            http_request_duration.observe(elapsed, method, route)
+            http_response_size.observe(size, method, route)
+            db_queries_per_request.observe(stats.queries, method, route)
+            db_time_per_request.observe(stats.seconds, method, route)
@@ -0,0 +1,98 @@
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+
+class PoolStats:
+    """
+    Counters for a connection pool: how often connections are checked out,
+    how long callers wait for one, and how often the pool has to open new
+    physical connections (churn) or go into overflow (starvation).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.checkins = 0
+            self.connects = 0
+            self.invalidations = 0
+            self.overflow_checkouts = 0
+            self.timeouts = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def snapshot(self, pool=None):
+        with self._lock:
+            data = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "overflow_checkouts": self.overflow_checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+            }
+        if isinstance(pool, QueuePool):
+            data.update(
+                {
+                    "pool_size": pool.size(),
+                    "checked_out": pool.checkedout(),
+                    "checked_in": pool.checkedin(),
+                    "overflow": max(pool.overflow(), 0),
+                }
+            )
+        return data
+
+
+def instrumented_pool_class(pool_class, stats: PoolStats):
+    # QueuePool has no "before checkout" event, so the time spent waiting for a
+    # free connection is measured around _do_get(). The subclass is also what
+    # the pool recreates itself as on engine.dispose(), so stats survive it.
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return pool_class._do_get(self)
+        except exc.TimeoutError:
+            stats.incr("timeouts")
+            raise
+        finally:
+            stats.record_wait(time.perf_counter() - start)
+
+    name = f"Instrumented{pool_class.__name__}"
+    return type(name, (pool_class,), {"_do_get": _do_get})
+
+
+def register_pool_listeners(engine, stats: PoolStats):
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        stats.incr("connects")
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        stats.incr("checkouts")
+        if isinstance(engine.pool, QueuePool) and engine.pool.overflow() > 0:
+            stats.incr("overflow_checkouts")
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        stats.incr("checkins")
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        stats.incr("invalidations")
@@ -0,0 +1,55 @@
+from typing import Optional
+
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+
+from app.models import AttributeValue, Product, ProductLine
+from app.utils.category_tree import descendant_ids
+from app.utils.category_utils import decode_cursor
+
+
+def product_aggregate_options():
+    """
+    Loader options for a whole product page in a fixed number of queries,
+    whatever the number of products, lines or images:
+
+    1. products, joined with their category and seasonal event
+    2. product types of every product (selectin)
+    3. lines of every product (selectin)
+    4. images of every line (selectin)
+    5. attribute values of every line, joined with their attribute
+
+    raiseload("*") turns any relationship left out of this list into an
+    error instead of a silent query per row.
+    """
+    return (
+        joinedload(Product.category),
+        joinedload(Product.seasonal_event),
+        selectinload(Product.product_types),
+        selectinload(Product.lines).options(
+            selectinload(ProductLine.images),
+            selectinload(ProductLine.attribute_values).joinedload(
+                AttributeValue.attribute
+            ),
+            raiseload("*"),
+        ),
+        raiseload("*"),
+    )
+
+
+def product_list_criteria(
+    cursor: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    category_id: Optional[int] = None,
+    include_subcategories: bool = False,
+):
+    criteria = []
+    if cursor:
+        criteria.append(Product.id > decode_cursor(cursor))
+    if is_active is not None:
+        criteria.append(Product.is_active == is_active)
+    if category_id is not None:
+        if include_subcategories:
+            criteria.append(Product.category_id.in_(descendant_ids(category_id)))
+        else:
+            criteria.append(Product.category_id == category_id)
+    return criteria
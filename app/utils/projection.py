@@ -0,0 +1,54 @@
+"""
+Read-only path for list and export endpoints: select columns, not entities.
+A column query returns plain Row tuples, so SQLAlchemy skips the identity
+map, attribute instrumentation and change tracking it sets up for every ORM
+instance it loads. Works for any model of app/models.py.
+"""
+
+from typing import Iterable, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+
+
+def model_fields(model) -> Tuple[str, ...]:
+    # mapped columns in table order; deferred ones (ex: search vectors) are
+    # only loaded on request, so they are not part of a default projection
+    return tuple(
+        prop.key for prop in inspect(model).column_attrs if not prop.deferred
+    )
+
+
+def projected_columns(
+    model,
+    fields: Optional[str] = None,
+    allowed: Optional[Sequence[str]] = None,
+    required: Iterable[str] = ("id",),
+):
+    """
+    Columns of model for a comma separated fields= value, in the order of
+    allowed (every field of the model by default). Required fields (the
+    keyset cursor column) are always selected, no fields selects them all.
+    """
+    allowed = tuple(allowed or model_fields(model))
+    if not fields:
+        return [getattr(model, field) for field in allowed]
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = sorted(requested - set(allowed))
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    requested.update(required)
+    return [getattr(model, field) for field in allowed if field in requested]
+
+
+def stream_rows(connection: Connection, statement, batch_size: int):
+    # server-side cursor: rows are fetched batch_size at a time, never all at
+    # once; the generator owns the connection and closes it once exhausted
+    with connection:
+        result = connection.execution_options(
+            stream_results=True, yield_per=batch_size
+        ).execute(statement)
+        yield from result.mappings().partitions()
@@ -0,0 +1,39 @@
+import os
+from typing import Any, Type
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the json module is the fallback
+    orjson = None
+
+# FAST_JSON=false keeps the standard library encoder even with orjson around
+FAST_JSON = os.getenv("FAST_JSON", "true").lower() in ("1", "true")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered by orjson. The content is what FastAPI hands to
+    any response class: already converted to JSON types by the response
+    model (or jsonable_encoder), so only the encoding to bytes changes.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def default_response_class() -> Type[JSONResponse]:
+    return FastJSONResponse if FAST_JSON and orjson else JSONResponse
+
+
+def json_bytes_response(body: bytes, response: Response) -> Response:
+    # a returned Response skips the response model and does not inherit the
+    # headers set on the injected one (X-Next-Cursor, ETag, ...)
+    headers = {
+        key: value
+        for key, value in response.headers.items()
+        if key != "content-length"
+    }
+    return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,96 @@
+import re
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import Double, and_, cast, func, literal_column, or_, select
+from sqlalchemy.orm import Session
+
+from app.models import Category, Product
+from app.utils.category_utils import decode_cursor_payload, encode_cursor
+
+# must match the expressions of the GIN indexes (see app/models.py)
+SEARCH_CONFIG = literal_column("'english'")
+CATEGORY_DOCUMENT = func.to_tsvector(SEARCH_CONFIG, Category.name)
+PRODUCT_DOCUMENT = Product.search_vector
+
+
+def prefix_tsquery(q: str) -> Optional[str]:
+    # every word must match, the last characters typed may be a prefix
+    terms = re.findall(r"\w+", q.lower())
+    return " & ".join(f"{term}:*" for term in terms) or None
+
+
+def ranked_rows(db: Session, id_column, columns, rank, match, payload, limit):
+    # real -> double precision so the rank round-trips exactly in the cursor
+    rank = cast(rank, Double)
+    criteria = [match]
+    if payload:
+        last_rank = payload.get("rank")
+        if isinstance(last_rank, bool) or not isinstance(last_rank, (int, float)):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        criteria.append(
+            or_(
+                rank < last_rank,
+                and_(rank == last_rank, id_column > payload["id"]),
+            )
+        )
+    return db.execute(
+        select(*columns, rank.label("rank"))
+        .where(*criteria)
+        .order_by(rank.desc(), id_column)
+        .limit(limit + 1)
+    ).all()
+
+
+def search(
+    db: Session,
+    id_column,
+    columns,
+    document,
+    name_column,
+    q: str,
+    cursor: Optional[str],
+    limit: int,
+):
+    """
+    Full-text search ranked by ts_rank, keyset paginated on (rank, id).
+    When the first page finds nothing, falls back to pg_trgm similarity on
+    the name so that a typo still finds something; the cursor remembers
+    which of the two the pages come from.
+    """
+    payload = decode_cursor_payload(cursor) if cursor else None
+    fuzzy = bool(payload and payload.get("fuzzy"))
+
+    rows = []
+    if not fuzzy:
+        query_text = prefix_tsquery(q)
+        if query_text is None:
+            return [], None
+        tsquery = func.to_tsquery(SEARCH_CONFIG, query_text)
+        rows = ranked_rows(
+            db,
+            id_column,
+            columns,
+            func.ts_rank(document, tsquery),
+            document.op("@@")(tsquery),
+            payload,
+            limit,
+        )
+        fuzzy = not rows and payload is None
+
+    if fuzzy:
+        rows = ranked_rows(
+            db,
+            id_column,
+            columns,
+            func.similarity(name_column, q),
+            name_column.op("%")(q),
+            payload,
+            limit,
+        )
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, encode_cursor(last.id, rank=last.rank, fuzzy=fuzzy)
+    return rows, None
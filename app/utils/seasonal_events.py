@@ -0,0 +1,141 @@
+import os
+import threading
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Product, SeasonalEvent
+from app.utils.cache import LRUCache
+
+SEASONAL_EVENT_TTL = float(os.getenv("SEASONAL_EVENT_TTL", "300"))
+
+# "schedule": the events that have not ended yet, "active": the events active
+# right now with their products, which expires at the next start or end date
+seasonal_event_cache = LRUCache(max_size=2, ttl=SEASONAL_EVENT_TTL)
+_build_lock = threading.Lock()
+
+
+def utc_now() -> datetime:
+    # start_date / end_date are naive timestamps, in UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class EventSchedule:
+    """
+    Stabbing queries over the event periods [start_date, end_date). The
+    start and end dates cut the time line into segments during which the
+    set of active events cannot change; the schedule keeps those boundaries
+    sorted with the events active in each segment, so both "active at t"
+    and "next change after t" are a single bisect.
+    """
+
+    def __init__(self, events: Iterable):
+        self.events = {
+            event.id: event for event in events if event.start_date < event.end_date
+        }
+        starts = defaultdict(set)
+        ends = defaultdict(set)
+        for event in self.events.values():
+            starts[event.start_date].add(event.id)
+            ends[event.end_date].add(event.id)
+        self.boundaries = sorted(starts.keys() | ends.keys())
+
+        # segments[i]: events active from boundaries[i] to boundaries[i + 1]
+        self.segments = []
+        active = set()
+        for boundary in self.boundaries:
+            active = (active - ends[boundary]) | starts[boundary]
+            self.segments.append(
+                tuple(
+                    sorted(
+                        active,
+                        key=lambda id_: (self.events[id_].start_date, id_),
+                    )
+                )
+            )
+
+    def active_at(self, at: datetime) -> Tuple[int, ...]:
+        index = bisect_right(self.boundaries, at) - 1
+        return self.segments[index] if index >= 0 else ()
+
+    def next_boundary(self, at: datetime) -> Optional[datetime]:
+        index = bisect_right(self.boundaries, at)
+        return self.boundaries[index] if index < len(self.boundaries) else None
+
+
+def get_schedule(db: Session, now: datetime) -> EventSchedule:
+    schedule = seasonal_event_cache.get("schedule")
+    if schedule is None:
+        schedule = EventSchedule(
+            db.execute(
+                select(
+                    SeasonalEvent.id,
+                    SeasonalEvent.name,
+                    SeasonalEvent.start_date,
+                    SeasonalEvent.end_date,
+                ).where(SeasonalEvent.end_date > now)
+            ).all()
+        )
+        seasonal_event_cache.set("schedule", schedule)
+    return schedule
+
+
+def load_active_events(db: Session, schedule: EventSchedule, event_ids):
+    events = {
+        id_: {**schedule.events[id_]._asdict(), "products": []} for id_ in event_ids
+    }
+    if events:
+        products = db.execute(
+            select(
+                Product.id,
+                Product.name,
+                Product.slug,
+                Product.category_id,
+                Product.stock_status,
+                Product.seasonal_event_id,
+            )
+            .where(
+                Product.seasonal_event_id.in_(events),
+                Product.is_active.is_(True),
+            )
+            .order_by(Product.id)
+        ).all()
+        for product in products:
+            product = product._asdict()
+            events[product.pop("seasonal_event_id")]["products"].append(product)
+    return list(events.values())
+
+
+def get_active_events(db: Session):
+    """
+    Returns the events active now, each with its active products, and the
+    date at which that answer changes (the next event start or end, None
+    when nothing is scheduled). The answer is cached until exactly that
+    date, so no request scans the events table for date ranges.
+    """
+    cached = seasonal_event_cache.get("active")
+    if cached is not None:
+        return cached
+    # one request rebuilds, the others wait for it instead of piling up
+    with _build_lock:
+        cached = seasonal_event_cache.get("active")
+        if cached is None:
+            now = utc_now()
+            schedule = get_schedule(db, now)
+            events = load_active_events(db, schedule, schedule.active_at(now))
+            expires_at = schedule.next_boundary(now)
+            cached = (events, expires_at)
+            ttl = SEASONAL_EVENT_TTL
+            if expires_at is not None:
+                remaining = (expires_at - utc_now()).total_seconds()
+                ttl = max(0.0, min(ttl, remaining))
+            seasonal_event_cache.set("active", cached, ttl=ttl)
+    return cached
+
+
+def invalidate_seasonal_events():
+    seasonal_event_cache.clear()
@@ -0,0 +1,119 @@
+"""
+Opt-in SQL profiling (SQL_PROFILING=true): statements slower than
+SLOW_QUERY_MS are logged with their parameters and the route that issued
+them, and a sample of them (SLOW_QUERY_EXPLAIN_RATE, 0 to 1) gets its plan
+logged too. In debug mode (DEBUG=true) every response carries the number of
+queries and the database time of its request.
+"""
+
+import logging
+import os
+import random
+import time
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import request_query_stats
+
+logger = logging.getLogger("app")
+
+SQL_PROFILING = os.getenv("SQL_PROFILING", "false").lower() in ("1", "true")
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+SLOW_QUERY_EXPLAIN_RATE = float(os.getenv("SLOW_QUERY_EXPLAIN_RATE", "0"))
+DEBUG = os.getenv("DEBUG", "false").lower() in ("1", "true")
+
+# parameters of bulk statements can be huge, the log keeps their beginning
+MAX_PARAMETERS_LENGTH = 1000
+
+
+def format_parameters(parameters) -> str:
+    text = repr(parameters)
+    if len(text) > MAX_PARAMETERS_LENGTH:
+        return text[:MAX_PARAMETERS_LENGTH] + "..."
+    return text
+
+
+def explain_statement(statement: str) -> str:
+    # ANALYZE runs the statement again: fine for a SELECT, not for a write,
+    # which only gets its estimated plan
+    if statement.lstrip()[:6].upper() == "SELECT":
+        return f"EXPLAIN (ANALYZE, BUFFERS) {statement}"
+    return f"EXPLAIN {statement}"
+
+
+def explain(conn, statement, parameters) -> str:
+    # own cursor, so the rows of the profiled statement stay readable, inside
+    # a savepoint, so a failing EXPLAIN does not abort the request transaction
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT sql_profiling")
+        try:
+            cursor.execute(explain_statement(statement), parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        finally:
+            cursor.execute("ROLLBACK TO SAVEPOINT sql_profiling")
+        return plan
+    finally:
+        cursor.close()
+
+
+def log_slow_query(conn, statement, parameters, elapsed_ms, many):
+    stats = request_query_stats.get()
+    route = stats.route if stats is not None and stats.route else "no request"
+    logger.warning(
+        f"Slow query ({elapsed_ms:.1f} ms) on {route}: {statement} "
+        f"parameters={format_parameters(parameters)}"
+    )
+    if (
+        many
+        or conn.dialect.name != "postgresql"
+        or random.random() >= SLOW_QUERY_EXPLAIN_RATE
+    ):
+        return
+    try:
+        plan = explain(conn, statement, parameters)
+        logger.warning(f"Plan of the slow query on {route}:\n{plan}")
+    except Exception as e:
+        logger.error(f"Error explaining the slow query on {route}: {str(e)}")
+
+
+def register_slow_query_listeners(engine, threshold_ms: float = SLOW_QUERY_MS):
+    # timed from the query_started_at set by the metrics listeners
+    # (app/utils/metrics.py), which must be registered on the engine first
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        started_at = getattr(context, "query_started_at", None)
+        if started_at is None:
+            return
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        if elapsed_ms >= threshold_ms:
+            log_slow_query(conn, statement, parameters, elapsed_ms, many)
+
+
+class DBTimingHeadersMiddleware:
+    """
+    Adds X-DB-Queries and X-DB-Time (milliseconds) to the response, from the
+    request stats of MetricsMiddleware, which must wrap this middleware.
+    Queries run while streaming the body come after the headers and are not
+    counted.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        stats = request_query_stats.get()
+        if scope["type"] != "http" or stats is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Queries"] = str(stats.queries)
+                headers["X-DB-Time"] = f"{stats.seconds * 1000:.3f}"
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
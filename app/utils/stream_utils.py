@@ -0,0 +1,84 @@
+import json
+import zlib
+from typing import List, Optional
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, gzip is always available
+    zstandard = None
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+JSON_MEDIA_TYPE = "application/json"
+
+
+def dumps(row) -> bytes:
+    return json.dumps(dict(row), separators=(",", ":"), default=str).encode()
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    # NDJSON unless the client explicitly asks for JSON and not for NDJSON
+    accept = (accept or "").lower()
+    if JSON_MEDIA_TYPE in accept and "ndjson" not in accept:
+        return JSON_MEDIA_TYPE
+    return NDJSON_MEDIA_TYPE
+
+
+def negotiate_encoding(
+    accept_encoding: Optional[str], available: Optional[List[str]] = None
+) -> Optional[str]:
+    # available is in order of preference, the first wins on equal q-values
+    accepted = {}
+    for item in (accept_encoding or "").lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if coding and quality > 0:
+            accepted[coding] = quality
+
+    if available is None:
+        available = ["zstd", "gzip"] if zstandard else ["gzip"]
+    candidates = [coding for coding in available if coding in accepted]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda coding: accepted[coding])
+
+
+def ndjson_chunks(partitions):
+    for rows in partitions:
+        yield b"".join(dumps(row) + b"\n" for row in rows)
+
+
+def json_array_chunks(partitions):
+    yield b"["
+    first = True
+    for rows in partitions:
+        if not rows:
+            continue
+        chunk = b",".join(dumps(row) for row in rows)
+        yield chunk if first else b"," + chunk
+        first = False
+    yield b"]"
+
+
+def compress_chunks(chunks, encoding: Optional[str]):
+    # every chunk is flushed so the client receives rows as they are read
+    if encoding is None:
+        yield from chunks
+        return
+
+    if encoding == "zstd":
+        compressor = zstandard.ZstdCompressor().compressobj()
+        sync_flush = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+    else:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+        sync_flush = zlib.Z_SYNC_FLUSH
+
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(sync_flush)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,302 @@
+"""
+Load and latency suite for every endpoint of app/routers/category_routes.py
+(and the async_* reads of app/routers/async_category_routes.py, to compare
+the threadpool with the event loop): RPS, p50/p95/p99 latency and DB queries
+per request, for each endpoint at each concurrency level, saved as JSON and
+compared against a baseline.
+
+    uvicorn app.main:app --workers 1
+    python -m benchmarks.bench_category_api --rows 10000 --concurrency 1 10 50 \
+        --output results.json --baseline baseline.json
+
+--rows reseeds the database of DEV_DATABASE_URL (the one the API must use)
+with a category tree first. Queries per request are read from the /metrics
+endpoint of the API, so they are exact with a single worker. The exit status
+is 1 when a result regresses past --tolerance; --save-baseline writes the
+results as the new baseline. pytest runs the same suite through
+benchmarks/test_bench_category_api.py.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import re
+import sys
+import uuid
+
+import httpx
+from sqlalchemy import create_engine, text
+
+from benchmarks.load import run
+from benchmarks.seed import reset_categories, seed_category_tree
+from tests.factories.models_factory import get_random_category_dict
+
+CONCURRENCY_LEVELS = (1, 10, 50)
+TREE_DEPTH = 5
+BULK_SIZE = 100
+DEFAULT_TOLERANCE = 0.15
+
+# results where a higher value is a regression (rps is checked the other way)
+HIGHER_IS_WORSE = ("p50_ms", "p95_ms", "p99_ms", "db_queries_per_request")
+
+METRIC_LINE = re.compile(r"^(\w+)\{(.*)\} (\S+)$")
+METRIC_LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+class Dataset:
+    """
+    Ids and slugs of the seeded categories the scenarios draw from. Deletes
+    consume leaves (no children, so nothing else is deleted with them) and
+    updates rewrite roots (parent_id stays null, so the tree keeps its shape).
+    """
+
+    def __init__(self, engine):
+        with engine.connect() as connection:
+            rows = connection.execute(text("SELECT id, slug FROM category")).all()
+            self.roots = connection.execute(
+                text("SELECT id FROM category WHERE parent_id IS NULL")
+            ).scalars().all()
+            leaves = connection.execute(
+                text(
+                    "SELECT id FROM category c WHERE NOT EXISTS "
+                    "(SELECT 1 FROM category child WHERE child.parent_id = c.id)"
+                )
+            ).scalars().all()
+        self.ids = [row.id for row in rows]
+        self.slugs = [row.slug for row in rows]
+        self.leaves = iter(random.sample(leaves, len(leaves)))
+        # new names and slugs must not collide with an earlier run
+        self.run_id = uuid.uuid4().hex[:8]
+        self.sequence = itertools.count()
+
+    def new_category(self):
+        index = next(self.sequence)
+        category = get_random_category_dict()
+        category.pop("id")
+        category["name"] = f"{category['name']}-{self.run_id}-{index}"
+        category["slug"] = f"{category['slug']}-{self.run_id}-{index}"
+        return category
+
+    def next_leaf(self):
+        # once every leaf is deleted, the remaining deletes measure 404s
+        return next(self.leaves, 0)
+
+
+def scenarios(dataset):
+    """
+    name -> (method, path, body, route template, share of --requests). Path
+    and body are callables where every request needs its own.
+    """
+    return {
+        "list": ("GET", "/api/category/?limit=100", None, "/api/category/", 1),
+        "get_by_id": (
+            "GET",
+            lambda: f"/api/category/{random.choice(dataset.ids)}",
+            None,
+            "/api/category/{category_id}",
+            1,
+        ),
+        "get_by_slug": (
+            "GET",
+            lambda: f"/api/category/slug/{random.choice(dataset.slugs)}",
+            None,
+            "/api/category/slug/{category_slug}",
+            1,
+        ),
+        "async_list": (
+            "GET",
+            "/api/async/category/?limit=100",
+            None,
+            "/api/async/category/",
+            1,
+        ),
+        "async_get_by_slug": (
+            "GET",
+            lambda: f"/api/async/category/slug/{random.choice(dataset.slugs)}",
+            None,
+            "/api/async/category/slug/{category_slug}",
+            1,
+        ),
+        "subtree": (
+            "GET",
+            lambda: f"/api/category/{random.choice(dataset.roots)}/tree",
+            None,
+            "/api/category/{category_id}/tree",
+            0.1,
+        ),
+        "forest": ("GET", "/api/category/tree", None, "/api/category/tree", 0.01),
+        "export": (
+            "GET",
+            "/api/category/export",
+            None,
+            "/api/category/export",
+            0.01,
+        ),
+        "create": ("POST", "/api/category/", dataset.new_category, "/api/category/", 1),
+        "update": (
+            "PUT",
+            lambda: f"/api/category/{random.choice(dataset.roots)}",
+            dataset.new_category,
+            "/api/category/{category_id}",
+            1,
+        ),
+        "bulk_create": (
+            "POST",
+            "/api/category/bulk",
+            lambda: [dataset.new_category() for _ in range(BULK_SIZE)],
+            "/api/category/bulk",
+            0.1,
+        ),
+        "delete": (
+            "DELETE",
+            lambda: f"/api/category/{dataset.next_leaf()}",
+            None,
+            "/api/category/{category_id}",
+            1,
+        ),
+    }
+
+
+def parse_metrics(body):
+    # {(name, frozenset of labels): value} from the Prometheus text format
+    samples = {}
+    for line in body.splitlines():
+        match = METRIC_LINE.match(line)
+        if match:
+            name, labels, value = match.groups()
+            key = (name, frozenset(METRIC_LABEL.findall(labels)))
+            samples[key] = float(value)
+    return samples
+
+
+def db_queries(samples, method, route):
+    labels = frozenset({("method", method), ("route", route)})
+    return (
+        samples.get(("db_queries_per_request_sum", labels), 0.0),
+        samples.get(("db_queries_per_request_count", labels), 0.0),
+    )
+
+
+def scrape(base_url):
+    return parse_metrics(httpx.get(f"{base_url}/metrics", timeout=60).text)
+
+
+def run_suite(base_url, concurrency_levels, total_requests, only=None):
+    engine = create_engine(os.getenv("DEV_DATABASE_URL"))
+    dataset = Dataset(engine)
+    engine.dispose()
+
+    results = []
+    for name, (method, path, body, route, share) in scenarios(dataset).items():
+        if only and name not in only:
+            continue
+        for concurrency in concurrency_levels:
+            requests = max(concurrency, round(total_requests * share))
+            before = db_queries(scrape(base_url), method, route)
+            stats = run(base_url, path, concurrency, requests, method, body)
+            after = db_queries(scrape(base_url), method, route)
+            served = after[1] - before[1]
+            queries = (after[0] - before[0]) / served if served else 0.0
+            result = {
+                "scenario": name,
+                "concurrency": concurrency,
+                **stats,
+                "db_queries_per_request": round(queries, 2),
+            }
+            results.append(result)
+            print(
+                f"{name:>17} c={concurrency:<4} rps={stats['rps']:<8} "
+                f"p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms "
+                f"p99={stats['p99_ms']}ms queries={result['db_queries_per_request']} "
+                f"errors={stats['errors']}",
+                file=sys.stderr,
+            )
+    return results
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Regressions of results against baseline, as readable lines: a latency or
+    a query count more than tolerance above the baseline, a throughput more
+    than tolerance below it, or more errors. Scenarios missing from the
+    baseline are not compared.
+    """
+    previous = {
+        (result["scenario"], result["concurrency"]): result
+        for result in baseline["results"]
+    }
+    regressions = []
+    for result in results["results"]:
+        base = previous.get((result["scenario"], result["concurrency"]))
+        if base is None:
+            continue
+        label = f"{result['scenario']} c={result['concurrency']}"
+        if result["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{label}: rps {base['rps']} -> {result['rps']}")
+        for metric in HIGHER_IS_WORSE:
+            if result[metric] > base[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{label}: {metric} {base[metric]} -> {result[metric]}"
+                )
+        if result["errors"] > base["errors"]:
+            regressions.append(
+                f"{label}: errors {base['errors']} -> {result['errors']}"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rows", type=int, help="reseed with this many categories")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=list(CONCURRENCY_LEVELS)
+    )
+    parser.add_argument("--scenario", nargs="+", help="run only these scenarios")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--save-baseline", help="write the results as a baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    if args.rows:
+        engine = create_engine(os.getenv("DEV_DATABASE_URL"))
+        reset_categories(engine)
+        seed_category_tree(engine, args.rows, TREE_DEPTH)
+        engine.dispose()
+
+    results = {
+        "rows": args.rows,
+        "requests": args.requests,
+        "results": run_suite(
+            args.base_url, args.concurrency, args.requests, args.scenario
+        ),
+    }
+    output = json.dumps(results, indent=2)
+    print(output)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as file:
+                file.write(output + "\n")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline.get("rows") != results["rows"]:
+            print(
+                f"warning: baseline seeded {baseline.get('rows')} rows, "
+                f"this run {results['rows']}",
+                file=sys.stderr,
+            )
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
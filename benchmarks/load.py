@@ -0,0 +1,85 @@
+"""
+Small HTTP load driver shared by the benchmark scripts.
+The API must already be running (ex: uvicorn app.main:app --workers 1).
+"""
+
+import asyncio
+import statistics
+import time
+from collections import Counter
+
+import httpx
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def summarize(latencies, errors, elapsed, statuses=None):
+    summary = {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+    if statuses is not None:
+        summary["statuses"] = dict(sorted(statuses.items()))
+    return summary
+
+
+async def run_load(
+    base_url, path, concurrency, total_requests, method="GET", json=None
+):
+    """
+    path and json can be callables, called once per request: requests that
+    must differ (new slugs, ids to delete) get their own path or body.
+    """
+    latencies = []
+    errors = 0
+    statuses = Counter()
+    remaining = iter(range(total_requests))
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60
+    ) as client:
+
+        async def worker():
+            nonlocal errors
+            for _ in remaining:
+                request_path = path() if callable(path) else path
+                body = json() if callable(json) else json
+                start = time.perf_counter()
+                try:
+                    response = await client.request(
+                        method, request_path, json=body
+                    )
+                    statuses[response.status_code] += 1
+                    if response.status_code >= 500:
+                        errors += 1
+                        continue
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return summarize(latencies, errors, elapsed, statuses)
+
+
+def run(base_url, path, concurrency, total_requests, method="GET", json=None):
+    return asyncio.run(
+        run_load(base_url, path, concurrency, total_requests, method, json)
+    )
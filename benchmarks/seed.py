@@ -0,0 +1,53 @@
+"""
+Seed a database with synthetic rows built from tests/factories/models_factory.py.
+"""
+
+import random
+
+from sqlalchemy import insert, text
+
+from app.models import Category
+from tests.factories.models_factory import get_random_category_dict
+
+BATCH_SIZE = 10_000
+
+
+def reset_categories(engine):
+    with engine.begin() as connection:
+        connection.execute(text("TRUNCATE category RESTART IDENTITY CASCADE"))
+
+
+def seed_category_tree(engine, count, depth, roots=10, batch_size=BATCH_SIZE):
+    """
+    count nodes spread over depth levels: the first level holds the roots,
+    the remaining nodes are split evenly over the deeper levels and every
+    node hangs under a random node of the level above.
+    """
+    per_level = max(1, (count - roots) // max(depth - 1, 1))
+    rows = []
+    previous_level = []
+    next_id = 1
+    for level in range(depth):
+        size = roots if level == 0 else per_level
+        current_level = list(range(next_id, next_id + size))
+        for id_ in current_level:
+            category = get_random_category_dict()
+            category["id"] = id_
+            category["name"] = f"{category['name']}-{id_}"
+            category["slug"] = f"{category['slug']}-{id_}"
+            category["parent_id"] = (
+                random.choice(previous_level) if previous_level else None
+            )
+            rows.append(category)
+        previous_level = current_level
+        next_id += size
+
+    # rows are ordered by level, so parents are always inserted first
+    with engine.begin() as connection:
+        for start in range(0, len(rows), batch_size):
+            connection.execute(insert(Category), rows[start : start + batch_size])
+        connection.execute(
+            text("SELECT setval('category_id_seq', (SELECT max(id) FROM category))")
+        )
+    return [row["id"] for row in rows[:roots]]
+
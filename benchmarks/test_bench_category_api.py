@@ -0,0 +1,113 @@
+import json
+import os
+
+import pytest
+
+from benchmarks.bench_category_api import (
+    CONCURRENCY_LEVELS,
+    compare,
+    parse_metrics,
+    run_suite,
+)
+
+"""
+Run with: pytest benchmarks -m benchmark
+
+The load test itself needs a running API (BENCHMARK_BASE_URL) and its
+database (DEV_DATABASE_URL); BENCHMARK_BASELINE fails it on regressions and
+BENCHMARK_OUTPUT keeps the results, ex: to store them as the next baseline.
+"""
+
+BENCHMARK_BASE_URL = os.getenv("BENCHMARK_BASE_URL")
+
+
+def result(scenario="list", concurrency=10, **values):
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "rps": 1000.0,
+        "errors": 0,
+        "p50_ms": 5.0,
+        "p95_ms": 10.0,
+        "p99_ms": 20.0,
+        "db_queries_per_request": 2.0,
+        **values,
+    }
+
+
+"""
+- [ ] Test results within the tolerance of the baseline pass
+"""
+
+
+@pytest.mark.benchmark
+def test_bench_compare_within_tolerance():
+    baseline = {"results": [result()]}
+    results = {"results": [result(rps=900.0, p99_ms=22.0), result("create")]}
+
+    assert compare(results, baseline, tolerance=0.15) == []
+
+
+"""
+- [ ] Test slower, lower throughput, chattier or failing results are flagged
+"""
+
+
+@pytest.mark.benchmark
+def test_bench_compare_flags_regressions():
+    baseline = {"results": [result()]}
+    results = {
+        "results": [
+            result(rps=500.0, p95_ms=30.0, db_queries_per_request=3.0, errors=2)
+        ]
+    }
+
+    assert compare(results, baseline, tolerance=0.15) == [
+        "list c=10: rps 1000.0 -> 500.0",
+        "list c=10: p95_ms 10.0 -> 30.0",
+        "list c=10: db_queries_per_request 2.0 -> 3.0",
+        "list c=10: errors 0 -> 2",
+    ]
+
+
+"""
+- [ ] Test query counts are read from the /metrics histograms
+"""
+
+
+@pytest.mark.benchmark
+def test_bench_parse_metrics():
+    samples = parse_metrics(
+        "# TYPE db_queries_per_request histogram\n"
+        'db_queries_per_request_sum{method="GET",route="/api/category/"} 6.0\n'
+        'db_queries_per_request_count{method="GET",route="/api/category/"} 3\n'
+    )
+    labels = frozenset({("method", "GET"), ("route", "/api/category/")})
+
+    assert samples[("db_queries_per_request_sum", labels)] == 6.0
+    assert samples[("db_queries_per_request_count", labels)] == 3.0
+
+
+"""
+- [ ] Test the category API against the running server and the baseline
+"""
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(not BENCHMARK_BASE_URL, reason="BENCHMARK_BASE_URL is not set")
+def test_bench_category_api():
+    requests = int(os.getenv("BENCHMARK_REQUESTS", "500"))
+    results = {
+        "rows": None,
+        "requests": requests,
+        "results": run_suite(BENCHMARK_BASE_URL, CONCURRENCY_LEVELS, requests),
+    }
+    if os.getenv("BENCHMARK_OUTPUT"):
+        with open(os.getenv("BENCHMARK_OUTPUT"), "w") as file:
+            json.dump(results, file, indent=2)
+
+    assert all(result["errors"] == 0 for result in results["results"])
+    if os.getenv("BENCHMARK_BASELINE"):
+        with open(os.getenv("BENCHMARK_BASELINE")) as file:
+            baseline = json.load(file)
+        assert compare(results, baseline) == []
@@ -13,8 +13,9 @@ config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
+# Existing loggers stay enabled: the tests run the migrations in-process.
 if config.config_file_name is not None:
-    fileConfig(config.config_file_name)
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
 
 config.set_section_option("devdb", "sqlalchemy.url", os.environ.get("DEV_DATABASE_URL"))
 config.set_section_option("testdb", "sqlalchemy.url", os.environ.get("TEST_DATABASE_URL"))
@@ -62,6 +63,16 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # the tests hand over a connection (tests/utils/database_utils.py)
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(
+            connection=connection, target_metadata=target_metadata
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
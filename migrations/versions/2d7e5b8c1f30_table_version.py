@@ -0,0 +1,62 @@
+"""table version counters for conditional GETs
+
+Revision ID: 2d7e5b8c1f30
+Revises: 9a6f3c27e8b0
+Create Date: 2024-09-11 10:05:42.617930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d7e5b8c1f30'
+down_revision: Union[str, None] = '9a6f3c27e8b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# microseconds since the epoch, never lower than the previous version: a
+# restored or recreated database cannot hand out a version (an ETag) again
+BUMP_TABLE_VERSION_FUNCTION = """
+CREATE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO table_version (table_name, version)
+    VALUES (TG_TABLE_NAME, (extract(epoch FROM clock_timestamp()) * 1000000)::bigint)
+    ON CONFLICT (table_name) DO UPDATE
+    SET version = GREATEST(table_version.version + 1, EXCLUDED.version);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+VERSIONED_TABLES = ("category",)
+
+
+def upgrade() -> None:
+    op.create_table('table_version',
+    sa.Column('table_name', sa.String(length=63), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+    op.execute(BUMP_TABLE_VERSION_FUNCTION)
+    for table in VERSIONED_TABLES:
+        # once per statement: a bulk insert bumps the version a single time
+        op.execute(
+            f"CREATE TRIGGER {table}_version "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();"
+        )
+        op.execute(
+            "INSERT INTO table_version (table_name, version) "
+            f"VALUES ('{table}', (extract(epoch FROM clock_timestamp()) * 1000000)::bigint);"
+        )
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_version ON {table};")
+    op.execute("DROP FUNCTION IF EXISTS bump_table_version();")
+    op.drop_table('table_version')
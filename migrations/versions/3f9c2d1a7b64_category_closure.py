@@ -0,0 +1,116 @@
+"""category closure table
+
+Revision ID: 3f9c2d1a7b64
+Revises: b8a2a997bcbb
+Create Date: 2024-09-02 09:12:40.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2d1a7b64'
+down_revision: Union[str, None] = 'b8a2a997bcbb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CLOSURE_INSERT_FUNCTION = """
+CREATE FUNCTION category_closure_insert() RETURNS trigger AS $$
+BEGIN
+    -- the new category is its own descendant at depth 0, and one level
+    -- deeper than every ancestor of its parent
+    INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+    SELECT NEW.id, NEW.id, 0
+    UNION ALL
+    SELECT ancestor_id, NEW.id, depth + 1
+    FROM category_closure
+    WHERE descendant_id = NEW.parent_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+CLOSURE_REPARENT_FUNCTION = """
+CREATE FUNCTION category_closure_reparent() RETURNS trigger AS $$
+BEGIN
+    IF NEW.parent_id IS NOT NULL AND EXISTS (
+        SELECT 1 FROM category_closure
+        WHERE ancestor_id = NEW.id AND descendant_id = NEW.parent_id
+    ) THEN
+        RAISE EXCEPTION 'category % cannot be moved under its descendant %',
+            NEW.id, NEW.parent_id
+            USING ERRCODE = 'check_violation',
+                  CONSTRAINT = 'category_parent_not_descendant';
+    END IF;
+
+    -- detach the moved subtree from the ancestors it had above NEW.id
+    DELETE FROM category_closure AS link
+    USING category_closure AS subtree, category_closure AS above
+    WHERE subtree.ancestor_id = NEW.id
+      AND above.descendant_id = NEW.id
+      AND above.depth > 0
+      AND link.ancestor_id = above.ancestor_id
+      AND link.descendant_id = subtree.descendant_id;
+
+    -- attach it under the new parent and all of the parent's ancestors
+    INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+    SELECT above.ancestor_id, subtree.descendant_id, above.depth + subtree.depth + 1
+    FROM category_closure AS above
+    CROSS JOIN category_closure AS subtree
+    WHERE above.descendant_id = NEW.parent_id
+      AND subtree.ancestor_id = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+BACKFILL = """
+INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+WITH RECURSIVE paths AS (
+    SELECT id AS ancestor_id, id AS descendant_id, 0 AS depth FROM category
+    UNION ALL
+    SELECT paths.ancestor_id, category.id, paths.depth + 1
+    FROM paths JOIN category ON category.parent_id = paths.descendant_id
+)
+SELECT ancestor_id, descendant_id, depth FROM paths;
+"""
+
+
+def upgrade() -> None:
+    op.create_table('category_closure',
+    sa.Column('ancestor_id', sa.Integer(), nullable=False),
+    sa.Column('descendant_id', sa.Integer(), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.CheckConstraint('depth >= 0', name='category_closure_depth_check'),
+    sa.ForeignKeyConstraint(['ancestor_id'], ['category.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['descendant_id'], ['category.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id')
+    )
+    op.create_index('ix_category_closure_descendant_id_depth', 'category_closure', ['descendant_id', 'depth'], unique=False)
+
+    op.execute(BACKFILL)
+
+    op.execute(CLOSURE_INSERT_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER category_closure_insert AFTER INSERT ON category "
+        "FOR EACH ROW EXECUTE FUNCTION category_closure_insert();"
+    )
+    op.execute(CLOSURE_REPARENT_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER category_closure_reparent AFTER UPDATE OF parent_id ON category "
+        "FOR EACH ROW WHEN (OLD.parent_id IS DISTINCT FROM NEW.parent_id) "
+        "EXECUTE FUNCTION category_closure_reparent();"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS category_closure_reparent ON category;")
+    op.execute("DROP FUNCTION IF EXISTS category_closure_reparent();")
+    op.execute("DROP TRIGGER IF EXISTS category_closure_insert ON category;")
+    op.execute("DROP FUNCTION IF EXISTS category_closure_insert();")
+    op.drop_index('ix_category_closure_descendant_id_depth', table_name='category_closure')
+    op.drop_table('category_closure')
@@ -0,0 +1,28 @@
+"""attribute_value.attribute_id references attribute
+
+Revision ID: 5e0b7a93c4d1
+Revises: 7c41e0b9d2a5
+Create Date: 2024-09-05 14:02:51.730918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0b7a93c4d1'
+down_revision: Union[str, None] = '7c41e0b9d2a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # the initial migration pointed attribute_id back at attribute_value.id
+    op.drop_constraint('attribute_value_attribute_id_fkey', 'attribute_value', type_='foreignkey')
+    op.create_foreign_key('attribute_value_attribute_id_fkey', 'attribute_value', 'attribute', ['attribute_id'], ['id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('attribute_value_attribute_id_fkey', 'attribute_value', type_='foreignkey')
+    op.create_foreign_key('attribute_value_attribute_id_fkey', 'attribute_value', 'attribute_value', ['attribute_id'], ['id'])
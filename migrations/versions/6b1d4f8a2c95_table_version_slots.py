@@ -0,0 +1,75 @@
+"""table version slots per backend, so writers do not queue on one row
+
+Revision ID: 6b1d4f8a2c95
+Revises: 2d7e5b8c1f30
+Create Date: 2024-09-18 09:12:27.403118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b1d4f8a2c95'
+down_revision: Union[str, None] = '2d7e5b8c1f30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SLOTS = 128
+
+# The version of a table is the sum of its rows. Slot 0 keeps the base set by
+# 2d7e5b8c1f30 (microseconds since the epoch, so a recreated database does not
+# hand out an earlier ETag again); every write statement adds one to the slot
+# of its backend. Concurrent writers only wait on each other when their pids
+# fall in the same slot, and the counter stays transactional: a reader never
+# sees the version of a write that is not committed yet, which a sequence
+# (nextval is visible before the commit) would not guarantee.
+BUMP_TABLE_VERSION_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO table_version (table_name, slot, version)
+    VALUES (TG_TABLE_NAME, 1 + pg_backend_pid() % {SLOTS}, 1)
+    ON CONFLICT (table_name, slot) DO UPDATE
+    SET version = table_version.version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# the function of 2d7e5b8c1f30, a single row per table
+SINGLE_ROW_FUNCTION = """
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO table_version (table_name, version)
+    VALUES (TG_TABLE_NAME, (extract(epoch FROM clock_timestamp()) * 1000000)::bigint)
+    ON CONFLICT (table_name) DO UPDATE
+    SET version = GREATEST(table_version.version + 1, EXCLUDED.version);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    op.add_column('table_version', sa.Column('slot', sa.SmallInteger(), server_default='0', nullable=False))
+    op.drop_constraint('table_version_pkey', 'table_version', type_='primary')
+    op.create_primary_key('table_version_pkey', 'table_version', ['table_name', 'slot'])
+    op.execute(BUMP_TABLE_VERSION_FUNCTION)
+
+
+def downgrade() -> None:
+    # fold the slots back into the base row, the version keeps its value
+    op.execute(
+        "UPDATE table_version SET version = total.version "
+        "FROM (SELECT table_name, sum(version)::bigint AS version "
+        "FROM table_version GROUP BY table_name) AS total "
+        "WHERE table_version.table_name = total.table_name AND table_version.slot = 0;"
+    )
+    op.execute("DELETE FROM table_version WHERE slot <> 0;")
+    op.drop_constraint('table_version_pkey', 'table_version', type_='primary')
+    op.create_primary_key('table_version_pkey', 'table_version', ['table_name'])
+    op.drop_column('table_version', 'slot')
+    op.execute(SINGLE_ROW_FUNCTION)
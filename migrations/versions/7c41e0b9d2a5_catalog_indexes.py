@@ -0,0 +1,55 @@
+"""catalog foreign key and lookup indexes
+
+Revision ID: 7c41e0b9d2a5
+Revises: 3f9c2d1a7b64
+Create Date: 2024-09-03 10:21:07.514362
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c41e0b9d2a5'
+down_revision: Union[str, None] = '3f9c2d1a7b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, partial index predicate)
+INDEXES = [
+    ('ix_category_parent_id', 'category', ['parent_id'], None),
+    ('ix_category_active_id', 'category', ['id'], 'is_active = true'),
+    ('ix_product_category_id', 'product', ['category_id'], None),
+    ('ix_product_seasonal_event_id', 'product', ['seasonal_event_id'], None),
+    ('ix_product_active_category_id', 'product', ['category_id'], 'is_active = true'),
+    ('ix_product_line_product_id', 'product_line', ['product_id'], None),
+    ('ix_product_line_active_product_id', 'product_line', ['product_id'], 'is_active = true'),
+    ('ix_product_type_parent', 'product_type', ['parent'], None),
+    ('ix_attribute_value_attribute_id', 'attribute_value', ['attribute_id'], None),
+    ('ix_product_line_attribute_value_product_line_id', 'product_line_attribute_value', ['product_line_id'], None),
+    ('ix_product_product_type_product_type_id', 'product_product_type', ['product_type_id'], None),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block, and it keeps the
+    # tables writable while the indexes are built
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
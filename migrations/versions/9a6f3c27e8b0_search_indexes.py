@@ -0,0 +1,46 @@
+"""full-text and trigram search indexes
+
+Revision ID: 9a6f3c27e8b0
+Revises: 5e0b7a93c4d1
+Create Date: 2024-09-09 11:37:18.204551
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a6f3c27e8b0'
+down_revision: Union[str, None] = '5e0b7a93c4d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PRODUCT_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', name), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # a stored generated column rewrites product once, under an exclusive lock
+    op.add_column('product', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(PRODUCT_SEARCH_VECTOR, persisted=True), nullable=True))
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_product_search_vector', 'product', ['search_vector'], unique=False, postgresql_using='gin', postgresql_concurrently=True)
+        op.create_index('ix_product_name_trgm', 'product', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}, postgresql_concurrently=True)
+        op.create_index('ix_category_name_search', 'category', [sa.text("to_tsvector('english', name)")], unique=False, postgresql_using='gin', postgresql_concurrently=True)
+        op.create_index('ix_category_name_trgm', 'category', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_category_name_trgm', table_name='category', postgresql_concurrently=True)
+        op.drop_index('ix_category_name_search', table_name='category', postgresql_concurrently=True)
+        op.drop_index('ix_product_name_trgm', table_name='product', postgresql_concurrently=True)
+        op.drop_index('ix_product_search_vector', table_name='product', postgresql_concurrently=True)
+    op.drop_column('product', 'search_vector')
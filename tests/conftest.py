@@ -1,2 +1,2 @@
-from .fixtures import db_session, client
+from .fixtures import db_session, client, clear_caches, override_get_db_connection
 from .utils.pytest_utils import pytest_collection_modifyitems
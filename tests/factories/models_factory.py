@@ -38,3 +38,33 @@ def get_random_category_dict(id_: int = None):
         "level": faker.random_int(1, 20),
         "parent_id": None,
     }
+
+
+def get_random_product_dict(id_: int = 1, category_id: int = 1):
+    return {
+        "id": id_,
+        "pid": faker.uuid4(cast_to=None),
+        "name": f"{faker.word()}-{id_}",
+        "slug": f"{faker.slug()}-{id_}",
+        "description": faker.sentence(),
+        "is_digital": faker.boolean(),
+        "is_active": faker.boolean(),
+        "stock_status": "is",
+        "created_at": faker.date_time(),
+        "updated_at": faker.date_time(),
+        "category_id": category_id,
+        "seasonal_event_id": None,
+    }
+
+
+def get_random_product_line_dict(id_: int = 1, product_id: int = 1, order_num=1):
+    return {
+        "id": id_,
+        "price": faker.pydecimal(left_digits=3, right_digits=2, positive=True),
+        "sku": faker.uuid4(cast_to=None),
+        "stock_qty": faker.random_int(0, 100),
+        "is_active": faker.boolean(),
+        "order_num": order_num,
+        "weight": faker.pyfloat(min_value=0.1, max_value=50),
+        "product_id": product_id,
+    }
@@ -5,8 +5,13 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from app.db_connection import get_db_connection
 from app.main import app
-from tests.utils.database_utils import migrate_to_db
+from app.utils.category_cache import category_cache
+from app.utils.category_tree import invalidate_category_trees
+from app.utils.facet_index import invalidate_facet_index
+from app.utils.seasonal_events import invalidate_seasonal_events
+from tests.utils.database_utils import migrate_to_db, server_lock
 from tests.utils.docker_utils import start_database_container
 
 
@@ -17,8 +22,10 @@ def db_session():
 
     engine = create_engine(os.getenv("TEST_DATABASE_URL"))
 
-    with engine.begin() as connection:
-        migrate_to_db("migrations", "alembic.ini", connection)
+    # parallel workers share this database: one of them migrates it at a time
+    with server_lock(os.getenv("TEST_DATABASE_URL")):
+        with engine.connect() as connection:
+            migrate_to_db("migrations", "alembic.ini", connection)
 
     SessionLocal = sessionmaker(autocommit=False, autoflush=True, bind=engine)
 
@@ -33,3 +40,30 @@ def db_session():
 def client():
     with TestClient(app) as _client:
         yield _client
+
+
+@pytest.fixture()
+def override_get_db_connection():
+    # the streaming routes get a connection that needs no database server,
+    # for the tests that replace what is streamed from it
+    engine = create_engine("sqlite://")
+    connection = engine.connect()
+    app.dependency_overrides[get_db_connection] = lambda: connection
+    yield connection
+    app.dependency_overrides.pop(get_db_connection, None)
+    connection.close()
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # in-process caches must not leak entries from one test into the next
+    invalidate_category_trees()
+    invalidate_facet_index()
+    invalidate_seasonal_events()
+    category_cache.clear()
+    yield
+    invalidate_category_trees()
+    invalidate_facet_index()
+    invalidate_seasonal_events()
+    category_cache.clear()
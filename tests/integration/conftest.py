@@ -1,37 +1,127 @@
 import os
+import uuid
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
 from app.db_connection import get_db_session
 from app.main import app
-from tests.utils.database_utils import migrate_to_db
+from tests.utils.database_utils import (
+    database_url,
+    drop_database,
+    get_database_comment,
+    migrate_to_db,
+    recreate_database,
+    server_lock,
+    set_database_comment,
+)
 from tests.utils.docker_utils import start_database_container
 
+"""
+One container and one migration run per test session: the migrations build a
+template database, the integration database is a copy of it and every test
+runs in a transaction of its own, rolled back at teardown.
 
-@pytest.fixture(scope="function")
-def db_session_integration():
-    container = start_database_container()
+With pytest-xdist (pytest tests/integration -n 4) every worker is a process
+with its own copy of the template, engine and app.dependency_overrides; the
+template is built by the first worker and reused by the others.
+"""
 
-    engine = create_engine(os.getenv("TEST_DATABASE_URL"))
+# gw0, gw1, ... under pytest-xdist
+WORKER = os.getenv("PYTEST_XDIST_WORKER", "main")
+# shared by all the workers of a run, new for every run
+TEST_RUN_ID = os.getenv("PYTEST_XDIST_TESTRUNUID") or uuid.uuid4().hex
 
-    with engine.begin() as connection:
-        migrate_to_db("migrations", "alembic.ini", connection)
+TEMPLATE_DATABASE = "integration_template"
+INTEGRATION_DATABASE = f"integration_{WORKER}"
+COMMITTED_DATABASE = f"integration_committed_{WORKER}"
 
-    SessionLocal = sessionmaker(autocommit=False, autoflush=True, bind=engine)
 
-    db = SessionLocal()
+@pytest.fixture(scope="session")
+def database_server():
+    start_database_container()
+    # the container keeps running after the session, the next one reuses it
+    return os.getenv("TEST_DATABASE_URL")
+
+
+@pytest.fixture(scope="session")
+def template_database(database_server):
+    # the template is tagged with the run it was built for: the first worker
+    # to take the lock builds it, the ones waiting behind it find it ready
+    with server_lock(database_server):
+        if get_database_comment(database_server, TEMPLATE_DATABASE) != TEST_RUN_ID:
+            recreate_database(database_server, TEMPLATE_DATABASE)
+            engine = create_engine(
+                database_url(database_server, TEMPLATE_DATABASE), poolclass=NullPool
+            )
+            with engine.connect() as connection:
+                migrate_to_db("migrations", "alembic.ini", connection)
+            # no connection may stay open on a database that is copied
+            engine.dispose()
+            set_database_comment(database_server, TEMPLATE_DATABASE, TEST_RUN_ID)
+    return TEMPLATE_DATABASE
+
+
+def copy_template(url, name, template):
+    # one copy at a time: a copy fails while another session uses the template
+    with server_lock(url):
+        recreate_database(url, name, template)
+
+
+@pytest.fixture(scope="session")
+def integration_engine(database_server, template_database):
+    copy_template(database_server, INTEGRATION_DATABASE, template_database)
+    engine = create_engine(database_url(database_server, INTEGRATION_DATABASE))
+    yield engine
+    engine.dispose()
+    drop_database(database_server, INTEGRATION_DATABASE)
+
+
+@pytest.fixture(scope="function")
+def db_session_integration(integration_engine):
+    # commits of the test and of the routes only release a SAVEPOINT: the
+    # outer transaction, rolled back at teardown, is never committed
+    connection = integration_engine.connect()
+    transaction = connection.begin()
+    db = Session(
+        bind=connection, autoflush=True, join_transaction_mode="create_savepoint"
+    )
 
     try:
         yield db
     finally:
         db.close()
+        transaction.rollback()
+        connection.close()
 
-    container.stop()
-    container.remove()
+
+@pytest.fixture(scope="function")
+def db_engine_committed(database_server, template_database):
+    """
+    A fresh copy of the template with real commits, for the tests whose
+    writes must be seen by other connections (concurrent requests).
+    """
+    copy_template(database_server, COMMITTED_DATABASE, template_database)
+    engine = create_engine(database_url(database_server, COMMITTED_DATABASE))
+    yield engine
     engine.dispose()
+    drop_database(database_server, COMMITTED_DATABASE)
+
+
+@pytest.fixture(scope="function")
+def db_session_committed(db_engine_committed):
+    SessionLocal = sessionmaker(
+        autocommit=False, autoflush=True, bind=db_engine_committed
+    )
+    db = SessionLocal()
+
+    try:
+        yield db
+    finally:
+        db.close()
 
 
 @pytest.fixture()
@@ -40,6 +130,8 @@ def override_get_db_session(db_session_integration):
         return db_session_integration
 
     app.dependency_overrides[get_db_session] = override
+    yield
+    app.dependency_overrides.pop(get_db_session, None)
 
 
 @pytest.fixture(scope="function")
@@ -1,3 +1,11 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy.orm import sessionmaker
+
+from app.db_connection import get_db_connection, get_db_session
+from app.main import app
 from app.models import Category
 from tests.factories.models_factory import get_random_category_dict
 
@@ -9,13 +17,15 @@ from tests.factories.models_factory import get_random_category_dict
 def test_integrate_create_new_category_successful(client, db_session_integration):
     # Arrange: Prepare test data
     category_data = get_random_category_dict()
-    category_id = category_data.pop("id")
+    category_data.pop("id")
 
     # Act: Make a POST request to create a new category
     response = client.post("api/category/", json=category_data)
 
     # Assert: Verify response
     assert response.status_code == 201
+    # ids come from a sequence, which the per-test rollback does not rewind
+    category_id = response.json()["id"]
 
     # Assert: Verify the response and DB state
     create_category = (
@@ -38,10 +48,11 @@ def test_integrate_create_new_category_successful(client, db_session_integration
 
 def test_integrate_create_new_category_duplicate(client, db_session_integration):
     category_data = get_random_category_dict()
+    # the id comes from the sequence, as it does for the API insert below
+    category_data.pop("id")
     new_category = Category(**category_data)
     db_session_integration.add(new_category)
     db_session_integration.commit()
-    category_data.pop("id")
 
     response = client.post("api/category/", json=category_data)
 
@@ -63,7 +74,8 @@ def test_integrate_create_new_category_duplicate_slug(client, db_session_integra
     category_1["slug"] = slug
     category_2["slug"] = slug
 
-    # Add the first category to the db
+    # Add the first category to the db, with an id from the sequence
+    category_1.pop("id")
     db_session_integration.add(Category(**category_1))
     db_session_integration.commit()
 
@@ -106,6 +118,60 @@ def test_integrate_get_all_categories(client, db_session_integration):
         assert returned_category["level"] == inserted_category_data["level"]
 
 
+"""
+- [ ] Test GET categories returns every row by default, pages on request
+"""
+
+
+def test_integrate_get_categories_default_and_paged(client, db_session_integration):
+    parent_data = get_random_category_dict()
+    parent_data.pop("id")
+    parent = Category(**parent_data)
+    db_session_integration.add(parent)
+    db_session_integration.commit()
+    for index in range(150):
+        category_data = get_random_category_dict()
+        category_data.pop("id")
+        # suffixed: 150 random names would collide on (name, level) and slug
+        category_data["name"] = f"{category_data['name']}-{index}"
+        category_data["slug"] = f"{category_data['slug']}-{index}"
+        category_data["parent_id"] = parent.id
+        db_session_integration.add(Category(**category_data))
+    db_session_integration.commit()
+
+    response = client.get("api/category/")
+    assert len(response.json()) == 151
+    assert "X-Next-Cursor" not in response.headers
+
+    response = client.get("api/category/?limit=100")
+    assert len(response.json()) == 100
+    response = client.get(
+        f"api/category/?cursor={response.headers['X-Next-Cursor']}"
+    )
+    assert len(response.json()) == 51
+
+    response = client.get("api/category/?is_root=true")
+    assert [category["id"] for category in response.json()] == [parent.id]
+
+
+"""
+- [ ] Test POST bulk categories under a missing parent
+"""
+
+
+def test_integrate_bulk_create_categories_missing_parent(
+    client, db_session_integration
+):
+    category_data = get_random_category_dict()
+    category_data.pop("id")
+    category_data["parent_id"] = 999_999
+
+    response = client.post("api/category/bulk", json=[category_data])
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Parent category does not exist"}
+
+
 """
 - [ ] Test UPDATE category successfully
 """
@@ -164,3 +230,83 @@ def test_integrate_delete_category_successfully(client, db_session_integration):
     )
 
     assert deleted_category is None
+
+
+"""
+- [ ] Test concurrent POST of the same category never returns a 500
+"""
+
+
+def test_integrate_create_category_concurrent_writers(client, db_session_committed):
+    # every request gets its own session, as it does outside the tests
+    SessionPerRequest = sessionmaker(
+        autocommit=False, autoflush=True, bind=db_session_committed.get_bind()
+    )
+
+    def override():
+        db = SessionPerRequest()
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db_session] = override
+
+    category_data = get_random_category_dict()
+    category_data.pop("id")
+    writers = 20
+    barrier = threading.Barrier(writers)
+
+    def post(_):
+        barrier.wait()
+        return client.post("api/category/", json=category_data)
+
+    with ThreadPoolExecutor(max_workers=writers) as executor:
+        responses = list(executor.map(post, range(writers)))
+
+    status_codes = [response.status_code for response in responses]
+    assert 500 not in status_codes
+    assert status_codes.count(201) == 1
+    assert status_codes.count(400) == writers - 1
+    assert (
+        db_session_committed.query(Category)
+        .filter_by(slug=category_data["slug"])
+        .count()
+        == 1
+    )
+
+
+"""
+- [ ] Test export streams the categories from the connection dependency
+"""
+
+
+def test_integrate_export_categories(client, db_session_committed, monkeypatch):
+    # the export reads outside the test transaction, from committed rows
+    monkeypatch.setitem(
+        app.dependency_overrides,
+        get_db_connection,
+        db_session_committed.get_bind().connect,
+    )
+    categories = []
+    for _ in range(3):
+        category_data = get_random_category_dict()
+        category_data.pop("id")
+        categories.append(Category(**category_data))
+    db_session_committed.add_all(categories)
+    slugs = [category.slug for category in categories]
+    db_session_committed.commit()
+
+    response = client.get(
+        "api/category/export", headers={"Accept-Encoding": "identity"}
+    )
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["slug"] for line in lines] == slugs
+    # the body closed the connection once the stream was exhausted
+    assert db_session_committed.get_bind().pool.checkedout() == 0
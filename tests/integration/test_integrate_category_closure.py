@@ -0,0 +1,109 @@
+from itertools import count
+
+from app.models import Category, CategoryClosure
+from tests.factories.models_factory import get_random_category_dict
+
+suffixes = count()
+
+
+def add_category(db, parent=None):
+    category_data = get_random_category_dict()
+    category_data.pop("id")
+    suffix = next(suffixes)
+    category_data["name"] = f"{category_data['name']}-{suffix}"
+    category_data["slug"] = f"{category_data['slug']}-{suffix}"
+    category_data["parent_id"] = parent.id if parent else None
+    category = Category(**category_data)
+    db.add(category)
+    db.commit()
+    return category
+
+
+def closure_pairs(db):
+    return {
+        (row.ancestor_id, row.descendant_id, row.depth)
+        for row in db.query(CategoryClosure).all()
+    }
+
+
+"""
+- [ ] Test closure rows are added when categories are inserted
+"""
+
+
+def test_integrate_category_closure_on_insert(client, db_session_integration):
+    root = add_category(db_session_integration)
+    child = add_category(db_session_integration, root)
+    grandchild = add_category(db_session_integration, child)
+
+    assert closure_pairs(db_session_integration) == {
+        (root.id, root.id, 0),
+        (child.id, child.id, 0),
+        (grandchild.id, grandchild.id, 0),
+        (root.id, child.id, 1),
+        (child.id, grandchild.id, 1),
+        (root.id, grandchild.id, 2),
+    }
+
+
+"""
+- [ ] Test closure rows follow a re-parented subtree
+"""
+
+
+def test_integrate_category_closure_on_reparent(client, db_session_integration):
+    root = add_category(db_session_integration)
+    other_root = add_category(db_session_integration)
+    child = add_category(db_session_integration, root)
+    grandchild = add_category(db_session_integration, child)
+
+    child.parent_id = other_root.id
+    db_session_integration.commit()
+
+    pairs = closure_pairs(db_session_integration)
+    assert (root.id, child.id, 1) not in pairs
+    assert (root.id, grandchild.id, 2) not in pairs
+    assert (other_root.id, child.id, 1) in pairs
+    assert (other_root.id, grandchild.id, 2) in pairs
+    assert (child.id, grandchild.id, 1) in pairs
+
+
+"""
+- [ ] Test closure rows are removed with the category
+"""
+
+
+def test_integrate_category_closure_on_delete(client, db_session_integration):
+    root = add_category(db_session_integration)
+    child = add_category(db_session_integration, root)
+
+    response = client.delete(f"/api/category/{child.id}")
+    assert response.status_code == 200
+
+    assert closure_pairs(db_session_integration) == {(root.id, root.id, 0)}
+
+
+"""
+- [ ] Test moving a category under its own descendant is rejected
+"""
+
+
+def test_integrate_category_closure_rejects_cycle(client, db_session_integration):
+    root = add_category(db_session_integration)
+    child = add_category(db_session_integration, root)
+
+    response = client.put(
+        f"/api/category/{root.id}",
+        json={
+            "name": root.name,
+            "slug": root.slug,
+            "is_active": root.is_active,
+            "level": root.level,
+            "parent_id": child.id,
+        },
+    )
+
+    assert response.status_code == 400
+    assert response.json() == {
+        "detail": "Category cannot be moved under its descendant"
+    }
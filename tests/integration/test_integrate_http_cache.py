@@ -0,0 +1,65 @@
+from tests.factories.models_factory import get_random_category_dict
+
+"""
+- [ ] Test GET categories answers 304 until a category changes
+"""
+
+
+def test_integrate_get_categories_conditional(client, db_session_integration):
+    response = client.get("api/category/")
+    etag = response.headers["ETag"]
+
+    response = client.get("api/category/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    category_data = get_random_category_dict()
+    category_data.pop("id")
+    assert client.post("api/category/", json=category_data).status_code == 201
+
+    response = client.get("api/category/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert category_data["slug"] in [c["slug"] for c in response.json()]
+
+    response = client.get(
+        f"api/category/slug/{category_data['slug']}",
+        headers={"If-None-Match": response.headers["ETag"]},
+    )
+    assert response.status_code == 304
+
+
+"""
+- [ ] Test GET category keeps its ETag while other categories change
+"""
+
+
+def test_integrate_get_category_conditional(client, db_session_integration):
+    category_data = get_random_category_dict()
+    category_data.pop("id")
+    category_id = client.post("api/category/", json=category_data).json()["id"]
+    etag = client.get(f"api/category/{category_id}").headers["ETag"]
+
+    other_data = get_random_category_dict()
+    other_data.pop("id")
+    assert client.post("api/category/", json=other_data).status_code == 201
+
+    response = client.get(
+        f"api/category/{category_id}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+    category_data["name"] = f"{category_data['name']}-renamed"
+    response = client.put(f"api/category/{category_id}", json=category_data)
+    assert response.status_code == 201
+
+    response = client.get(
+        f"api/category/{category_id}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["name"] == category_data["name"]
+
+    response = client.get(
+        "api/category/slug/no-such-category", headers={"If-None-Match": "*"}
+    )
+    assert response.status_code == 404
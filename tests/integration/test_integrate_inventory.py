@@ -0,0 +1,167 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy.orm import sessionmaker
+
+import app.routers.inventory_routes as inventory_routes
+from app.db_connection import get_db_session
+from app.main import app
+from app.models import Category, Product, ProductLine
+from tests.factories.models_factory import (
+    get_random_category_dict,
+    get_random_product_dict,
+    get_random_product_line_dict,
+)
+
+
+def seed_lines(db, *stock_qtys):
+    category_data = get_random_category_dict()
+    category_data.pop("id")
+    product_data = get_random_product_dict()
+    for key in ("id", "pid", "created_at", "updated_at", "category_id"):
+        product_data.pop(key)
+    product = Product(**product_data, category=Category(**category_data))
+    lines = []
+    for order_num, stock_qty in enumerate(stock_qtys, start=1):
+        line_data = get_random_product_line_dict(order_num=order_num)
+        for key in ("id", "sku", "product_id"):
+            line_data.pop(key)
+        line_data["stock_qty"] = stock_qty
+        lines.append(ProductLine(**line_data, product=product))
+    db.add_all(lines)
+    db.commit()
+    return product, lines
+
+
+def override_session_per_request(db_session_committed):
+    # every request gets its own session, as it does outside the tests
+    SessionPerRequest = sessionmaker(
+        autocommit=False, autoflush=True, bind=db_session_committed.get_bind()
+    )
+
+    def override():
+        db = SessionPerRequest()
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db_session] = override
+
+
+"""
+- [ ] Test POST reserve and release update stock and product stock status
+"""
+
+
+def test_integrate_reserve_release_stock(client, db_session_integration):
+    product, (line,) = seed_lines(db_session_integration, 2)
+    body = {"items": [{"product_line_id": line.id, "quantity": 2}]}
+
+    response = client.post("api/inventory/reserve", json=body)
+    assert response.status_code == 200
+    db_session_integration.expire_all()
+    assert line.stock_qty == 0
+    assert product.stock_status == "oos"
+
+    response = client.post("api/inventory/reserve", json=body)
+    assert response.status_code == 409
+
+    response = client.post("api/inventory/release", json=body)
+    assert response.status_code == 200
+    db_session_integration.expire_all()
+    assert line.stock_qty == 2
+    assert product.stock_status == "is"
+
+
+"""
+- [ ] Test POST reserve of several lines is all or nothing
+"""
+
+
+def test_integrate_reserve_stock_all_or_nothing(client, db_session_integration):
+    _, (line_1, line_2) = seed_lines(db_session_integration, 5, 1)
+    body = {
+        "items": [
+            {"product_line_id": line_1.id, "quantity": 1},
+            {"product_line_id": line_2.id, "quantity": 2},
+        ]
+    }
+
+    response = client.post("api/inventory/reserve", json=body)
+
+    assert response.status_code == 409
+    db_session_integration.expire_all()
+    assert (line_1.stock_qty, line_2.stock_qty) == (5, 1)
+
+
+"""
+- [ ] Test concurrent reservers on one line never oversell it
+"""
+
+
+def test_integrate_reserve_stock_concurrent(client, db_session_committed):
+    override_session_per_request(db_session_committed)
+
+    stock = 5
+    _, (line_1, line_2) = seed_lines(db_session_committed, stock, stock * 4)
+    reservers = 20
+    barrier = threading.Barrier(reservers)
+
+    def reserve(index):
+        # opposite item orders: the sorted lock order keeps them deadlock free
+        items = [
+            {"product_line_id": line_1.id, "quantity": 1},
+            {"product_line_id": line_2.id, "quantity": 1},
+        ]
+        barrier.wait()
+        return client.post(
+            "api/inventory/reserve", json={"items": items[:: 1 - 2 * (index % 2)]}
+        )
+
+    with ThreadPoolExecutor(max_workers=reservers) as executor:
+        responses = list(executor.map(reserve, range(reservers)))
+
+    status_codes = [response.status_code for response in responses]
+    assert status_codes.count(200) == stock
+    assert status_codes.count(409) == reservers - stock
+    db_session_committed.expire_all()
+    assert (line_1.stock_qty, line_2.stock_qty) == (0, stock * 3)
+
+
+"""
+- [ ] Test concurrent reservations emptying two lines of a product leave it oos
+"""
+
+
+def test_integrate_reserve_stock_concurrent_status(
+    client, db_session_committed, monkeypatch
+):
+    override_session_per_request(db_session_committed)
+    product, lines = seed_lines(db_session_committed, 1, 1)
+
+    # both transactions have taken their line before either syncs the status
+    barrier = threading.Barrier(len(lines), timeout=10)
+    sync_stock_status = inventory_routes.sync_stock_status
+
+    def sync_after_both(db, product_ids):
+        barrier.wait()
+        sync_stock_status(db, product_ids)
+
+    monkeypatch.setattr(inventory_routes, "sync_stock_status", sync_after_both)
+
+    def reserve(line_id):
+        items = [{"product_line_id": line_id, "quantity": 1}]
+        return client.post("api/inventory/reserve", json={"items": items})
+
+    with ThreadPoolExecutor(max_workers=len(lines)) as executor:
+        responses = list(executor.map(reserve, [line.id for line in lines]))
+
+    assert [response.status_code for response in responses] == [200, 200]
+    db_session_committed.expire_all()
+    assert [line.stock_qty for line in lines] == [0, 0]
+    assert product.stock_status == "oos"
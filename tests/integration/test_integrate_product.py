@@ -0,0 +1,147 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app.models import (
+    Attribute,
+    AttributeValue,
+    Category,
+    Product,
+    ProductImage,
+    ProductLine,
+    ProductType,
+)
+from tests.factories.models_factory import (
+    get_random_category_dict,
+    get_random_product_dict,
+    get_random_product_line_dict,
+)
+
+# products, product types, lines, images, attribute values (with attribute)
+PRODUCT_AGGREGATE_QUERIES = 5
+
+
+def seed_products(db, count, lines_per_product=3):
+    category_data = get_random_category_dict()
+    category_data.pop("id")
+    category = Category(**category_data)
+    attribute = Attribute(name="colour")
+    values = [
+        AttributeValue(attribute_value=value, attribute=attribute)
+        for value in ("red", "blue")
+    ]
+    product_types = [ProductType(name=f"type-{i}", level=1) for i in range(2)]
+
+    products = []
+    for index in range(count):
+        product_data = get_random_product_dict(id_=index + 1)
+        for key in ("id", "pid", "created_at", "updated_at", "category_id"):
+            product_data.pop(key)
+        lines = []
+        for order_num in range(1, lines_per_product + 1):
+            line_data = get_random_product_line_dict(order_num=order_num)
+            for key in ("id", "sku", "product_id"):
+                line_data.pop(key)
+            lines.append(
+                ProductLine(
+                    **line_data,
+                    images=[
+                        ProductImage(
+                            alternative_text="front", url="/front.png", order=1
+                        )
+                    ],
+                    attribute_values=values,
+                )
+            )
+        products.append(
+            Product(
+                **product_data,
+                category=category,
+                product_types=product_types,
+                lines=lines,
+            )
+        )
+    db.add_all(products)
+    db.commit()
+    return products
+
+
+@contextmanager
+def count_queries(db):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        # savepoints come from the per-test transaction, not from the route
+        if "SAVEPOINT" not in statement:
+            statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+"""
+- [ ] Test GET single product loads its aggregate in a fixed number of queries
+"""
+
+
+def test_integrate_get_product_query_count(client, db_session_integration):
+    product_id = seed_products(db_session_integration, 1)[0].id
+    db_session_integration.expunge_all()
+
+    with count_queries(db_session_integration) as statements:
+        response = client.get(f"api/product/{product_id}")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [line["order_num"] for line in data["lines"]] == [1, 2, 3]
+    assert len(data["lines"][0]["attribute_values"]) == 2
+    assert len(data["product_types"]) == 2
+    assert len(statements) == PRODUCT_AGGREGATE_QUERIES
+
+
+"""
+- [ ] Test GET products query count does not grow with the page size (no N+1)
+"""
+
+
+@pytest.mark.parametrize("count", [1, 10])
+def test_integrate_get_products_query_count(client, db_session_integration, count):
+    seed_products(db_session_integration, count)
+    db_session_integration.expunge_all()
+
+    with count_queries(db_session_integration) as statements:
+        response = client.get("api/product/?limit=100")
+
+    assert response.status_code == 200
+    assert len(response.json()) == count
+    assert len(statements) == PRODUCT_AGGREGATE_QUERIES
+
+
+"""
+- [ ] Test product search on an attribute value no line carries is empty
+"""
+
+
+def test_integrate_search_products_unused_value(client, db_session_integration):
+    seed_products(db_session_integration, 2)
+    colour = db_session_integration.query(Attribute).filter_by(name="colour").one()
+    unused = AttributeValue(attribute_value="green", attribute=colour)
+    db_session_integration.add(unused)
+    db_session_integration.commit()
+
+    response = client.get(
+        "api/product/search", params={"attribute_value_id": [unused.id]}
+    )
+    assert response.status_code == 200
+    assert response.json()["total"] == 0
+    assert response.json()["products"] == []
+
+    response = client.get(
+        "api/product/search", params={"attribute_value_id": [unused.id + 1000]}
+    )
+    assert response.status_code == 400
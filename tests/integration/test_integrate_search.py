@@ -0,0 +1,84 @@
+from app.models import Category, Product
+from tests.factories.models_factory import get_random_category_dict
+
+
+def seed_products(db, names):
+    category_data = get_random_category_dict()
+    category_data.pop("id")
+    category_data["name"] = "shirts"
+    category = Category(**category_data)
+    db.add_all(
+        Product(
+            name=name,
+            slug=name.replace(" ", "-"),
+            description=description,
+            category=category,
+        )
+        for name, description in names
+    )
+    db.commit()
+    return category
+
+
+"""
+- [ ] Test product search ranks name matches above description matches
+"""
+
+
+def test_integrate_search_products_ranked(client, db_session_integration):
+    seed_products(
+        db_session_integration,
+        [
+            ("linen trousers", "goes well with a shirt"),
+            ("oxford shirt", "cotton"),
+            ("garden hose", None),
+        ],
+    )
+
+    response = client.get("api/search/products", params={"q": "shirt"})
+
+    assert response.status_code == 200
+    assert [hit["name"] for hit in response.json()] == [
+        "oxford shirt",
+        "linen trousers",
+    ]
+
+
+"""
+- [ ] Test product search matches prefixes and pages without overlap
+"""
+
+
+def test_integrate_search_products_prefix_pages(client, db_session_integration):
+    seed_products(
+        db_session_integration,
+        [(f"shirt {i}", "cotton shirt") for i in range(5)],
+    )
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"q": "shi", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("api/search/products", params=params)
+        assert response.status_code == 200
+        seen.extend(hit["id"] for hit in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert len(seen) == len(set(seen)) == 5
+
+
+"""
+- [ ] Test search tolerates a typo through trigram similarity
+"""
+
+
+def test_integrate_search_typo(client, db_session_integration):
+    seed_products(db_session_integration, [("oxford shirt", "cotton")])
+
+    response = client.get("api/search/products", params={"q": "oxfrod shirt"})
+    assert [hit["name"] for hit in response.json()] == ["oxford shirt"]
+
+    response = client.get("api/search/categories", params={"q": "shirst"})
+    assert [hit["name"] for hit in response.json()] == ["shirts"]
@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+from app.models import Category, Product, SeasonalEvent
+from app.utils.seasonal_events import utc_now
+from tests.factories.models_factory import (
+    get_random_category_dict,
+    get_random_product_dict,
+)
+
+"""
+- [ ] Test GET active seasonal events returns only running events
+"""
+
+
+def test_integrate_get_active_seasonal_events(client, db_session_integration):
+    now = utc_now()
+    running = SeasonalEvent(
+        name="running",
+        start_date=now - timedelta(days=1),
+        end_date=now + timedelta(seconds=120),
+    )
+    upcoming = SeasonalEvent(
+        name="upcoming",
+        start_date=now + timedelta(days=1),
+        end_date=now + timedelta(days=2),
+    )
+    category_data = get_random_category_dict()
+    category_data.pop("id")
+    category = Category(**category_data)
+    products = []
+    for index, (event, is_active) in enumerate(
+        [(running, True), (running, False), (upcoming, True)], start=1
+    ):
+        product_data = get_random_product_dict(id_=index)
+        for key in ("id", "pid", "created_at", "updated_at", "category_id"):
+            product_data.pop(key)
+        product_data.pop("seasonal_event_id")
+        product_data["is_active"] = is_active
+        products.append(
+            Product(**product_data, category=category, seasonal_event=event)
+        )
+    db_session_integration.add_all(products)
+    db_session_integration.commit()
+
+    response = client.get("api/seasonal-event/active")
+
+    assert response.status_code == 200
+    assert [event["name"] for event in response.json()] == ["running"]
+    assert [product["id"] for product in response.json()[0]["products"]] == [
+        products[0].id
+    ]
+    # cached until the running event ends
+    max_age = int(response.headers["Cache-Control"].removeprefix("max-age="))
+    assert 100 <= max_age <= 120
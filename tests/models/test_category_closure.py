@@ -0,0 +1,100 @@
+from sqlalchemy import Integer
+
+"""
+## Table and Column Validation
+"""
+
+"""
+- [ ] Confirm the presence of all required tables within the database schema.
+"""
+
+
+def test_model_structure_table_exists(db_inspector):
+    assert db_inspector.has_table("category_closure")
+
+
+"""
+- [ ] Validate the existence of expected columns in each table, ensuring correct data types.
+"""
+
+
+def test_model_structure_column_data_types(db_inspector):
+    table = "category_closure"
+    columns = {columns["name"]: columns for columns in db_inspector.get_columns(table)}
+
+    assert isinstance(columns["ancestor_id"]["type"], Integer)
+    assert isinstance(columns["descendant_id"]["type"], Integer)
+    assert isinstance(columns["depth"]["type"], Integer)
+
+
+"""
+- [ ] Ensure that column foreign keys are correctly defined.
+"""
+
+
+def test_model_structure_foreign_key(db_inspector):
+    table = "category_closure"
+    foreign_keys = db_inspector.get_foreign_keys(table)
+
+    for column in ("ancestor_id", "descendant_id"):
+        foreign_key = next(
+            (fk for fk in foreign_keys if fk["constrained_columns"] == [column]),
+            None,
+        )
+        assert foreign_key is not None
+        assert foreign_key["referred_table"] == "category"
+        assert foreign_key["options"].get("ondelete") == "CASCADE"
+
+
+"""
+- [ ] Verify nullable or not nullable fields
+"""
+
+
+def test_model_structure_nullable_contraints(db_inspector):
+    table = "category_closure"
+    columns = db_inspector.get_columns(table)
+
+    expected_nullable = {
+        "ancestor_id": False,
+        "descendant_id": False,
+        "depth": False,
+    }
+
+    for column in columns:
+        column_name = column["name"]
+        assert column["nullable"] == expected_nullable.get(
+            column_name
+        ), f"column '{column_name}' is not nullable as expected"
+
+
+"""
+- [ ] Test columns with specific constraints to ensure they are accurately defined.
+"""
+
+
+def test_model_structure_column_constraints(db_inspector):
+    table = "category_closure"
+    constraints = db_inspector.get_check_constraints(table)
+
+    assert any(
+        constraint["name"] == "category_closure_depth_check"
+        for constraint in constraints
+    )
+
+
+"""
+- [ ] Validate the primary key and the ancestor lookup index.
+"""
+
+
+def test_model_structure_primary_key_and_index(db_inspector):
+    table = "category_closure"
+    primary_key = db_inspector.get_pk_constraint(table)
+    indexes = {index["name"]: index for index in db_inspector.get_indexes(table)}
+
+    assert primary_key["constrained_columns"] == ["ancestor_id", "descendant_id"]
+    assert indexes["ix_category_closure_descendant_id_depth"]["column_names"] == [
+        "descendant_id",
+        "depth",
+    ]
@@ -90,6 +90,7 @@ def test_model_structure_nullable_contraints(db_inspector):
         "stock_status": False,
         "category_id": False,
         "seasonal_event_id": True,
+        "search_vector": True,
     }
 
     for column in columns:
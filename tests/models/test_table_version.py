@@ -0,0 +1,79 @@
+from sqlalchemy import BigInteger, SmallInteger, String, text
+
+"""
+## Table and Column Validation
+"""
+
+"""
+- [ ] Confirm the presence of all required tables within the database schema.
+"""
+
+
+def test_model_structure_table_exists(db_inspector):
+    assert db_inspector.has_table("table_version")
+
+
+"""
+- [ ] Validate the existence of expected columns in each table, ensuring correct data types.
+"""
+
+
+def test_model_structure_column_data_types(db_inspector):
+    table = "table_version"
+    columns = {columns["name"]: columns for columns in db_inspector.get_columns(table)}
+
+    assert isinstance(columns["table_name"]["type"], String)
+    assert isinstance(columns["slot"]["type"], SmallInteger)
+    assert isinstance(columns["version"]["type"], BigInteger)
+    assert db_inspector.get_pk_constraint(table)["constrained_columns"] == [
+        "table_name",
+        "slot",
+    ]
+
+
+"""
+- [ ] Verify that every write statement on category moves its version.
+"""
+
+
+def test_model_category_write_bumps_version(db_session):
+    select_version = text(
+        "SELECT sum(version) FROM table_version WHERE table_name = 'category'"
+    )
+    with db_session().bind.begin() as connection:
+        before = connection.execute(select_version).scalar_one()
+        connection.execute(
+            text(
+                "INSERT INTO category (name, slug) "
+                "VALUES ('version-a', 'version-a'), ('version-b', 'version-b')"
+            )
+        )
+        after_insert = connection.execute(select_version).scalar_one()
+        connection.execute(text("DELETE FROM category WHERE name LIKE 'version-%'"))
+        after_delete = connection.execute(select_version).scalar_one()
+
+    assert before < after_insert < after_delete
+
+
+"""
+- [ ] Verify that a write bumps the slot of its own backend only.
+"""
+
+
+def test_model_category_write_bumps_backend_slot(db_session):
+    select_slots = text(
+        "SELECT slot, version FROM table_version WHERE table_name = 'category'"
+    )
+    with db_session().bind.begin() as connection:
+        before = dict(connection.execute(select_slots).all())
+        connection.execute(
+            text("INSERT INTO category (name, slug) VALUES ('slot-a', 'slot-a')")
+        )
+        after = dict(connection.execute(select_slots).all())
+        slot = connection.execute(text("SELECT 1 + pg_backend_pid() % 128")).scalar()
+        connection.execute(text("DELETE FROM category WHERE name = 'slot-a'"))
+
+    assert after[slot] == before.get(slot, 0) + 1
+    assert {key: value for key, value in after.items() if key != slot} == {
+        key: value for key, value in before.items() if key != slot
+    }
@@ -0,0 +1,216 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.models import Category
+from tests.factories.models_factory import get_random_category_dict
+
+
+class MockResult:
+    def __init__(self, value=None):
+        self.value = value
+
+    def scalars(self):
+        return self
+
+    def first(self):
+        return self.value
+
+    def all(self):
+        return self.value
+
+
+def mock_execute(return_value=None):
+    async def execute(*args, **kwargs):
+        return MockResult(return_value)
+
+    return execute
+
+
+def mock_async_output(return_value=None):
+    async def output(*args, **kwargs):
+        return return_value
+
+    return output
+
+
+def mock_async_exception():
+    async def output(*args, **kwargs):
+        raise Exception("Internal server error")
+
+    return output
+
+
+"""
+- [ ] Test async DELETE category successfully
+"""
+
+
+def test_unit_async_delete_category_successfully(client, monkeypatch):
+    category_dict = get_random_category_dict()
+    category_instance = Category(**category_dict)
+
+    monkeypatch.setattr(
+        "sqlalchemy.ext.asyncio.AsyncSession.execute", mock_execute(category_instance)
+    )
+    monkeypatch.setattr(
+        "sqlalchemy.ext.asyncio.AsyncSession.delete", mock_async_output()
+    )
+    monkeypatch.setattr(
+        "sqlalchemy.ext.asyncio.AsyncSession.commit", mock_async_output()
+    )
+
+    response = client.delete("api/async/category/1")
+    expected_json = {"id": category_dict["id"], "name": category_dict["name"]}
+    assert response.status_code == 200
+    assert response.json() == expected_json
+
+
+"""
+- [ ] Test async DELETE category not found
+"""
+
+
+def test_unit_async_delete_category_not_found(client, monkeypatch):
+    monkeypatch.setattr("sqlalchemy.ext.asyncio.AsyncSession.execute", mock_execute())
+
+    response = client.delete("api/async/category/1")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Category not found"}
+
+
+"""
+- [ ] Test async UPDATE category successfully
+"""
+
+
+def test_unit_async_update_category_successfully(client, monkeypatch):
+    category_dict = get_random_category_dict()
+    category_instance = Category(**category_dict)
+
+    monkeypatch.setattr(
+        "sqlalchemy.ext.asyncio.AsyncSession.execute", mock_execute(category_instance)
+    )
+    monkeypatch.setattr(
+        "sqlalchemy.ext.asyncio.AsyncSession.commit", mock_async_output()
+    )
+    monkeypatch.setattr(
+        "sqlalchemy.ext.asyncio.AsyncSession.refresh", mock_async_output()
+    )
+
+    body = category_dict.copy()
+    body.pop("id")
+    response = client.put("api/async/category/1", json=body)
+    assert response.status_code == 201
+    assert response.json() == category_dict
+
+
+"""
+- [ ] Test async GET single category by slug successfully, with its version
+"""
+
+
+@pytest.mark.parametrize("category", [get_random_category_dict() for _ in range(3)])
+def test_unit_async_get_single_category_by_slug_successfully(
+    client, monkeypatch, category
+):
+    monkeypatch.setattr(
+        "sqlalchemy.ext.asyncio.AsyncSession.execute", mock_execute(category)
+    )
+    monkeypatch.setattr(
+        "app.utils.http_cache.get_table_version_async", mock_async_output(42)
+    )
+    response = client.get(f"api/async/category/slug/{category['slug']}")
+    assert response.status_code == 200
+    assert response.json() == category
+
+    # the entry is shared with the sync route, which sends its version
+    response = client.get(f"api/category/slug/{category['slug']}")
+    assert response.status_code == 200
+    assert response.json() == category
+    assert response.headers["ETag"] == '"category-42"'
+
+
+"""
+- [ ] Test async GET single category by slug internal server error
+"""
+
+
+def test_unit_async_get_single_category_by_slug_internal_server_error(
+    client, monkeypatch
+):
+    monkeypatch.setattr(
+        "sqlalchemy.ext.asyncio.AsyncSession.execute", mock_async_exception()
+    )
+    response = client.get("api/async/category/slug/test-slug")
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Internal Server Error"}
+
+
+"""
+- [ ] Test async GET all categories successfully
+"""
+
+
+def test_unit_async_get_all_categories_successfully(client, monkeypatch):
+    category = [get_random_category_dict(i) for i in range(5)]
+    monkeypatch.setattr(
+        "sqlalchemy.ext.asyncio.AsyncSession.execute", mock_execute(category)
+    )
+    response = client.get("api/async/category/")
+    assert response.status_code == 200
+    assert response.json() == category
+
+
+"""
+- [ ] Test async POST new category successfully
+"""
+
+
+def test_unit_async_create_new_category_successfully(client, monkeypatch):
+    category = get_random_category_dict()
+
+    for key, value in category.items():
+        monkeypatch.setattr(Category, key, value)
+
+    monkeypatch.setattr("sqlalchemy.ext.asyncio.AsyncSession.execute", mock_execute())
+    monkeypatch.setattr(
+        "sqlalchemy.ext.asyncio.AsyncSession.commit", mock_async_output()
+    )
+    monkeypatch.setattr(
+        "sqlalchemy.ext.asyncio.AsyncSession.refresh", mock_async_output()
+    )
+
+    body = category.copy()
+    body.pop("id")
+    response = client.post("api/async/category/", json=body)
+    assert response.status_code == 201
+    assert response.json() == category
+
+
+"""
+- [ ] Test async POST new category with existing slug
+"""
+
+
+def test_unit_async_create_new_category_existing_slug(client, monkeypatch):
+    category = get_random_category_dict()
+
+    async def mock_commit(*args, **kwargs):
+        raise IntegrityError(
+            "INSERT INTO category ...",
+            {},
+            Exception(
+                'duplicate key value violates unique constraint "uq_category_slug"'
+            ),
+        )
+
+    monkeypatch.setattr("sqlalchemy.ext.asyncio.AsyncSession.commit", mock_commit)
+    monkeypatch.setattr(
+        "sqlalchemy.ext.asyncio.AsyncSession.rollback", mock_async_output()
+    )
+
+    body = category.copy()
+    body.pop("id")
+    response = client.post("api/async/category/", json=body)
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Category with this slug exists"}
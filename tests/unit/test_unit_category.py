@@ -1,9 +1,16 @@
+import json
+from collections import namedtuple
+
 import pytest
-from fastapi import HTTPException
 from pydantic import ValidationError
+from sqlalchemy import Select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
 
 from app.models import Category
-from app.schemas.category_schema import CategoryCreate
+from app.schemas.category_schema import CategoryCreate, dump_category_list
+from app.utils.category_utils import decode_cursor, encode_cursor
+from app.utils.stream_utils import negotiate_encoding
 from tests.factories.models_factory import get_random_category_dict
 
 
@@ -248,26 +255,42 @@ def test_unit_create_new_category_successfully(client, monkeypatch):
     assert response.json() == category
 
 
+def mock_integrity_error(constraint_name):
+    def commit(*args, **kwargs):
+        raise IntegrityError(
+            "INSERT INTO category ...",
+            {},
+            Exception(
+                f'duplicate key value violates unique constraint "{constraint_name}"'
+            ),
+        )
+
+    return commit
+
+
 @pytest.mark.parametrize(
-    "existing_category, category_data, expected_detail",
+    "constraint_name, category_data, expected_detail",
     [
-        (True, get_random_category_dict(), "Category with this name and level exists"),
-        (True, get_random_category_dict(), "Category with this slug exists"),
+        (
+            "uq_category_name_level",
+            get_random_category_dict(),
+            "Category with this name and level exists",
+        ),
+        (
+            "uq_category_slug",
+            get_random_category_dict(),
+            "Category with this slug exists",
+        ),
     ],
 )
 def test_unit_create_new_category_existing(
-    client, monkeypatch, existing_category, category_data, expected_detail
+    client, monkeypatch, constraint_name, category_data, expected_detail
 ):
-    def mock_check_existing_category(db, category_data):
-        if existing_category:
-            raise HTTPException(status_code=400, detail=expected_detail)
-
+    # duplicates are reported by the unique constraints when the INSERT commits
     monkeypatch.setattr(
-        "app.routers.category_routes.check_existing_category",
-        mock_check_existing_category,
+        "sqlalchemy.orm.Session.commit", mock_integrity_error(constraint_name)
     )
-
-    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output())
+    monkeypatch.setattr("sqlalchemy.orm.Session.rollback", mock_output())
 
     body = category_data.copy()
     body.pop("id")
@@ -279,6 +302,28 @@ def test_unit_create_new_category_existing(
         assert response.json() == {"detail": expected_detail}
 
 
+"""
+- [ ] Test UPDATE category to an existing slug
+"""
+
+
+def test_unit_update_category_existing_slug(client, monkeypatch):
+    category_dict = get_random_category_dict()
+    category_instance = Category(**category_dict)
+
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output(category_instance))
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.commit", mock_integrity_error("uq_category_slug")
+    )
+    monkeypatch.setattr("sqlalchemy.orm.Session.rollback", mock_output())
+
+    body = category_dict.copy()
+    body.pop("id")
+    response = client.put("api/category/1", json=body)
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Category with this slug exists"}
+
+
 def test_unit_create_new_category_with_internal_server_error(client, monkeypatch):
     category = get_random_category_dict()
 
@@ -297,3 +342,406 @@ def test_unit_create_new_category_with_internal_server_error(client, monkeypatch
     response = client.post("api/category/", json=body)
 
     assert response.status_code == 500
+
+
+"""
+- [ ] Test GET categories returns a next page cursor
+"""
+
+
+def test_unit_get_categories_paginated_next_cursor(client, monkeypatch):
+    categories = [Category(**get_random_category_dict()) for _ in range(3)]
+    for id_, category in enumerate(categories, start=1):
+        category.id = id_
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", mock_output(categories))
+
+    response = client.get("api/category/?limit=2")
+    assert response.status_code == 200
+    assert [category["id"] for category in response.json()] == [1, 2]
+    assert decode_cursor(response.headers["X-Next-Cursor"]) == 2
+
+
+"""
+- [ ] Test GET categories pushes filters and cursor into SQL
+"""
+
+
+def test_unit_get_categories_filters_in_sql(client, monkeypatch):
+    statements = []
+
+    def mock_all(query):
+        statements.append(
+            str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        )
+        return []
+
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", mock_all)
+
+    cursor = encode_cursor(10)
+    response = client.get(
+        f"api/category/?cursor={cursor}&is_active=true&level=2&parent_id=5&limit=20"
+    )
+    assert response.status_code == 200
+    assert "X-Next-Cursor" not in response.headers
+
+    sql = statements[0]
+    assert "category.id > 10" in sql
+    assert "category.is_active = true" in sql
+    assert "category.level = 2" in sql
+    assert "category.parent_id = 5" in sql
+    assert "LIMIT 21" in sql
+
+
+"""
+- [ ] Test GET categories without limit or cursor returns every row
+"""
+
+
+@pytest.mark.parametrize(
+    "query_string, expected_limit",
+    [("", None), ("is_active=true", None), (f"cursor={encode_cursor(10)}", 101)],
+)
+def test_unit_get_categories_default_limit(
+    client, monkeypatch, query_string, expected_limit
+):
+    statements = []
+
+    def mock_all(query):
+        statements.append(
+            str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        )
+        return []
+
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", mock_all)
+
+    response = client.get(f"api/category/?{query_string}")
+    assert response.status_code == 200
+
+    if expected_limit is None:
+        assert "LIMIT" not in statements[0]
+    else:
+        assert f"LIMIT {expected_limit}" in statements[0]
+
+
+"""
+- [ ] Test GET categories filters the top level categories
+"""
+
+
+@pytest.mark.parametrize(
+    "is_root, expected", [("true", "IS NULL"), ("false", "IS NOT NULL")]
+)
+def test_unit_get_categories_is_root(client, monkeypatch, is_root, expected):
+    statements = []
+
+    def mock_all(query):
+        statements.append(str(query.statement))
+        return []
+
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", mock_all)
+
+    response = client.get(f"api/category/?is_root={is_root}")
+    assert response.status_code == 200
+    assert f"category.parent_id {expected}" in statements[0]
+
+
+"""
+- [ ] Test GET categories with a fields projection
+"""
+
+
+def test_unit_get_categories_fields_projection(client, monkeypatch):
+    Row = namedtuple("Row", ["name", "id"])
+    statements = []
+
+    def mock_all(query):
+        statements.append(str(query.statement))
+        return [Row("shoes", 1), Row("hats", 2)]
+
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", mock_all)
+
+    response = client.get("api/category/?fields=name")
+    assert response.status_code == 200
+    assert response.json() == [{"id": 1, "name": "shoes"}, {"id": 2, "name": "hats"}]
+    assert "category.slug" not in statements[0]
+
+
+"""
+- [ ] Test GET categories with invalid cursor or fields
+"""
+
+
+@pytest.mark.parametrize(
+    "query_string, expected_detail",
+    [
+        ("cursor=not-a-cursor", "Invalid cursor"),
+        ("fields=name,password", "Unknown fields: password"),
+    ],
+)
+def test_unit_get_categories_bad_request(client, query_string, expected_detail):
+    response = client.get(f"api/category/?{query_string}")
+    assert response.status_code == 400
+    assert response.json() == {"detail": expected_detail}
+
+
+def mock_stream(categories, batch_size=2):
+    def stream(connection, criteria, _batch_size):
+        for start in range(0, len(categories), batch_size):
+            yield categories[start : start + batch_size]
+
+    return stream
+
+
+"""
+- [ ] Test export categories as NDJSON
+"""
+
+
+def test_unit_export_categories_ndjson(client, override_get_db_connection, monkeypatch):
+    categories = [get_random_category_dict() for _ in range(5)]
+    monkeypatch.setattr(
+        "app.routers.category_routes.stream_categories", mock_stream(categories)
+    )
+
+    response = client.get(
+        "api/category/export", headers={"Accept-Encoding": "identity"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "content-encoding" not in response.headers
+    lines = response.text.splitlines()
+    assert [json.loads(line) for line in lines] == categories
+
+
+"""
+- [ ] Test export categories as a JSON array
+"""
+
+
+@pytest.mark.parametrize("count", [0, 1, 5])
+def test_unit_export_categories_json_array(
+    client, override_get_db_connection, monkeypatch, count
+):
+    categories = [get_random_category_dict() for _ in range(count)]
+    monkeypatch.setattr(
+        "app.routers.category_routes.stream_categories", mock_stream(categories)
+    )
+
+    response = client.get(
+        "api/category/export", headers={"Accept": "application/json"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == categories
+
+
+"""
+- [ ] Test export categories with gzip content encoding
+"""
+
+
+def test_unit_export_categories_gzip(client, override_get_db_connection, monkeypatch):
+    categories = [get_random_category_dict() for _ in range(5)]
+    monkeypatch.setattr(
+        "app.routers.category_routes.stream_categories", mock_stream(categories)
+    )
+
+    response = client.get("api/category/export", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert [json.loads(line) for line in response.text.splitlines()] == categories
+
+
+"""
+- [ ] Test Accept-Encoding negotiation
+"""
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        (None, None),
+        ("identity", None),
+        ("gzip, deflate", "gzip"),
+        ("br;q=1.0, gzip;q=0.5", "gzip"),
+        ("gzip;q=0", None),
+    ],
+)
+def test_unit_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+ExistingRow = namedtuple("ExistingRow", ["id", "name", "slug", "level"])
+WrittenRow = namedtuple(
+    "WrittenRow",
+    ["id", "name", "slug", "is_active", "level", "parent_id", "inserted"],
+)
+
+
+class MockRows:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+def mock_bulk_execute(existing, statements, updated_slugs=()):
+    # SELECT returns the existing rows, INSERT returns one row per value set
+    def execute(self, statement, *args, **kwargs):
+        statements.append(statement)
+        if isinstance(statement, Select):
+            return MockRows(existing)
+        params = statement.compile(dialect=postgresql.dialect()).params
+        count = len([key for key in params if key.startswith("slug_m")])
+        return MockRows(
+            [
+                WrittenRow(
+                    id=100 + i,
+                    name=params[f"name_m{i}"],
+                    slug=params[f"slug_m{i}"],
+                    is_active=params[f"is_active_m{i}"],
+                    level=params[f"level_m{i}"],
+                    parent_id=params[f"parent_id_m{i}"],
+                    inserted=params[f"slug_m{i}"] not in updated_slugs,
+                )
+                for i in range(count)
+            ]
+        )
+
+    return execute
+
+
+"""
+- [ ] Test POST bulk categories with conflicts in db and in request
+"""
+
+
+def test_unit_bulk_create_categories_with_conflicts(client, monkeypatch):
+    statements = []
+    existing = [ExistingRow(1, "taken", "taken-slug", 1)]
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.execute", mock_bulk_execute(existing, statements)
+    )
+    monkeypatch.setattr("sqlalchemy.orm.Session.commit", mock_output())
+
+    body = [
+        {"name": "new", "slug": "new-slug", "level": 1},
+        {"name": "other", "slug": "taken-slug", "level": 1},
+        {"name": "taken", "slug": "free-slug", "level": 1},
+        {"name": "again", "slug": "new-slug", "level": 2},
+    ]
+    response = client.post("api/category/bulk", json=body)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["created"], data["updated"], data["conflicts"]) == (1, 0, 3)
+    assert data["results"][0]["status"] == "created"
+    assert data["results"][0]["category"]["slug"] == "new-slug"
+    assert [result["detail"] for result in data["results"][1:]] == [
+        "Category with this slug exists",
+        "Category with this name and level exists",
+        "Duplicate slug in request",
+    ]
+    # one conflict check and one INSERT for the whole batch
+    assert len(statements) == 2
+    assert "ON CONFLICT DO NOTHING" in str(
+        statements[1].compile(dialect=postgresql.dialect())
+    )
+
+
+"""
+- [ ] Test POST bulk categories in upsert mode
+"""
+
+
+def test_unit_bulk_upsert_categories(client, monkeypatch):
+    statements = []
+    existing = [ExistingRow(1, "shoes", "shoes", 1)]
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.execute",
+        mock_bulk_execute(existing, statements, updated_slugs={"shoes"}),
+    )
+    monkeypatch.setattr("sqlalchemy.orm.Session.commit", mock_output())
+
+    body = [
+        {"name": "shoes", "slug": "shoes", "level": 1, "is_active": True},
+        {"name": "hats", "slug": "hats", "level": 1},
+    ]
+    response = client.post("api/category/bulk?mode=upsert", json=body)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["created"], data["updated"], data["conflicts"]) == (1, 1, 0)
+    assert data["results"][0]["status"] == "updated"
+    assert data["results"][0]["category"]["is_active"] is True
+    assert "ON CONFLICT ON CONSTRAINT uq_category_slug DO UPDATE" in str(
+        statements[1].compile(dialect=postgresql.dialect())
+    )
+
+
+"""
+- [ ] Test POST bulk categories maps constraint violations of the INSERT
+"""
+
+
+@pytest.mark.parametrize(
+    "message, status_code, expected_detail",
+    [
+        (
+            'insert or update on table "category" violates foreign key '
+            'constraint "category_parent_id_fkey"',
+            400,
+            "Parent category does not exist",
+        ),
+        (
+            'duplicate key value violates unique constraint "uq_category_name_level"',
+            400,
+            "Category with this name and level exists",
+        ),
+        ('violates check constraint "unknown_check"', 500, "Internal Server Error"),
+    ],
+)
+def test_unit_bulk_create_categories_integrity_error(
+    client, monkeypatch, message, status_code, expected_detail
+):
+    def execute(self, statement, *args, **kwargs):
+        if isinstance(statement, Select):
+            return MockRows([])
+        raise IntegrityError("INSERT INTO category ...", {}, Exception(message))
+
+    monkeypatch.setattr("sqlalchemy.orm.Session.execute", execute)
+    monkeypatch.setattr("sqlalchemy.orm.Session.rollback", mock_output())
+
+    body = [{"name": "child", "slug": "child", "level": 2, "parent_id": 999}]
+    response = client.post("api/category/bulk", json=body)
+
+    assert response.status_code == status_code
+    assert response.json() == {"detail": expected_detail}
+
+
+"""
+- [ ] Test POST bulk categories with an empty list
+"""
+
+
+def test_unit_bulk_create_categories_empty(client):
+    response = client.post("api/category/bulk", json=[])
+    assert response.status_code == 422
+
+
+"""
+- [ ] Test category list serialisation from ORM objects and projected rows
+"""
+
+
+def test_unit_dump_category_list():
+    category = get_random_category_dict()
+    Row = namedtuple("Row", ["id", "name"])
+
+    assert json.loads(dump_category_list([Category(**category)])) == [category]
+    assert json.loads(dump_category_list([Row(1, "shoes")])) == [
+        {"id": 1, "name": "shoes"}
+    ]
+    with pytest.raises(ValidationError):
+        dump_category_list([Row("not-an-id", "shoes")])
@@ -0,0 +1,221 @@
+import pytest
+
+from app.models import Category
+from app.utils.cache import LRUCache
+from app.utils.category_cache import invalidate_category
+from tests.factories.models_factory import get_random_category_dict
+
+
+def mock_output(return_value=None):
+    return lambda *args, **kwargs: return_value
+
+
+def mock_refresh(id_):
+    def refresh(self, instance):
+        instance.id = id_
+
+    return refresh
+
+
+def counting_first(calls, return_value=None):
+    def first(self):
+        calls.append(1)
+        return return_value
+
+    return first
+
+
+"""
+- [ ] Test LRU cache evicts the least recently used entry and counts it
+"""
+
+
+def test_unit_lru_cache_eviction_and_stats():
+    cache = LRUCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats() == {
+        "size": 2,
+        "max_size": 2,
+        "hits": 2,
+        "misses": 1,
+        "evictions": 1,
+        "expirations": 0,
+    }
+
+
+"""
+- [ ] Test LRU cache entries expire after their ttl
+"""
+
+
+def test_unit_lru_cache_expiry():
+    cache = LRUCache(max_size=2, ttl=60)
+    cache.set("a", 1, ttl=0)
+    cache.set("b", 2)
+
+    assert cache.get("a", "missing") == "missing"
+    assert cache.get("b") == 2
+    assert cache.stats()["expirations"] == 1
+
+
+"""
+- [ ] Test GET category by slug is served from the cache after the first read
+"""
+
+
+def test_unit_get_category_by_slug_cached(client, monkeypatch):
+    category = get_random_category_dict()
+    calls = []
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", counting_first(calls, category))
+
+    for _ in range(3):
+        response = client.get(f"api/category/slug/{category['slug']}")
+        assert response.status_code == 200
+        assert response.json() == category
+
+    # the slug lookup also warmed the id entry
+    response = client.get(f"api/category/{category['id']}")
+    assert response.status_code == 200
+    assert response.json() == category
+    assert len(calls) == 1
+
+
+"""
+- [ ] Test GET category by slug caches a 404
+"""
+
+
+def test_unit_get_category_by_slug_negative_cache(client, monkeypatch):
+    calls = []
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", counting_first(calls))
+
+    for _ in range(2):
+        response = client.get("api/category/slug/missing-slug")
+        assert response.status_code == 404
+        assert response.json() == {"detail": "Category does not exist"}
+    assert len(calls) == 1
+
+
+"""
+- [ ] Test POST category clears a cached 404 for its slug
+"""
+
+
+def test_unit_create_category_invalidates_negative_cache(client, monkeypatch):
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output())
+    assert client.get("api/category/slug/new-slug").status_code == 404
+
+    monkeypatch.setattr("sqlalchemy.orm.Session.commit", mock_output())
+    monkeypatch.setattr("sqlalchemy.orm.Session.refresh", mock_refresh(1))
+    body = {"name": "new", "slug": "new-slug", "level": 1}
+    assert client.post("api/category/", json=body).status_code == 201
+
+    category = {**get_random_category_dict(), "slug": "new-slug"}
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output(category))
+    response = client.get("api/category/slug/new-slug")
+    assert response.status_code == 200
+    assert response.json() == category
+
+
+"""
+- [ ] Test PUT category drops the cached entries of its old slug and id
+"""
+
+
+def test_unit_update_category_invalidates_cache(client, monkeypatch):
+    category_dict = get_random_category_dict()
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output(category_dict))
+    assert client.get(f"api/category/slug/{category_dict['slug']}").status_code == 200
+
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Query.first", mock_output(Category(**category_dict))
+    )
+    monkeypatch.setattr("sqlalchemy.orm.Session.commit", mock_output())
+    monkeypatch.setattr("sqlalchemy.orm.Session.refresh", mock_output())
+    body = {**category_dict, "slug": "renamed-slug"}
+    body.pop("id")
+    response = client.put(f"api/category/{category_dict['id']}", json=body)
+    assert response.status_code == 201
+
+    calls = []
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", counting_first(calls))
+    assert client.get(f"api/category/slug/{category_dict['slug']}").status_code == 404
+    assert client.get(f"api/category/{category_dict['id']}").status_code == 404
+    assert len(calls) == 2
+
+
+"""
+- [ ] Test DELETE category drops its cached entries
+"""
+
+
+def test_unit_delete_category_invalidates_cache(client, monkeypatch):
+    category_dict = get_random_category_dict()
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output(category_dict))
+    assert client.get(f"api/category/{category_dict['id']}").status_code == 200
+
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Query.first", mock_output(Category(**category_dict))
+    )
+    monkeypatch.setattr("sqlalchemy.orm.Session.delete", mock_output())
+    monkeypatch.setattr("sqlalchemy.orm.Session.commit", mock_output())
+    assert client.delete(f"api/category/{category_dict['id']}").status_code == 200
+
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output())
+    response = client.get(f"api/category/{category_dict['id']}")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Category not found"}
+
+
+"""
+- [ ] Test GET category by slug does not cache a row loaded during a write
+"""
+
+
+@pytest.mark.parametrize("stale", ["old row", "404"])
+def test_unit_get_category_by_slug_write_during_load(client, monkeypatch, stale):
+    category = get_random_category_dict()
+    calls = []
+
+    def first(self):
+        calls.append(1)
+        if len(calls) > 1:
+            return category
+        # a write commits and invalidates after this read loaded its row
+        invalidate_category(category["id"], category["slug"])
+        return {**category, "name": "old name"} if stale == "old row" else None
+
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", first)
+
+    client.get(f"api/category/slug/{category['slug']}")
+    for _ in range(2):
+        response = client.get(f"api/category/slug/{category['slug']}")
+        assert response.status_code == 200
+        assert response.json() == category
+    # the racing load was not stored, the next one was
+    assert len(calls) == 2
+
+
+"""
+- [ ] Test GET cache metrics
+"""
+
+
+def test_unit_get_cache_metrics(client, monkeypatch):
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output())
+    client.get("api/category/slug/missing-slug")
+    client.get("api/category/slug/missing-slug")
+
+    response = client.get("metrics/cache")
+
+    assert response.status_code == 200
+    stats = response.json()["category"]
+    assert stats["hits"] >= 1
+    assert stats["misses"] >= 1
+    assert set(stats) >= {"size", "max_size", "evictions"}
@@ -0,0 +1,156 @@
+import pytest
+
+from app.models import Category
+from app.utils.category_tree import build_nodes
+
+
+def tree_row(id_, parent_id, depth=None):
+    return {
+        "id": id_,
+        "name": f"category-{id_}",
+        "slug": f"category-{id_}",
+        "is_active": True,
+        "level": 100,
+        "parent_id": parent_id,
+        **({} if depth is None else {"depth": depth}),
+    }
+
+
+class MockMappings:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+def mock_execute(rows, statements):
+    def execute(self, statement, *args, **kwargs):
+        statements.append(statement)
+        return MockMappings(rows)
+
+    return execute
+
+
+def mock_output(return_value=None):
+    return lambda *args, **kwargs: return_value
+
+
+# 1 -> 2 -> 3 -> (4, 5)
+SUBTREE_ROWS = [
+    tree_row(1, None, -2),
+    tree_row(2, 1, -1),
+    tree_row(3, 2, 0),
+    tree_row(4, 3, 1),
+    tree_row(5, 3, 1),
+]
+
+
+"""
+- [ ] Test tree nodes are nested under their parents
+"""
+
+
+def test_unit_build_nodes_nests_children():
+    rows = [tree_row(1, None, 0), tree_row(2, None, 0), tree_row(3, 1, 1)]
+    roots = build_nodes(rows)
+
+    assert [root["id"] for root in roots] == [1, 2]
+    assert [child["id"] for child in roots[0]["children"]] == [3]
+    assert roots[1]["children"] == []
+    assert "depth" not in roots[0]
+
+
+"""
+- [ ] Test GET category subtree with ancestors
+"""
+
+
+def test_unit_get_category_subtree(client, monkeypatch):
+    statements = []
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.execute", mock_execute(SUBTREE_ROWS, statements)
+    )
+
+    response = client.get("api/category/3/tree?max_depth=1")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [ancestor["id"] for ancestor in data["ancestors"]] == [1, 2]
+    assert data["tree"]["id"] == 3
+    assert [child["id"] for child in data["tree"]["children"]] == [4, 5]
+    # one query answered from the closure table, no recursive walk
+    sql = str(statements[0])
+    assert "category_closure" in sql
+    assert "RECURSIVE" not in sql
+    assert len(statements) == 1
+
+
+"""
+- [ ] Test GET category subtree not found
+"""
+
+
+def test_unit_get_category_subtree_not_found(client, monkeypatch):
+    monkeypatch.setattr("sqlalchemy.orm.Session.execute", mock_execute([], []))
+
+    response = client.get("api/category/3/tree")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Category not found"}
+
+
+"""
+- [ ] Test GET category subtree is cached until a category is written
+"""
+
+
+def test_unit_get_category_subtree_cache_invalidated_on_write(client, monkeypatch):
+    statements = []
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.execute", mock_execute(SUBTREE_ROWS, statements)
+    )
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Query.first", mock_output(Category(**tree_row(5, 3)))
+    )
+    monkeypatch.setattr("sqlalchemy.orm.Session.delete", mock_output())
+    monkeypatch.setattr("sqlalchemy.orm.Session.commit", mock_output())
+
+    client.get("api/category/3/tree")
+    client.get("api/category/3/tree")
+    assert len(statements) == 1
+
+    response = client.delete("api/category/5")
+    assert response.status_code == 200
+
+    client.get("api/category/3/tree")
+    assert len(statements) == 2
+
+
+"""
+- [ ] Test GET category forest
+"""
+
+
+def test_unit_get_category_forest(client, monkeypatch):
+    rows = [tree_row(1, None, 0), tree_row(2, None, 0), tree_row(3, 2, 1)]
+    monkeypatch.setattr("sqlalchemy.orm.Session.execute", mock_execute(rows, []))
+
+    response = client.get("api/category/tree")
+
+    assert response.status_code == 200
+    assert [root["id"] for root in response.json()] == [1, 2]
+    assert response.json()[1]["children"][0]["id"] == 3
+
+
+"""
+- [ ] Test GET category tree with invalid max_depth
+"""
+
+
+@pytest.mark.parametrize("max_depth", [-1, 101])
+def test_unit_get_category_tree_invalid_max_depth(client, max_depth):
+    response = client.get(f"api/category/tree?max_depth={max_depth}")
+    assert response.status_code == 422
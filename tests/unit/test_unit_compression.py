@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from app.main import app
+from app.utils.responses import FastJSONResponse, default_response_class
+from tests.factories.models_factory import get_random_category_dict
+
+
+@pytest.fixture
+def categories(monkeypatch):
+    categories = [get_random_category_dict(i) for i in range(100)]
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", lambda self: categories)
+    monkeypatch.setattr(
+        "app.utils.http_cache.get_table_version", lambda db, table_name: 42
+    )
+    return categories
+
+
+"""
+- [ ] Test large responses are gzip compressed and their ETag becomes weak
+"""
+
+
+def test_unit_large_response_compressed(client, categories):
+    response = client.get("api/category/", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["ETag"] == 'W/"category-42"'
+    assert response.json() == categories
+
+    # the weak ETag still revalidates
+    response = client.get(
+        "api/category/",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": 'W/"category-42"'},
+    )
+    assert response.status_code == 304
+
+
+"""
+- [ ] Test responses stay uncompressed for identity clients and small bodies
+"""
+
+
+def test_unit_response_not_compressed(client, categories):
+    response = client.get("api/category/", headers={"Accept-Encoding": "identity"})
+
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["ETag"] == '"category-42"'
+
+    response = client.get(
+        "api/category/?limit=1", headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert "Content-Encoding" not in response.headers
+    assert "Vary" not in response.headers
+
+
+"""
+- [ ] Test the category export is not compressed twice
+"""
+
+
+def test_unit_export_not_compressed_twice(
+    client, override_get_db_connection, monkeypatch
+):
+    rows = [get_random_category_dict(i) for i in range(100)]
+    monkeypatch.setattr(
+        "app.routers.category_routes.stream_categories",
+        lambda connection, criteria, batch_size: iter([rows]),
+    )
+
+    response = client.get(
+        "api/category/export",
+        headers={"Accept": "application/json", "Accept-Encoding": "gzip"},
+    )
+
+    # decoded once by the client: a second gzip layer would not parse
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert len(response.json()) == 100
+
+
+"""
+- [ ] Test the fast JSON response is the default response class
+"""
+
+
+def test_unit_fast_json_default_response_class():
+    assert default_response_class() is FastJSONResponse
+    assert app.router.default_response_class is FastJSONResponse
+    content = {"id": 1, "name": "é", "items": [1.5, None, True]}
+    assert json.loads(FastJSONResponse(content).body) == content
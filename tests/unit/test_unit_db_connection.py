@@ -0,0 +1,142 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from app.db_connection import get_db_connection, get_db_session
+from app.utils.pool_metrics import (
+    PoolStats,
+    instrumented_pool_class,
+    register_pool_listeners,
+)
+from app.utils.projection import stream_rows
+
+
+def record_call(calls, name):
+    return lambda *args, **kwargs: calls.append(name)
+
+
+"""
+- [ ] Test db session dependency commits and closes on success
+"""
+
+
+def test_unit_db_session_commits_and_closes(monkeypatch):
+    calls = []
+    monkeypatch.setattr("sqlalchemy.orm.Session.commit", record_call(calls, "commit"))
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.rollback", record_call(calls, "rollback")
+    )
+    monkeypatch.setattr("sqlalchemy.orm.Session.close", record_call(calls, "close"))
+
+    dependency = get_db_session()
+    next(dependency)
+    with pytest.raises(StopIteration):
+        next(dependency)
+
+    assert calls == ["commit", "close"]
+
+
+"""
+- [ ] Test db session dependency rolls back and closes on error
+"""
+
+
+def test_unit_db_session_rolls_back_on_error(monkeypatch):
+    calls = []
+    monkeypatch.setattr("sqlalchemy.orm.Session.commit", record_call(calls, "commit"))
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.rollback", record_call(calls, "rollback")
+    )
+    monkeypatch.setattr("sqlalchemy.orm.Session.close", record_call(calls, "close"))
+
+    dependency = get_db_session()
+    next(dependency)
+    with pytest.raises(ValueError):
+        dependency.throw(ValueError("route failed"))
+
+    assert calls == ["rollback", "close"]
+
+
+"""
+- [ ] Test pool counters for checkouts, overflow and new connections
+"""
+
+
+def test_unit_pool_stats_counts_checkouts_and_overflow():
+    stats = PoolStats()
+    engine = create_engine(
+        "sqlite://",
+        poolclass=instrumented_pool_class(QueuePool, stats),
+        pool_size=1,
+        max_overflow=1,
+    )
+    register_pool_listeners(engine, stats)
+
+    first = engine.connect()
+    second = engine.connect()
+    snapshot = stats.snapshot(engine.pool)
+
+    assert snapshot["checkouts"] == 2
+    assert snapshot["connects"] == 2
+    assert snapshot["overflow_checkouts"] == 1
+    assert snapshot["checked_out"] == 2
+    assert snapshot["overflow"] == 1
+
+    first.close()
+    second.close()
+    snapshot = stats.snapshot(engine.pool)
+    assert snapshot["checkins"] == 2
+    assert snapshot["checked_out"] == 0
+    engine.dispose()
+
+
+"""
+- [ ] Test pool metrics endpoint
+"""
+
+
+def test_unit_get_pool_metrics(client):
+    response = client.get("metrics/pool")
+    assert response.status_code == 200
+    assert set(response.json()) == {"sync", "async"}
+    assert "checkouts" in response.json()["sync"]
+    assert "overflow" in response.json()["sync"]
+
+
+"""
+- [ ] Test db connection dependency leaves the connection to the streamed body
+"""
+
+
+def test_unit_db_connection_left_open_on_success(monkeypatch):
+    engine = create_engine("sqlite://")
+    monkeypatch.setattr("app.db_connection.engine", engine)
+
+    dependency = get_db_connection()
+    connection = next(dependency)
+    with pytest.raises(StopIteration):
+        next(dependency)
+
+    assert not connection.closed
+    partitions = stream_rows(connection, text("SELECT 1 AS one"), batch_size=10)
+    assert [list(partition) for partition in partitions] == [[{"one": 1}]]
+    assert connection.closed
+    engine.dispose()
+
+
+"""
+- [ ] Test db connection dependency closes the connection on error
+"""
+
+
+def test_unit_db_connection_closes_on_error(monkeypatch):
+    engine = create_engine("sqlite://")
+    monkeypatch.setattr("app.db_connection.engine", engine)
+
+    dependency = get_db_connection()
+    connection = next(dependency)
+    with pytest.raises(ValueError):
+        dependency.throw(ValueError("route failed"))
+
+    assert connection.closed
+    engine.dispose()
@@ -0,0 +1,162 @@
+import pytest
+
+from app.utils.category_cache import category_cache
+from app.utils.http_cache import cache_control, etag_matches, observe_table_version
+from tests.factories.models_factory import get_random_category_dict
+
+
+def mock_version(monkeypatch, version):
+    monkeypatch.setattr(
+        "app.utils.http_cache.get_table_version", lambda db, table_name: version
+    )
+
+
+"""
+- [ ] Test GET categories sends the table version ETag and Cache-Control
+"""
+
+
+def test_unit_get_categories_etag(client, monkeypatch):
+    mock_version(monkeypatch, 42)
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", lambda self: [])
+
+    response = client.get("api/category/")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"category-42"'
+    assert response.headers["Cache-Control"] == "public, no-cache"
+
+
+"""
+- [ ] Test GET categories with a matching If-None-Match skips the query
+"""
+
+
+def test_unit_get_categories_not_modified(client, monkeypatch):
+    mock_version(monkeypatch, 42)
+    queries = []
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", lambda self: queries.append(1))
+
+    response = client.get("api/category/", headers={"If-None-Match": '"category-42"'})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == '"category-42"'
+    assert queries == []
+
+
+"""
+- [ ] Test GET category answers 304 from its cache entry, without the database
+"""
+
+
+@pytest.mark.parametrize("path", ["api/category/slug/{slug}", "api/category/{id}"])
+def test_unit_get_category_not_modified_from_cache(client, monkeypatch, path):
+    category = get_random_category_dict()
+    path = path.format(**category)
+    mock_version(monkeypatch, 42)
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", lambda self: category)
+    assert client.get(path).headers["ETag"] == '"category-42"'
+
+    # other rows changed since: the entry keeps the version it was loaded at
+    queries = []
+    monkeypatch.setattr(
+        "app.utils.http_cache.get_table_version",
+        lambda db, table_name: queries.append(1),
+    )
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", lambda self: queries.append(1))
+
+    response = client.get(path, headers={"If-None-Match": '"category-42"'})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == '"category-42"'
+    assert response.headers["Cache-Control"] == "public, max-age=60"
+    assert queries == []
+
+
+"""
+- [ ] Test GET category of a missing row is a 404, whatever If-None-Match says
+"""
+
+
+@pytest.mark.parametrize(
+    "path", ["api/category/slug/missing-slug", "api/category/999999"]
+)
+@pytest.mark.parametrize("if_none_match", ["*", '"category-42"'])
+def test_unit_get_category_missing_not_modified(
+    client, monkeypatch, path, if_none_match
+):
+    mock_version(monkeypatch, 42)
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", lambda self: None)
+
+    for _ in range(2):  # from the database, then from the cached 404
+        response = client.get(path, headers={"If-None-Match": if_none_match})
+        assert response.status_code == 404
+
+
+"""
+- [ ] Test GET category with a stale If-None-Match gets the new body
+"""
+
+
+def test_unit_get_category_by_slug_modified(client, monkeypatch):
+    mock_version(monkeypatch, 43)
+    category = get_random_category_dict()
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", lambda self: category)
+
+    response = client.get(
+        f"api/category/slug/{category['slug']}",
+        headers={"If-None-Match": '"category-42"'},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["slug"] == category["slug"]
+    assert response.headers["ETag"] == '"category-43"'
+    assert response.headers["Cache-Control"] == "public, max-age=60"
+
+
+"""
+- [ ] Test If-None-Match comparison
+"""
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected",
+    [
+        ('"category-1"', True),
+        ('W/"category-1"', True),
+        ('"category-0", "category-1"', True),
+        ("*", True),
+        ('"category-2"', False),
+        ("category-1", False),
+    ],
+)
+def test_unit_etag_matches(if_none_match, expected):
+    assert etag_matches(if_none_match, '"category-1"') is expected
+
+
+"""
+- [ ] Test a new table version keeps the cached categories, writes drop them
+"""
+
+
+def test_unit_table_version_change_keeps_cache():
+    observe_table_version("category", 1)
+    category_cache.set(("category", "id", 1), (1, {"id": 1}))
+
+    observe_table_version("category", 2)
+    assert len(category_cache) == 1
+
+
+"""
+- [ ] Test Cache-Control policy can be overridden per route
+"""
+
+
+def test_unit_cache_control_override(monkeypatch):
+    assert cache_control("category_detail") == "public, max-age=60"
+
+    monkeypatch.setenv("CACHE_CONTROL_CATEGORY_DETAIL", "private, max-age=5")
+
+    assert cache_control("category_detail") == "private, max-age=5"
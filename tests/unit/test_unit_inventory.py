@@ -0,0 +1,170 @@
+from collections import namedtuple
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+LockedLine = namedtuple("LockedLine", ["id", "stock_qty"])
+ChangedLine = namedtuple("ChangedLine", ["id", "product_id", "stock_qty"])
+
+
+class MockResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+def mock_execute(results, statements):
+    # one list of rows per statement, in execution order
+    def execute(self, statement, *args, **kwargs):
+        statements.append(
+            str(
+                statement.compile(
+                    dialect=postgresql.dialect(),
+                    compile_kwargs={"literal_binds": True},
+                )
+            )
+        )
+        return MockResult(results.pop(0) if results else [])
+
+    return execute
+
+
+def record_call(calls, name):
+    return lambda *args, **kwargs: calls.append(name)
+
+
+@pytest.fixture
+def session_calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr("sqlalchemy.orm.Session.commit", record_call(calls, "commit"))
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.rollback", record_call(calls, "rollback")
+    )
+    return calls
+
+
+"""
+- [ ] Test POST reserve locks lines then products in id order, guards the decrement
+"""
+
+
+def test_unit_reserve_stock_successfully(client, monkeypatch, session_calls):
+    statements = []
+    results = [
+        [LockedLine(3, 10), LockedLine(7, 5)],
+        [ChangedLine(7, 2, 4), ChangedLine(3, 1, 7)],
+    ]
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.execute", mock_execute(results, statements)
+    )
+
+    body = {
+        "items": [
+            {"product_line_id": 7, "quantity": 1},
+            {"product_line_id": 3, "quantity": 2},
+            {"product_line_id": 3, "quantity": 1},
+        ]
+    }
+    response = client.post("api/inventory/reserve", json=body)
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "items": [
+            {"product_line_id": 3, "product_id": 1, "stock_qty": 7},
+            {"product_line_id": 7, "product_id": 2, "stock_qty": 4},
+        ]
+    }
+    lock, change, lock_products, status = statements
+    assert "ORDER BY product_line.id FOR UPDATE" in lock
+    assert "(VALUES (3, 3), (7, 1))" in change
+    assert "product_line.stock_qty >= change.quantity" in change
+    assert "product.id IN (1, 2) ORDER BY product.id FOR UPDATE" in lock_products
+    assert "product.id IN (1, 2)" in status and "FOR UPDATE" not in status
+    assert "commit" in session_calls and "rollback" not in session_calls
+
+
+"""
+- [ ] Test POST reserve insufficient stock reserves nothing
+"""
+
+
+def test_unit_reserve_stock_insufficient(client, monkeypatch, session_calls):
+    statements = []
+    results = [[LockedLine(3, 10), LockedLine(7, 0)]]
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.execute", mock_execute(results, statements)
+    )
+
+    body = {
+        "items": [
+            {"product_line_id": 3, "quantity": 1},
+            {"product_line_id": 7, "quantity": 1},
+        ]
+    }
+    response = client.post("api/inventory/reserve", json=body)
+
+    assert response.status_code == 409
+    assert response.json() == {"detail": "Insufficient stock for product lines: 7"}
+    assert len(statements) == 1
+    assert "commit" not in session_calls
+    assert "rollback" in session_calls
+
+
+"""
+- [ ] Test POST reserve unknown product line
+"""
+
+
+def test_unit_reserve_stock_not_found(client, monkeypatch, session_calls):
+    monkeypatch.setattr("sqlalchemy.orm.Session.execute", mock_execute([[]], []))
+
+    body = {"items": [{"product_line_id": 3, "quantity": 1}]}
+    response = client.post("api/inventory/reserve", json=body)
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Product lines not found: 3"}
+    assert "commit" not in session_calls
+
+
+"""
+- [ ] Test POST release increments stock without a guard
+"""
+
+
+def test_unit_release_stock_successfully(client, monkeypatch, session_calls):
+    statements = []
+    results = [[LockedLine(3, 0)], [ChangedLine(3, 1, 2)]]
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.execute", mock_execute(results, statements)
+    )
+
+    body = {"items": [{"product_line_id": 3, "quantity": 2}]}
+    response = client.post("api/inventory/release", json=body)
+
+    assert response.status_code == 200
+    assert response.json()["items"][0]["stock_qty"] == 2
+    assert "product_line.stock_qty + change.quantity" in statements[1]
+    assert ">= change.quantity" not in statements[1]
+    assert "FOR UPDATE" in statements[2]
+    assert "CAST(CASE WHEN (EXISTS" in statements[3]
+    assert "commit" in session_calls and "rollback" not in session_calls
+
+
+"""
+- [ ] Test POST reserve invalid body
+"""
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"items": []},
+        {"items": [{"product_line_id": 3, "quantity": 0}]},
+        {"items": [{"product_line_id": 3}]},
+    ],
+)
+def test_unit_reserve_stock_invalid_body(client, body):
+    response = client.post("api/inventory/reserve", json=body)
+    assert response.status_code == 422
@@ -0,0 +1,84 @@
+import json
+import logging
+import queue
+from logging.handlers import QueueListener
+
+from app.utils.logging_setup import (
+    JSONFormatter,
+    RequestQueueHandler,
+    SamplingFilter,
+    request_id,
+)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+"""
+- [ ] Test records go through the queue and come out as JSON lines
+"""
+
+
+def test_unit_queue_json_logging():
+    log_queue = queue.SimpleQueue()
+    target = ListHandler()
+    target.setFormatter(JSONFormatter())
+    listener = QueueListener(log_queue, target)
+    logger = logging.getLogger("tests.logging")
+    logger.propagate = False
+    handler = RequestQueueHandler(log_queue)
+    logger.addHandler(handler)
+
+    listener.start()
+    token = request_id.set("abc123")
+    try:
+        logger.warning("category %s", 42, extra={"duration_ms": 1.5})
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("failed")
+    finally:
+        request_id.reset(token)
+        logger.removeHandler(handler)
+        listener.stop()
+
+    first, second = [json.loads(line) for line in target.lines]
+    assert first["message"] == "category 42"
+    assert first["level"] == "WARNING"
+    assert first["request_id"] == "abc123"
+    assert first["duration_ms"] == 1.5
+    assert second["message"] == "failed"
+    assert "ValueError: boom" in second["exception"]
+
+
+"""
+- [ ] Test sampling drops info records but keeps warnings
+"""
+
+
+def test_unit_sampling_filter():
+    info = logging.makeLogRecord({"levelno": logging.INFO})
+    warning = logging.makeLogRecord({"levelno": logging.WARNING})
+
+    assert not SamplingFilter(0).filter(info)
+    assert SamplingFilter(0).filter(warning)
+    assert SamplingFilter(1).filter(info)
+
+
+"""
+- [ ] Test requests get an X-Request-ID, kept when the client sends one
+"""
+
+
+def test_unit_request_id_header(client):
+    response = client.get("metrics/pool")
+    assert len(response.headers["X-Request-ID"]) == 32
+
+    response = client.get("metrics/pool", headers={"X-Request-ID": "req-1"})
+    assert response.headers["X-Request-ID"] == "req-1"
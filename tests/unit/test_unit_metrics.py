@@ -0,0 +1,88 @@
+from sqlalchemy import create_engine, text
+
+from app.utils.metrics import (
+    Counter,
+    Histogram,
+    QueryStats,
+    register_query_listeners,
+    request_query_stats,
+)
+from tests.factories.models_factory import get_random_category_dict
+
+"""
+- [ ] Test counters and histograms render in the Prometheus text format
+"""
+
+
+def test_unit_metrics_render():
+    counter = Counter("requests_total", "Requests.", ("route",))
+    counter.inc('/a"b')
+    counter.inc('/a"b', amount=2)
+    assert counter.render() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{route="/a\\"b"} 3',
+    ]
+
+    histogram = Histogram("latency", "Latency.", ("route",), buckets=(0.1, 1))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5, "/a")
+    lines = histogram.render()
+    assert 'latency_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_bucket{route="/a",le="1"} 2' in lines
+    assert 'latency_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_sum{route="/a"} 5.55' in lines
+    assert 'latency_count{route="/a"} 3' in lines
+
+
+"""
+- [ ] Test GET /metrics labels requests with their route template
+"""
+
+
+def test_unit_metrics_endpoint(client, monkeypatch):
+    category = get_random_category_dict()
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", lambda self: category)
+
+    client.get("api/category/123")
+    client.get("api/unknown/path")
+    response = client.get("metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert (
+        'http_requests_total{method="GET",route="/api/category/{category_id}",'
+        'status="200"}' in body
+    )
+    assert 'route="unmatched",status="404"}' in body
+    assert "/api/category/123" not in body
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert 'db_pool_checkouts{engine="sync"}' in body
+    assert 'cache_hits{cache="category"}' in body
+
+
+"""
+- [ ] Test the engine hooks count the queries of the current request
+"""
+
+
+def test_unit_query_listeners():
+    engine = create_engine("sqlite://")
+    register_query_listeners(engine)
+
+    with engine.connect() as connection:
+        # no request being served: nothing recorded
+        connection.execute(text("SELECT 1"))
+
+        stats = QueryStats()
+        token = request_query_stats.set(stats)
+        try:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+        finally:
+            request_query_stats.reset(token)
+
+    assert stats.queries == 2
+    assert stats.seconds > 0
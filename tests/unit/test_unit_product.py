@@ -0,0 +1,143 @@
+from sqlalchemy.dialects import postgresql
+
+from app.models import (
+    Attribute,
+    AttributeValue,
+    Category,
+    Product,
+    ProductImage,
+    ProductLine,
+    ProductType,
+)
+from tests.factories.models_factory import (
+    get_random_category_dict,
+    get_random_product_dict,
+    get_random_product_line_dict,
+)
+
+
+def mock_output(return_value=None):
+    return lambda *args, **kwargs: return_value
+
+
+def product_aggregate(id_=1):
+    category = Category(**get_random_category_dict())
+    line = ProductLine(
+        **get_random_product_line_dict(id_=id_, product_id=id_),
+        images=[
+            ProductImage(
+                id=id_, alternative_text="front", url="/front.png", order=1
+            )
+        ],
+        attribute_values=[
+            AttributeValue(
+                id=id_,
+                attribute_value="red",
+                attribute=Attribute(id=1, name="colour", description=None),
+            )
+        ],
+    )
+    return Product(
+        **get_random_product_dict(id_=id_, category_id=category.id),
+        category=category,
+        product_types=[ProductType(id=1, name="shirt", level=1, parent=None)],
+        lines=[line],
+    )
+
+
+"""
+- [ ] Test GET single product returns the whole aggregate
+"""
+
+
+def test_unit_get_product_successfully(client, monkeypatch):
+    product = product_aggregate()
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output(product))
+
+    response = client.get("api/product/1")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["slug"] == product.slug
+    assert data["category"]["id"] == product.category.id
+    assert data["product_types"][0]["name"] == "shirt"
+    line = data["lines"][0]
+    assert line["sku"] == str(product.lines[0].sku)
+    assert line["images"][0]["url"] == "/front.png"
+    assert line["attribute_values"][0]["attribute"]["name"] == "colour"
+
+
+"""
+- [ ] Test GET single product not found
+"""
+
+
+def test_unit_get_product_not_found(client, monkeypatch):
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_output())
+
+    response = client.get("api/product/1")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Product not found"}
+
+    response = client.get("api/product/slug/missing")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Product does not exist"}
+
+
+"""
+- [ ] Test GET single product internal server error
+"""
+
+
+def test_unit_get_product_internal_server_error(client, monkeypatch):
+    def mock_exception(*args, **kwargs):
+        raise Exception("Internal server error")
+
+    monkeypatch.setattr("sqlalchemy.orm.Query.first", mock_exception)
+
+    response = client.get("api/product/1")
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Internal Server Error"}
+
+
+"""
+- [ ] Test GET products is keyset paginated
+"""
+
+
+def test_unit_get_products_paginated(client, monkeypatch):
+    products = [product_aggregate(id_) for id_ in range(1, 4)]
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", mock_output(products))
+
+    response = client.get("api/product/?limit=2")
+
+    assert response.status_code == 200
+    assert [product["id"] for product in response.json()] == [1, 2]
+    assert "X-Next-Cursor" in response.headers
+
+
+"""
+- [ ] Test GET products by category includes subcategories through the closure
+"""
+
+
+def test_unit_get_products_include_subcategories(client, monkeypatch):
+    statements = []
+
+    def mock_all(self):
+        statements.append(
+            str(
+                self.statement.compile(
+                    dialect=postgresql.dialect(),
+                    compile_kwargs={"literal_binds": True},
+                )
+            )
+        )
+        return []
+
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", mock_all)
+
+    response = client.get("api/product/?category_id=3&include_subcategories=true")
+
+    assert response.status_code == 200
+    assert "category_closure.ancestor_id = 3" in statements[0]
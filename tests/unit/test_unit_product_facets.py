@@ -0,0 +1,165 @@
+from collections import namedtuple
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils.facet_index import FacetIndex, bitmap
+
+FacetRow = namedtuple(
+    "FacetRow",
+    [
+        "line_id",
+        "product_id",
+        "attribute_value_id",
+        "attribute_id",
+        "attribute_value",
+        "attribute_name",
+    ],
+)
+
+COLOUR, SIZE = 1, 2
+RED, BLUE, SMALL, LARGE = 10, 11, 20, 21
+VALUES = {
+    RED: (COLOUR, "red", "colour"),
+    BLUE: (COLOUR, "blue", "colour"),
+    SMALL: (SIZE, "S", "size"),
+    LARGE: (SIZE, "L", "size"),
+}
+
+
+def facet_rows(lines):
+    # lines: [(line_id, product_id, [attribute_value_id, ...])]
+    rows = []
+    for line_id, product_id, value_ids in lines:
+        if not value_ids:
+            rows.append(FacetRow(line_id, product_id, None, None, None, None))
+        for value_id in value_ids:
+            attribute_id, value, name = VALUES[value_id]
+            rows.append(
+                FacetRow(line_id, product_id, value_id, attribute_id, value, name)
+            )
+    return rows
+
+
+# product 1: red/S, blue/L; product 2: red/L; product 3: blue/S; product 4: none
+CATALOG = facet_rows(
+    [
+        (1, 1, [RED, SMALL]),
+        (2, 1, [BLUE, LARGE]),
+        (3, 2, [RED, LARGE]),
+        (4, 3, [BLUE, SMALL]),
+        (5, 4, []),
+    ]
+)
+
+
+def facet_counts(facets):
+    return {
+        value["id"]: value["count"] for facet in facets for value in facet["values"]
+    }
+
+
+"""
+- [ ] Test bitmap sets one bit per position
+"""
+
+
+def test_unit_bitmap():
+    assert bitmap([0, 3, 9], 10) == 0b1000001001
+
+
+"""
+- [ ] Test facet search without selection matches every line
+"""
+
+
+def test_unit_facet_search_without_selection():
+    product_ids, facets = FacetIndex(CATALOG).search([])
+
+    assert product_ids == [1, 2, 3, 4]
+    assert [facet["name"] for facet in facets] == ["colour", "size"]
+    assert facet_counts(facets) == {RED: 2, BLUE: 2, SMALL: 2, LARGE: 2}
+
+
+"""
+- [ ] Test facet search ANDs attributes, ORs values, and counts disjunctively
+"""
+
+
+@pytest.mark.parametrize(
+    "selected, expected_products, expected_counts",
+    [
+        ([RED], [1, 2], {RED: 2, BLUE: 2, SMALL: 1, LARGE: 1}),
+        ([RED, LARGE], [2], {RED: 1, BLUE: 1, SMALL: 1, LARGE: 1}),
+        ([RED, BLUE, LARGE], [1, 2], {RED: 1, BLUE: 1, SMALL: 2, LARGE: 2}),
+    ],
+)
+def test_unit_facet_search_selection(selected, expected_products, expected_counts):
+    product_ids, facets = FacetIndex(CATALOG).search(selected)
+
+    assert product_ids == expected_products
+    assert facet_counts(facets) == expected_counts
+
+
+"""
+- [ ] Test facet search rejects unknown attribute values
+"""
+
+
+def test_unit_facet_search_unknown_value():
+    with pytest.raises(HTTPException) as error:
+        FacetIndex(CATALOG).search([RED, 99])
+
+    assert error.value.status_code == 400
+    assert error.value.detail == "Unknown attribute values: 99"
+
+
+"""
+- [ ] Test facet search on an attribute value no line carries matches nothing
+"""
+
+
+@pytest.mark.parametrize(
+    "selected, expected_products, expected_counts",
+    [
+        ([99], [], {RED: 2, BLUE: 2, SMALL: 0, LARGE: 0}),
+        # OR'ed with red, it leaves the red lines
+        ([RED, 99], [1, 2], {RED: 2, BLUE: 2, SMALL: 1, LARGE: 1}),
+    ],
+)
+def test_unit_facet_search_unused_value(selected, expected_products, expected_counts):
+    product_ids, facets = FacetIndex(CATALOG).search(selected, {99: COLOUR})
+
+    assert product_ids == expected_products
+    assert facet_counts(facets) == expected_counts
+
+
+"""
+- [ ] Test GET product search returns a page of products and the facets
+"""
+
+
+def test_unit_search_products(client, monkeypatch):
+    monkeypatch.setattr(
+        "app.utils.facet_index.get_facet_index",
+        lambda db: FacetIndex(CATALOG),
+    )
+    queried = []
+
+    def mock_all(self):
+        queried.append(self)
+        return []
+
+    monkeypatch.setattr("sqlalchemy.orm.Query.all", mock_all)
+
+    response = client.get(
+        "api/product/search",
+        params={"attribute_value_id": [RED], "limit": 1},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 2
+    assert facet_counts(data["facets"])[SMALL] == 1
+    assert "X-Next-Cursor" in response.headers
+    assert len(queried) == 1
@@ -0,0 +1,56 @@
+import pytest
+from fastapi import HTTPException
+
+from app.models import Category, Product, ProductLine
+from app.utils.projection import model_fields, projected_columns
+
+"""
+- [ ] Test model fields are the mapped columns without the deferred ones
+"""
+
+
+def test_unit_model_fields():
+    assert model_fields(Category) == (
+        "id",
+        "name",
+        "slug",
+        "is_active",
+        "level",
+        "parent_id",
+    )
+    assert "search_vector" not in model_fields(Product)
+    assert model_fields(ProductLine)[0] == "id"
+
+
+"""
+- [ ] Test projected columns keep the model order and always include id
+"""
+
+
+@pytest.mark.parametrize(
+    "model, fields, expected",
+    [
+        (Category, None, list(model_fields(Category))),
+        (Category, "slug, name", ["id", "name", "slug"]),
+        (Product, "stock_status", ["id", "stock_status"]),
+        (ProductLine, "price,stock_qty,", ["id", "price", "stock_qty"]),
+    ],
+)
+def test_unit_projected_columns(model, fields, expected):
+    columns = projected_columns(model, fields)
+    assert [column.key for column in columns] == expected
+
+
+"""
+- [ ] Test projected columns reject fields outside the allowed ones
+"""
+
+
+def test_unit_projected_columns_unknown():
+    with pytest.raises(HTTPException) as error:
+        projected_columns(Product, "name,search_vector,secret")
+    assert error.value.status_code == 400
+    assert error.value.detail == "Unknown fields: search_vector, secret"
+
+    with pytest.raises(HTTPException):
+        projected_columns(Category, "parent_id", allowed=("id", "name"))
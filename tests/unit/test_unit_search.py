@@ -0,0 +1,156 @@
+from collections import namedtuple
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.utils.category_utils import decode_cursor_payload, encode_cursor
+from app.utils.search_utils import prefix_tsquery
+
+ProductHit = namedtuple("ProductHit", ["id", "name", "slug", "category_id", "rank"])
+
+
+class MockResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+def mock_execute(results, statements):
+    # one list of rows per statement, in execution order
+    def execute(self, statement, *args, **kwargs):
+        statements.append(
+            str(
+                statement.compile(
+                    dialect=postgresql.dialect(),
+                    compile_kwargs={"literal_binds": True},
+                )
+            )
+        )
+        return MockResult(results.pop(0))
+
+    return execute
+
+
+"""
+- [ ] Test search terms become a prefix tsquery
+"""
+
+
+@pytest.mark.parametrize(
+    "q, expected",
+    [
+        ("red shirt", "red:* & shirt:*"),
+        ("  Shir", "shir:*"),
+        ("t-shirt's!", "t:* & shirt:* & s:*"),
+        ("&|!", None),
+    ],
+)
+def test_unit_prefix_tsquery(q, expected):
+    assert prefix_tsquery(q) == expected
+
+
+"""
+- [ ] Test GET product search is ranked and keyset paginated
+"""
+
+
+def test_unit_search_products_paginated(client, monkeypatch):
+    rows = [ProductHit(i, f"shirt {i}", f"shirt-{i}", 1, 1 / i) for i in (1, 2, 3)]
+    statements = []
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.execute", mock_execute([rows], statements)
+    )
+
+    response = client.get("api/search/products", params={"q": "shir", "limit": 2})
+
+    assert response.status_code == 200
+    assert [hit["id"] for hit in response.json()] == [1, 2]
+    assert decode_cursor_payload(response.headers["X-Next-Cursor"]) == {
+        "id": 2,
+        "rank": 0.5,
+        "fuzzy": False,
+    }
+    assert "product.search_vector @@ to_tsquery('english', 'shir:*')" in statements[0]
+    assert "ORDER BY CAST(ts_rank(" in statements[0]
+
+
+"""
+- [ ] Test GET product search next page starts after the cursor
+"""
+
+
+def test_unit_search_products_next_page(client, monkeypatch):
+    statements = []
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.execute", mock_execute([[]], statements)
+    )
+    cursor = encode_cursor(2, rank=0.5, fuzzy=False)
+
+    response = client.get("api/search/products", params={"q": "shir", "cursor": cursor})
+
+    assert response.status_code == 200
+    assert response.json() == []
+    # an empty next page does not fall back to the fuzzy search
+    assert len(statements) == 1
+    assert "< 0.5 OR" in statements[0]
+    assert "product.id > 2" in statements[0]
+
+
+"""
+- [ ] Test GET product search falls back to trigram similarity on no match
+"""
+
+
+def test_unit_search_products_fuzzy_fallback(client, monkeypatch):
+    rows = [ProductHit(1, "shirt", "shirt", 1, 0.4)]
+    statements = []
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.execute", mock_execute([[], rows], statements)
+    )
+
+    response = client.get("api/search/products", params={"q": "shrit"})
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"id": 1, "name": "shirt", "slug": "shirt", "category_id": 1, "rank": 0.4}
+    ]
+    assert "similarity(product.name, 'shrit')" in statements[1]
+    # the operator is % (escaped for the psycopg2 paramstyle)
+    assert "product.name %% 'shrit'" in statements[1]
+
+
+"""
+- [ ] Test GET category search uses the indexed name expression
+"""
+
+
+def test_unit_search_categories(client, monkeypatch):
+    statements = []
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.execute", mock_execute([[], []], statements)
+    )
+
+    response = client.get("api/search/categories", params={"q": "shoe"})
+
+    assert response.status_code == 200
+    assert "to_tsvector('english', category.name) @@" in statements[0]
+
+
+"""
+- [ ] Test GET search bad request
+"""
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"q": ""},
+        {"q": "shirt", "cursor": "not-a-cursor"},
+        {"q": "shirt", "cursor": encode_cursor(2, rank="high")},
+    ],
+)
+def test_unit_search_bad_request(client, params):
+    response = client.get("api/search/products", params=params)
+    assert response.status_code in (400, 422)
@@ -0,0 +1,148 @@
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.utils.seasonal_events import EventSchedule, seasonal_event_cache
+
+Event = namedtuple("Event", ["id", "name", "start_date", "end_date"])
+EventProduct = namedtuple(
+    "EventProduct",
+    ["id", "name", "slug", "category_id", "stock_status", "seasonal_event_id"],
+)
+
+NOW = datetime(2024, 12, 1, 12, 0)
+
+
+class MockResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+def mock_execute(results, statements):
+    # one list of rows per statement, in execution order
+    def execute(self, statement, *args, **kwargs):
+        statements.append(statement)
+        return MockResult(results.pop(0))
+
+    return execute
+
+
+def days(n):
+    return NOW + timedelta(days=n)
+
+
+EVENTS = [
+    Event(1, "black friday", days(-5), days(2)),
+    Event(2, "christmas", days(-1), days(30)),
+    Event(3, "new year", days(30), days(32)),
+    Event(4, "empty", days(3), days(3)),
+]
+
+
+"""
+- [ ] Test event schedule active events and next boundary
+"""
+
+
+@pytest.mark.parametrize(
+    "at, active, next_boundary",
+    [
+        (days(-10), (), days(-5)),
+        (days(-5), (1,), days(-1)),
+        (NOW, (1, 2), days(2)),
+        (days(2), (2,), days(30)),
+        (days(30), (3,), days(32)),
+        (days(40), (), None),
+    ],
+)
+def test_unit_event_schedule(at, active, next_boundary):
+    schedule = EventSchedule(EVENTS)
+
+    assert schedule.active_at(at) == active
+    assert schedule.next_boundary(at) == next_boundary
+
+
+"""
+- [ ] Test GET active seasonal events with their products
+"""
+
+
+def test_unit_get_active_seasonal_events(client, monkeypatch):
+    monkeypatch.setattr("app.utils.seasonal_events.utc_now", lambda: NOW)
+    monkeypatch.setattr("app.routers.seasonal_event_routes.utc_now", lambda: NOW)
+    products = [
+        EventProduct(10, "scarf", "scarf", 1, "is", 2),
+        EventProduct(11, "gloves", "gloves", 1, "oos", 1),
+    ]
+    statements = []
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.execute",
+        mock_execute([EVENTS, products], statements),
+    )
+
+    response = client.get("api/seasonal-event/active")
+
+    assert response.status_code == 200
+    assert [event["id"] for event in response.json()] == [1, 2]
+    assert response.json()[0]["products"] == [
+        {
+            "id": 11,
+            "name": "gloves",
+            "slug": "gloves",
+            "category_id": 1,
+            "stock_status": "oos",
+        }
+    ]
+    # black friday ends in two days, capped by the refresh interval
+    assert response.headers["Cache-Control"] == "max-age=300"
+    assert len(statements) == 2
+
+
+"""
+- [ ] Test GET active seasonal events is cached until the next boundary
+"""
+
+
+def test_unit_get_active_seasonal_events_cached(client, monkeypatch):
+    soon = Event(5, "flash sale", NOW - timedelta(hours=1), NOW + timedelta(seconds=90))
+    monkeypatch.setattr("app.utils.seasonal_events.utc_now", lambda: NOW)
+    monkeypatch.setattr("app.routers.seasonal_event_routes.utc_now", lambda: NOW)
+    statements = []
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.execute",
+        mock_execute([[soon], []], statements),
+    )
+
+    response = client.get("api/seasonal-event/active")
+    assert response.headers["Cache-Control"] == "max-age=90"
+    response = client.get("api/seasonal-event/active")
+
+    assert response.status_code == 200
+    assert response.json()[0]["products"] == []
+    assert len(statements) == 2
+    _, expires_at = seasonal_event_cache._entries["active"]
+    assert expires_at - time.monotonic() == pytest.approx(90, abs=5)
+
+
+"""
+- [ ] Test GET active seasonal events without any event
+"""
+
+
+def test_unit_get_active_seasonal_events_none(client, monkeypatch):
+    statements = []
+    monkeypatch.setattr(
+        "sqlalchemy.orm.Session.execute", mock_execute([[]], statements)
+    )
+
+    response = client.get("api/seasonal-event/active")
+
+    assert response.status_code == 200
+    assert response.json() == []
+    # no active event: no product query
+    assert len(statements) == 1
@@ -0,0 +1,95 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.utils.metrics import (
+    MetricsMiddleware,
+    QueryStats,
+    register_query_listeners,
+    request_query_stats,
+)
+from app.utils.sql_profiling import (
+    DBTimingHeadersMiddleware,
+    explain_statement,
+    register_slow_query_listeners,
+)
+
+
+def profiled_engine(threshold_ms):
+    engine = create_engine("sqlite://")
+    register_query_listeners(engine)
+    register_slow_query_listeners(engine, threshold_ms=threshold_ms)
+    return engine
+
+
+"""
+- [ ] Test slow queries are logged with their parameters and route
+"""
+
+
+def test_unit_slow_query_logged(caplog):
+    engine = profiled_engine(threshold_ms=0)
+    token = request_query_stats.set(QueryStats("/api/category/{category_id}"))
+    try:
+        with caplog.at_level(logging.WARNING, logger="app"):
+            with engine.connect() as connection:
+                connection.execute(text("SELECT :value"), {"value": 42})
+    finally:
+        request_query_stats.reset(token)
+
+    assert "Slow query" in caplog.text
+    assert "on /api/category/{category_id}: SELECT ?" in caplog.text
+    assert "parameters=(42,)" in caplog.text
+
+
+"""
+- [ ] Test queries under the threshold are not logged
+"""
+
+
+def test_unit_fast_query_not_logged(caplog):
+    engine = profiled_engine(threshold_ms=10_000)
+    with caplog.at_level(logging.WARNING, logger="app"):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    assert "Slow query" not in caplog.text
+
+
+"""
+- [ ] Test only SELECT statements are explained with ANALYZE
+"""
+
+
+def test_unit_explain_statement():
+    assert explain_statement(" select 1") == "EXPLAIN (ANALYZE, BUFFERS)  select 1"
+    assert explain_statement("UPDATE category SET name = 'x'") == (
+        "EXPLAIN UPDATE category SET name = 'x'"
+    )
+
+
+"""
+- [ ] Test the debug headers carry the query count and database time
+"""
+
+
+def test_unit_db_timing_headers():
+    engine = profiled_engine(threshold_ms=10_000)
+    app = FastAPI()
+
+    @app.get("/queries")
+    def run_queries():
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+        return {}
+
+    app.add_middleware(DBTimingHeadersMiddleware)
+    app.add_middleware(MetricsMiddleware, router=app.router)
+
+    response = TestClient(app).get("/queries")
+
+    assert response.headers["X-DB-Queries"] == "2"
+    assert float(response.headers["X-DB-Time"]) > 0
@@ -1,10 +1,108 @@
+from contextlib import contextmanager
+
 import alembic.config
 from alembic import command
+from sqlalchemy import create_engine, make_url, text
+from sqlalchemy.pool import NullPool
+
+# pg_advisory_lock key serializing database builds across test workers
+DATABASE_BUILD_LOCK = 7_311_024
 
 
 def migrate_to_db(script_location, alembic_ini_path="alembic.ini", connection=None, revision="head"):
+    """
+    connection must not be in a transaction: migrations/env.py opens its own,
+    and migrations using autocommit_block() (CREATE INDEX CONCURRENTLY) need
+    to commit it and run outside of it.
+    """
     config = alembic.config.Config(alembic_ini_path)
     if connection is not None:
         config.config_ini_section = "testdb"
+        # migrations/env.py runs on this connection instead of opening its own
+        config.attributes["connection"] = connection
         command.upgrade(config, revision)
-        
\ No newline at end of file
+
+
+def database_url(url, name):
+    return make_url(url).set(database=name)
+
+
+def recreate_database(url, name, template=None):
+    """
+    Drop and create database name on the server of url, as a copy of
+    template when given. A template copy is a file level clone: much faster
+    than running the migrations again, but template must have no open
+    connection while it is copied.
+    """
+    engine = create_engine(
+        database_url(url, "postgres"), isolation_level="AUTOCOMMIT"
+    )
+    try:
+        with engine.connect() as connection:
+            connection.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+            statement = f'CREATE DATABASE "{name}"'
+            if template:
+                statement += f' TEMPLATE "{template}"'
+            connection.execute(text(statement))
+    finally:
+        engine.dispose()
+
+
+def drop_database(url, name):
+    engine = create_engine(
+        database_url(url, "postgres"), isolation_level="AUTOCOMMIT"
+    )
+    try:
+        with engine.connect() as connection:
+            connection.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+    finally:
+        engine.dispose()
+
+
+@contextmanager
+def server_lock(url, key=DATABASE_BUILD_LOCK):
+    """
+    Server wide lock, held for the duration of the block: parallel test
+    workers (pytest-xdist processes) build and copy databases one at a time.
+    """
+    engine = create_engine(
+        database_url(url, "postgres"), isolation_level="AUTOCOMMIT", poolclass=NullPool
+    )
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": key})
+            try:
+                yield
+            finally:
+                connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": key}
+                )
+    finally:
+        engine.dispose()
+
+
+def get_database_comment(url, name):
+    engine = create_engine(database_url(url, "postgres"), poolclass=NullPool)
+    try:
+        with engine.connect() as connection:
+            return connection.execute(
+                text(
+                    "SELECT shobj_description(oid, 'pg_database') "
+                    "FROM pg_database WHERE datname = :name"
+                ),
+                {"name": name},
+            ).scalar()
+    finally:
+        engine.dispose()
+
+
+def set_database_comment(url, name, comment):
+    engine = create_engine(
+        database_url(url, "postgres"), isolation_level="AUTOCOMMIT", poolclass=NullPool
+    )
+    try:
+        with engine.connect() as connection:
+            quoted = comment.replace("'", "''")
+            connection.execute(text(f'COMMENT ON DATABASE "{name}" IS \'{quoted}\''))
+    finally:
+        engine.dispose()
@@ -3,6 +3,16 @@ import time
 
 import docker
 import docker.errors
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+CONTAINER_NAME = "test-db"
+# false: the server of TEST_DATABASE_URL is provided outside of the tests
+# (a CI service, a local Postgres) and no container is started
+TEST_DATABASE_CONTAINER = os.getenv("TEST_DATABASE_CONTAINER", "true").lower() in (
+    "1",
+    "true",
+)
 
 
 def is_container_ready(container):
@@ -10,39 +20,40 @@ def is_container_ready(container):
     return container.status == "running"
 
 
-def wait_for_stable_status(container, stable_duration=20, interval=1):
-    start_time = time.time()
-    stable_count = 0
-    while time.time() - start_time < stable_duration:
-        if is_container_ready(container):
-            stable_count += 1
-        else:
-            stable_count = 0
-
-        if stable_count >= stable_duration / interval:
-            return True
-
-        time.sleep(interval)
-    return False
+def wait_for_database(url, timeout=60, interval=0.2):
+    """
+    Poll the server with a real connection until it answers. A running
+    container is not a ready server, and pg_isready inside the container
+    already succeeds on the temporary server the entrypoint starts (unix
+    socket only) to run the init scripts.
+    """
+    engine = create_engine(url, poolclass=NullPool)
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            try:
+                with engine.connect() as connection:
+                    connection.execute(text("SELECT 1"))
+                return
+            except Exception:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"Database not ready after {timeout}s")
+                time.sleep(interval)
+    finally:
+        engine.dispose()
 
 
 def start_database_container():
+    if not TEST_DATABASE_CONTAINER:
+        wait_for_database(os.getenv("TEST_DATABASE_URL"))
+        return None
+
     client = docker.from_env()
     scripts_dir = os.path.abspath("./scripts")
-    container_name = "test-db"
-
-    try:
-        existing_container = client.containers.get(container_name)
-        print(f"Container '{container_name} exists. Stopping and removing...")
-        existing_container.stop()
-        existing_container.remove()
-        print((f"Container '{container_name} stopped and removed"))
-    except docker.errors.NotFound:
-        print(f"Container '{container_name}' does not exist.")
 
     # Define container configuration
     container_config = {
-        "name": container_name,
+        "name": CONTAINER_NAME,
         "image": "postgres:16.1-alpine3.19",
         "detach": True,
         "ports": {"5432": 5435},
@@ -54,14 +65,22 @@ def start_database_container():
         "network_mode": "fastapidev_dev-network",
     }
 
-    # Start Container
-    container = client.containers.run(**container_config)
-    print(f"Container started: {container.id}")
-
-    while not is_container_ready(container):
-        time.sleep(1)
-
-    if not wait_for_stable_status(container):
-        raise RuntimeError("Container did not stabilize within the specified time")
+    # an existing test container is reused: the tests rebuild their databases
+    # from the migrations, nothing is kept from the previous session
+    try:
+        container = client.containers.get(CONTAINER_NAME)
+        print(f"Container '{CONTAINER_NAME}' exists, reusing it.")
+        if container.status == "exited":
+            container.start()
+    except docker.errors.NotFound:
+        try:
+            container = client.containers.run(**container_config)
+            print(f"Container started: {container.id}")
+        except docker.errors.APIError as e:
+            # parallel test workers: another one created it first
+            if e.status_code != 409:
+                raise
+            container = client.containers.get(CONTAINER_NAME)
 
-    return container
\ No newline at end of file
+    wait_for_database(os.getenv("TEST_DATABASE_URL"))
+    return container